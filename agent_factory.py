@@ -0,0 +1,117 @@
+"""
+Agent Factory
+Builds the expensive parts of an agent once per process and hands out cheap,
+isolated Agent instances per request.
+
+The model client, system prompt and Teradata tool specs are shared. Each Agent
+returned by create() has its own message history, so concurrent invocations
+never see each other's conversation. When a SchemaCatalog is supplied, the
+cached schema is appended to the prompt and a local describe_schema tool is added.
+With cache_prompt, the prompt is sent as content blocks carrying Bedrock
+prompt-caching checkpoints (see prompt_cache.py).
+Tool layers (see teradata_tools.ToolProxy) wrap the discovered MCP tools;
+extra_tools are local tools added alongside them, and prompt_sections are
+callables whose text (e.g. KPI snapshots) follows the schema.
+"""
+
+import contextlib
+import copy
+import logging
+import threading
+
+from strands import Agent
+
+from teradata_tools import discover_tools
+from prompt_cache import cached_system_prompt
+
+logger = logging.getLogger(__name__)
+
+
+class AgentFactory:
+    """Per-process agent template: one model, one prompt, cached tool specs"""
+
+    def __init__(self, model, pool, system_prompt, catalog=None, tool_layers=(), extra_tools=(),
+                 prompt_sections=(), cache_prompt=False, **agent_kwargs):
+        self.model = model
+        self.pool = pool
+        self.system_prompt = system_prompt
+        self.catalog = catalog
+        self.cache_prompt = cache_prompt
+        self.tool_layers = list(tool_layers)
+        self.extra_tools = list(extra_tools)
+        self.prompt_sections = list(prompt_sections)
+        self.agent_kwargs = agent_kwargs
+        # Shared (by reference) with factories derived through for_prompt()
+        self._tool_cache = {}
+        self._lock = threading.Lock()
+
+    def for_prompt(self, system_prompt):
+        """Factory for another persona sharing this one's model, pool, schema and tools"""
+        other = copy.copy(self)
+        other.system_prompt = system_prompt
+        return other
+
+    def tools(self):
+        """Tool list shared by every agent; discovered over MCP on first use"""
+        tools = self._tool_cache.get("tools")
+        if tools is None:
+            with self._lock:
+                tools = self._tool_cache.get("tools")
+                if tools is None:
+                    tools = self._tool_cache["tools"] = self._discover()
+        return tools
+
+    def refresh_tools(self):
+        """Re-run tool discovery (e.g. after upgrading the MCP server)"""
+        with self._lock:
+            tools = self._tool_cache["tools"] = self._discover()
+        return tools
+
+    def _discover(self):
+        tools = discover_tools(self.pool, self.tool_layers) + self.extra_tools
+        if self.catalog is not None:
+            tools.append(self.catalog.as_tool())
+        return tools
+
+    def prompt(self):
+        """System prompt for a new agent, followed by the cached schema and dynamic sections"""
+        sections = [self.catalog.prompt_section()] if self.catalog is not None else []
+        sections += [section() for section in self.prompt_sections]
+        if self.cache_prompt:
+            # Least volatile first, so a refreshed section keeps the earlier cache entries valid
+            return cached_system_prompt(self.system_prompt, *sections)
+        return "\n\n".join([self.system_prompt, *filter(None, sections)])
+
+    def create(self, messages=None, **overrides):
+        """New Agent with its own conversation state, optionally seeded with messages.
+
+        Keyword overrides replace the factory defaults for this agent only
+        (e.g. a streaming model or callback_handler=None).
+        """
+        kwargs = dict(
+            model=self.model,
+            messages=copy.deepcopy(messages) if messages else [],
+            **self.agent_kwargs
+        )
+        kwargs.update(overrides)
+        # Defaults are only built when not overridden (a batch passes one prompt for all items)
+        if "tools" not in kwargs:
+            kwargs["tools"] = list(self.tools())
+        if "system_prompt" not in kwargs:
+            kwargs["system_prompt"] = self.prompt()
+        return Agent(**kwargs)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app):
+        """Starlette lifespan hook: warm the MCP pool, then prefetch tools and schema"""
+        async with self.pool.lifespan(app):
+            threading.Thread(target=self.warm_up, daemon=True).start()
+            yield
+
+    def warm_up(self):
+        try:
+            self.tools()
+            if self.catalog is not None:
+                self.catalog.schema()
+        except Exception as e:
+            logger.error("Agent warm-up failed: %s", e)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+AgentCore Client
+Calls the deployed banking agent runtime directly, with one reused connection pool.
+
+- Remote: bedrock-agentcore InvokeAgentRuntime through a single boto3 client
+- Local: POST /invocations on a runtime started with `python agent.py`
+
+Responses are parsed from the runtime's JSON ({"response", "usage", "timings",
+"agent"} or {"error"}); streaming requests ({"stream": true}) are read as
+server-sent events and printed as the tokens arrive.
+
+Usage:
+    python agentcore_client.py "Show me customers at highest risk of churning"
+    python agentcore_client.py --stream --agent credit_risk "Analyze credit tiers"
+    python agentcore_client.py --batch questions.txt --output results.jsonl --concurrency 4
+    python agentcore_client.py --local "What databases are available?"
+
+A batch file holds one prompt per line, or one JSON payload per line
+(e.g. {"id": "q1", "agent": "wealth", "prompt": "..."}). Results are written as
+JSONL in input order with latency, usage and timings per prompt.
+
+Configuration via environment variables:
+- AGENTCORE_AGENT_ARN: Agent runtime ARN (default: bedrock_agentcore.agent_arn of
+  the default agent in .bedrock_agentcore.yaml, written by `agentcore launch`)
+- AGENTCORE_LOCAL_URL: Local runtime URL for --local (default http://localhost:8080)
+- AWS_REGION: Region of the runtime (default: from the ARN)
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+CONFIG_PATH = Path(__file__).with_name(".bedrock_agentcore.yaml")
+DEFAULT_LOCAL_URL = "http://localhost:8080"
+
+
+def agent_arn_from_config(path=CONFIG_PATH):
+    """Runtime ARN of the default agent in the agentcore CLI config, or None"""
+    try:
+        import yaml
+
+        with open(path) as f:
+            config = yaml.safe_load(f) or {}
+    except (ImportError, OSError, ValueError):
+        return None
+    agent = (config.get("agents") or {}).get(config.get("default_agent"), {})
+    return (agent.get("bedrock_agentcore") or {}).get("agent_arn")
+
+
+def response_text(body):
+    """Answer text of a runtime response body"""
+    if not isinstance(body, dict):
+        return str(body)
+    if "error" in body:
+        return f"Error: {body['error']}"
+    message = body.get("response")
+    if isinstance(message, dict):
+        return "\n".join(c["text"] for c in message.get("content", []) if "text" in c)
+    return "" if message is None else str(message)
+
+
+def sse_events(lines):
+    """JSON events from server-sent event lines ("data: {...}")"""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        try:
+            yield json.loads(data)
+        except ValueError:
+            yield {"type": "text", "data": data}
+
+
+class AgentCoreClient:
+    """Runtime client reusing one HTTP connection pool across calls and threads"""
+
+    def __init__(self, agent_arn=None, local_url=None, region=None, max_connections=10, timeout=900):
+        self.local_url = local_url
+        self.timeout = timeout
+        if local_url:
+            import httpx
+
+            self._http = httpx.Client(
+                base_url=local_url.rstrip("/"), timeout=timeout,
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            )
+            return
+
+        import boto3
+        from botocore.config import Config
+
+        self.agent_arn = agent_arn or os.getenv("AGENTCORE_AGENT_ARN") or agent_arn_from_config()
+        if not self.agent_arn:
+            raise ValueError(
+                "No agent runtime ARN. Set AGENTCORE_AGENT_ARN or deploy with `agentcore launch` first."
+            )
+        region = region or os.getenv("AWS_REGION") or self.agent_arn.split(":")[3]
+        self._runtime = boto3.client(
+            "bedrock-agentcore", region_name=region,
+            config=Config(max_pool_connections=max_connections, read_timeout=timeout, retries={"max_attempts": 2}),
+        )
+
+    def close(self):
+        if self.local_url:
+            self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _post(self, payload, session_id):
+        """(content type, line iterator or JSON body) of one invocation"""
+        if self.local_url:
+            request = self._http.build_request(
+                "POST", "/invocations", json=payload,
+                headers={"X-Amzn-Bedrock-AgentCore-Runtime-Session-Id": session_id},
+            )
+            response = self._http.send(request, stream=True)
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if "text/event-stream" in content_type:
+                return content_type, _closing_lines(response)
+            response.read()
+            response.close()
+            return content_type, response.json()
+
+        response = self._runtime.invoke_agent_runtime(
+            agentRuntimeArn=self.agent_arn,
+            runtimeSessionId=session_id,
+            payload=json.dumps(payload).encode(),
+        )
+        content_type = response.get("contentType", "")
+        if "text/event-stream" in content_type:
+            return content_type, response["response"].iter_lines()
+        return content_type, json.loads(response["response"].read())
+
+    def invoke(self, payload, session_id=None):
+        """Response body of one request (the runtime's JSON)"""
+        payload = dict(payload, stream=False)
+        _, body = self._post(payload, session_id or new_session_id())
+        if isinstance(body, dict):
+            return body
+        # A runtime that streams anyway: collect the done event
+        return _collect(sse_events(body))
+
+    def stream(self, payload, session_id=None):
+        """Streaming events of one request (see streaming.py for their shapes)"""
+        _, body = self._post(dict(payload, stream=True), session_id or new_session_id())
+        if isinstance(body, dict):
+            yield {"type": "done", **body}
+            return
+        yield from sse_events(body)
+
+    def batch(self, payloads, concurrency=4, on_result=None):
+        """Invoke every payload with up to `concurrency` in flight; results in input order"""
+        results = [None] * len(payloads)
+
+        def run(index):
+            payload = payloads[index]
+            started = time.perf_counter()
+            try:
+                body = self.invoke(payload)
+                error = body.get("error")
+            except Exception as e:
+                body, error = {}, f"{type(e).__name__}: {e}"
+            result = {
+                "index": index,
+                "id": payload.get("id", index),
+                "prompt": payload.get("prompt"),
+                "agent": body.get("agent", payload.get("agent")),
+                "status": "error" if error else "success",
+                "response": None if error else response_text(body),
+                "error": error,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                "usage": body.get("usage"),
+                "timings": body.get("timings"),
+            }
+            results[index] = result
+            if on_result:
+                on_result(result)
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            list(pool.map(run, range(len(payloads))))
+        return results
+
+
+def new_session_id():
+    # Runtime session IDs must be at least 33 characters
+    return f"session-{uuid.uuid4()}"
+
+
+def _closing_lines(response):
+    try:
+        yield from response.iter_lines()
+    finally:
+        response.close()
+
+
+def _collect(events):
+    done = {}
+    for event in events:
+        if event.get("type") == "done":
+            done = {key: value for key, value in event.items() if key != "type"}
+        elif event.get("type") == "error":
+            done = {"error": event.get("error")}
+    return done
+
+
+def read_batch(path):
+    """Payloads from a batch file: plain prompts or JSON objects, one per line"""
+    payloads = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                payloads.append(json.loads(line))
+            else:
+                payloads.append({"prompt": line})
+    return payloads
+
+
+def print_stream(events, out=sys.stdout):
+    """Print streamed text as it arrives and tool activity on its own lines.
+    Returns the done event, with "error" set if an error was printed or the stream ended without one."""
+    done = None
+    error = None
+    for event in events:
+        kind = event.get("type")
+        if kind == "text":
+            out.write(event.get("data", ""))
+            out.flush()
+        elif kind == "tool_use":
+            out.write(f"\n  [{event.get('name')}]\n")
+        elif kind == "done":
+            done = event
+        elif kind == "error":
+            error = event.get("error") or "unknown error"
+            out.write(f"\nError: {error}\n")
+    out.write("\n")
+    if done is None:
+        error = error or "stream ended without a final answer"
+    done = dict(done or {})
+    if error is not None:
+        done.setdefault("error", error)
+    return done
+
+
+def print_answer(body, out=sys.stdout):
+    out.write("\n" + "=" * 60 + "\n")
+    out.write(response_text(body) + "\n")
+    out.write("=" * 60 + "\n")
+    timings = body.get("timings") or {}
+    usage = body.get("usage") or {}
+    if timings or usage:
+        out.write(
+            f"[{body.get('agent', '')} {timings.get('total_ms', 0):.0f} ms, "
+            f"{usage.get('inputTokens', 0)} in / {usage.get('outputTokens', 0)} out tokens]\n\n"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Invoke the banking agent runtime")
+    parser.add_argument("prompt", nargs="*", help="Question to ask")
+    parser.add_argument("--agent", help="Persona: analyst, retention, credit_risk or wealth")
+    parser.add_argument("--stream", action="store_true", help="Print the answer as it is generated")
+    parser.add_argument("--local", nargs="?", const=os.getenv("AGENTCORE_LOCAL_URL", DEFAULT_LOCAL_URL),
+                        help="Call a local runtime instead of AgentCore")
+    parser.add_argument("--arn", help="Agent runtime ARN")
+    parser.add_argument("--session", help="Runtime session ID (default: a new one per prompt)")
+    parser.add_argument("--batch", help="File of prompts to send concurrently")
+    parser.add_argument("--output", help="JSONL results file for --batch (default stdout)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    if not args.batch and not args.prompt:
+        parser.print_usage()
+        return 1
+
+    with AgentCoreClient(agent_arn=args.arn, local_url=args.local,
+                         max_connections=max(args.concurrency, 1)) as client:
+        if args.batch:
+            payloads = read_batch(args.batch)
+            if args.agent:
+                payloads = [{"agent": args.agent, **payload} for payload in payloads]
+            out = open(args.output, "w") if args.output else sys.stdout
+            lock = threading.Lock()
+            finished = [0]
+
+            def progress(result):
+                with lock:
+                    finished[0] += 1
+                    print(f"[{finished[0]}/{len(payloads)}] {result['id']}: {result['status']} "
+                          f"in {result['latency_ms']:.0f} ms", file=sys.stderr)
+
+            started = time.perf_counter()
+            try:
+                results = client.batch(payloads, args.concurrency, on_result=progress)
+                for result in results:
+                    out.write(json.dumps(result, default=str) + "\n")
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+            failed = sum(result["status"] != "success" for result in results)
+            print(f"{len(results)} prompts, {failed} failed, {time.perf_counter() - started:.1f}s", file=sys.stderr)
+            return 1 if failed else 0
+
+        payload = {"prompt": " ".join(args.prompt)}
+        if args.agent:
+            payload["agent"] = args.agent
+        if args.stream:
+            done = print_stream(client.stream(payload, args.session))
+            return 1 if "error" in done else 0
+        body = client.invoke(payload, args.session)
+        print_answer(body)
+        return 1 if "error" in body else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,34 @@
 """
 Amazon AgentCore Demo - Teradata MCP Banking Agents Value Proposition
 This demonstrates the business value of real-time Teradata connectivity
+
+Portfolio figures come from the latest KPI snapshot (see kpi_snapshot.py) when
+one has been saved; otherwise the reference figures below are shown.
 """
 
+def print_portfolio():
+    """Print the portfolio summary from the KPI snapshot, if there is one"""
+    try:
+        from kpi_snapshot import load_snapshot, portfolio_lines, segment_line
+        snapshot = load_snapshot()
+    except ImportError:
+        snapshot = None
+
+    if not snapshot or not snapshot.get("portfolio"):
+        print("• 10,000 customers across France, Germany, Spain")
+        print("• $765M total deposits ($76.5K average balance)")
+        print("• 20.37% churn rate (2,037 customers at risk)")
+        print("• 651 average credit score (high-quality portfolio)")
+        print("• 52+ databases with rich operational data")
+        return
+
+    for line in portfolio_lines(snapshot["portfolio"]):
+        print(f"• {line}")
+    for item in snapshot["segments"].get("geography", []):
+        print(f"  - {segment_line(item)}")
+    print(f"  (KPI snapshot of {snapshot['table']} as of {snapshot['computed_at']})")
+
+
 def print_agentcore_value_demo():
     """Print the value demonstration for Amazon AgentCore deployment"""
     
@@ -13,11 +39,7 @@ def print_agentcore_value_demo():
     
     print("📊 YOUR CURRENT BANKING PORTFOLIO:")
     print("-" * 40)
-    print("• 10,000 customers across France, Germany, Spain")
-    print("• $765M total deposits ($76.5K average balance)")
-    print("• 20.37% churn rate (2,037 customers at risk)")
-    print("• 651 average credit score (high-quality portfolio)")
-    print("• 52+ databases with rich operational data")
+    print_portfolio()
     print()
     
     print("🚀 AMAZON AGENTCORE ADVANTAGES:")
@@ -0,0 +1,240 @@
+"""
+Banking Agent Runtime
+The per-process stack shared by every banking agent persona: one Bedrock model
+client, one Teradata MCP session pool, one schema catalog and one set of
+Teradata tool layers (SQL preflight, query cache, table mirror, result encoding,
+query guard).
+Prompts matching a known question template are answered in SQL without a model
+call (see fast_path.py). Requests in the same runtime session continue one
+conversation (see session_store.py).
+
+Entrypoint scripts build their app with startup.create_app(), which imports this
+module in the background, choose a persona (see personas.py) and await handle(). Invocations run on the asyncio event loop with
+bounded concurrency and a per-request timeout (see request_limits.py); their
+tool calls share the MCP pool, each call leasing whichever session is free.
+
+Configuration via environment variables:
+- TERADATA_DATABASE_URI: Connection string to Teradata cluster (required)
+- MCP_SERVER_COMMAND: Command starting teradata-mcp-server (default: the installed
+  teradata-mcp-server entry point, else "uvx teradata-mcp-server")
+- CLAUDE_MODEL_ID: Bedrock model ID, or a role=model mapping (see model_routing.py)
+- PROMPT_CACHING: auto / true / false (see prompt_cache.py)
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import shlex
+import shutil
+
+from mcp import StdioServerParameters
+
+from mcp_pool import MCPSessionPool
+from agent_factory import AgentFactory
+from schema_catalog import SchemaCatalog
+from kpi_snapshot import KPISnapshot
+from scoring import CustomerScorer
+from table_mirror import TableMirror
+from query_cache import QueryCache
+from query_guard import QueryGuard
+from sql_preflight import SQLPreflight
+from result_encoding import ResultEncoder
+from streaming import stream_answer, stream_response
+from fast_path import FastPath
+from batch import BatchRunner, is_batch
+from session_store import SessionStore
+from history import TokenBudgetConversationManager
+from request_limits import RequestLimiter
+from tool_execution import OrderedConcurrentToolExecutor
+from prompt_cache import prompt_caching_enabled, usage_summary
+from tracing import TracingHooks, span
+from model_routing import bedrock_models, model_roles
+from personas import DEFAULT_PERSONA, PERSONAS, resolve
+
+logger = logging.getLogger(__name__)
+
+# Configuration for the Teradata server process using environment variables ONLY
+# Requires TERADATA_DATABASE_URI environment variable to be set
+database_uri = os.getenv("TERADATA_DATABASE_URI")
+if not database_uri:
+    raise ValueError(
+        "TERADATA_DATABASE_URI environment variable is required.\n"
+        "Check your .env file or run: cat .env"
+    )
+
+# The container image pre-installs the server, so no uvx resolution at startup
+mcp_command = shlex.split(
+    os.getenv("MCP_SERVER_COMMAND")
+    or ("teradata-mcp-server" if shutil.which("teradata-mcp-server") else "uvx teradata-mcp-server")
+)
+
+teradata_config = {
+    "command": mcp_command[0],
+    "args": mcp_command[1:],
+    "env": {
+        "DATABASE_URI": database_uri
+    }
+}
+
+# Bedrock model per step role (analysis, sql, summary, intent); one ID by default
+model_ids = model_roles()
+CLAUDE_MODEL_ID = model_ids["analysis"]
+
+# Cache the tool specs, system prompt and schema across model turns
+prompt_caching = prompt_caching_enabled(CLAUDE_MODEL_ID)
+
+# One model client per model ID for every persona, routing each turn by role
+claude_model = bedrock_models(model_ids, streaming=False)
+
+# Token-streaming variant, used only when a request asks for {"stream": true}
+streaming_model = bedrock_models(model_ids, streaming=True)
+
+server_params = StdioServerParameters(
+    command=teradata_config["command"],
+    args=teradata_config["args"],
+    env=teradata_config["env"]
+)
+
+# Warm pool of long-lived Teradata MCP sessions, leased per tool call
+mcp_pool = MCPSessionPool(server_params)
+
+# Cached databases/tables/columns, injected into prompts instead of re-discovered
+schema_catalog = SchemaCatalog(mcp_pool, database_uri=database_uri)
+
+# Portfolio KPIs and segment breakdowns, precomputed on a schedule
+kpi_snapshot = KPISnapshot(mcp_pool, database_uri=database_uri)
+
+# Optional local columnar copy of the tables in MIRROR_TABLES for simple aggregates
+table_mirror = TableMirror(mcp_pool)
+
+# Rule-based churn / credit / wealth scores for every customer, computed locally
+customer_scorer = CustomerScorer(mcp_pool, kpi_snapshot.table, mirror=table_mirror)
+
+# Schema, GROUP BY and join checks (and optionally EXPLAIN) before a query reaches Teradata
+sql_preflight = SQLPreflight(schema_catalog, mcp_pool)
+
+# Result cache in front of the Teradata query tool, keyed on normalized SQL
+query_cache = QueryCache()
+
+# Columnar encoding of tool results, with full-precision copies kept on the side
+result_encoder = ResultEncoder()
+
+# Row limits and compact result summaries for every query the model runs
+query_guard = QueryGuard()
+
+# Tools are discovered once and shared by every persona's factory. Independent
+# tool calls in one turn run concurrently, each on its own pooled MCP session.
+base_factory = AgentFactory(
+    claude_model, mcp_pool, PERSONAS["analyst"]["system_prompt"],
+    catalog=schema_catalog,
+    tool_layers=[sql_preflight.wrap, query_cache.wrap, table_mirror.wrap, result_encoder.wrap, query_guard.wrap],
+    extra_tools=[result_encoder.as_tool(), kpi_snapshot.as_tool(), customer_scorer.as_tool()],
+    prompt_sections=[kpi_snapshot.prompt_section], cache_prompt=prompt_caching,
+    tool_executor=OrderedConcurrentToolExecutor()
+)
+factories = {
+    name: base_factory.for_prompt(persona["system_prompt"])
+    for name, persona in PERSONAS.items()
+}
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    """Starlette lifespan for BedrockAgentCoreApp: warms the pool, tools and schema
+    and keeps the KPI snapshot and table mirror refreshed"""
+    async with base_factory.lifespan(app):
+        kpi_snapshot.start()
+        table_mirror.start()
+        try:
+            yield
+        finally:
+            table_mirror.stop()
+            kpi_snapshot.stop()
+
+
+# Concurrency limit and per-request deadline for this container
+limiter = RequestLimiter()
+
+# Known question templates answered directly in SQL, before any agent is created
+fast_path = FastPath(mcp_pool, kpi_snapshot.table)
+
+# Conversation and intermediate results of each runtime session, for follow-ups
+session_store = SessionStore(encoder=result_encoder)
+
+# Many prompts or customers per request, sharing one prompt and prefetched profiles
+batch_runner = BatchRunner(limiter, customer_scorer)
+
+
+async def route(payload, session_id=None):
+    """Persona for a request: payload["agent"], the session's persona on follow-ups,
+    routing keywords, else the intent model"""
+    if not payload.get("agent"):
+        # A follow-up like "and for Germany?" says nothing about the persona it continues
+        persona = await asyncio.to_thread(session_store.persona, session_id)
+        if persona in PERSONAS:
+            return persona
+    persona = resolve(payload, default=None)
+    if persona is None and payload.get("prompt") and model_ids["intent"] != model_ids["analysis"]:
+        descriptions = {name: p["description"] for name, p in PERSONAS.items()}
+        try:
+            persona = await claude_model.classify(payload["prompt"], descriptions)
+        except Exception as e:
+            logger.warning("Intent classification failed: %s", e)
+    return persona or DEFAULT_PERSONA
+
+
+async def handle(persona, payload, session_id=None):
+    """Answer one AgentCore invocation with the given persona.
+    With a runtime session ID, the session's earlier turns are continued."""
+    factory = factories[persona]
+    if is_batch(payload):
+        # Each item takes its own request slot and deadline
+        return await batch_runner.run(factory, payload, PERSONAS[persona].get("customer_prompt"))
+
+    user_message = payload.get("prompt", PERSONAS[persona]["default_prompt"])
+
+    messages = await asyncio.to_thread(session_store.messages, session_id)
+
+    # Follow-up turns depend on the conversation so far: only a session's first turn may be a template
+    if payload.get("fast_path", True) and not messages:
+        # None for prompts without a template (or a failed query): the agent answers
+        response = await asyncio.to_thread(fast_path.answer, user_message)
+        if response is not None:
+            await asyncio.to_thread(session_store.append, session_id, user_message, response["response"], persona)
+            return stream_answer(response) if payload.get("stream") else response
+
+    session = {"messages": messages, "conversation_manager": TokenBudgetConversationManager()} if session_id else {}
+
+    if payload.get("stream"):
+        # Stream tokens and tool progress instead of waiting for the full answer
+        hooks = TracingHooks()
+        with span("agent.create", hooks.trace):
+            agent = await asyncio.to_thread(factory.create, model=streaming_model, callback_handler=None,
+                                            hooks=[hooks], **session)
+        return limiter.stream(saving_session(stream_response(agent, user_message, hooks.trace),
+                                             agent, session_id, persona))
+
+    try:
+        return await limiter.run(answer, factory, user_message, session_id, persona, session)
+    except TimeoutError:
+        return {"error": f"Request timed out after {limiter.timeout:.0f}s"}
+
+
+async def answer(factory, user_message, session_id=None, persona=None, session=None):
+    # Agent creation can block on first-use tool discovery, so keep it off the loop
+    hooks = TracingHooks()
+    with span("agent.create", hooks.trace):
+        agent = await asyncio.to_thread(factory.create, hooks=[hooks], **(session or {}))
+    result = await agent.invoke_async(user_message)
+    if session_id:
+        await asyncio.to_thread(session_store.save, session_id, agent.messages, persona)
+    return {"response": result.message, "usage": usage_summary(result), "timings": hooks.trace.summary()}
+
+
+async def saving_session(events, agent, session_id, persona):
+    """Pass streaming events through and save the session once the answer is complete"""
+    async for event in events:
+        if event["type"] == "done" and session_id:
+            await asyncio.to_thread(session_store.save, session_id, agent.messages, persona)
+        yield event
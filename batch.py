@@ -0,0 +1,156 @@
+"""
+Batch Invocations
+Runs many prompts - or one prompt per customer - in a single AgentCore request.
+
+Payload shapes (alongside the usual "agent"):
+- {"prompts": ["...", {"id": "q2", "prompt": "..."}, ...]}
+- {"customer_ids": [15634602, ...], "prompt": "optional template with {customer_id}"}
+
+Every item gets its own conversation but they share one system prompt (schema
+and KPI sections built once, so Bedrock prompt caching hits from the second item
+on) and the process-wide tools, MCP pool and caches. Customer profiles and
+scores are looked up for all IDs at once from the locally scored customer table
+(see scoring.py) and put into each item's prompt, so items do not query their
+customer one by one, and are answered by the summary model (see
+model_routing.py). Items run with bounded parallelism, each in a request slot
+with the usual per-request deadline; a failing item is reported in its own
+result and does not stop the others.
+
+Response: {"results": [{"index", "id", "status", "response", "error", "usage",
+"timings"}, ...], "summary": {"items", "succeeded", "failed", "elapsed_ms", "usage"}}
+
+Configuration via environment variables:
+- BATCH_MAX_PARALLEL: Items of one batch run at once (default 4)
+- BATCH_MAX_ITEMS: Largest accepted batch (default 500)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+
+from model_routing import for_role
+from prompt_cache import USAGE_KEYS, usage_summary
+from tracing import TracingHooks, span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CUSTOMER_PROMPT = "Summarize customer {customer_id} and recommend the next best action."
+
+CUSTOMER_INSTRUCTIONS = (
+    "Answer for this one customer only, in a few concise bullet points. "
+    "The profile below is current; query Teradata only for information it does not contain."
+)
+
+
+def is_batch(payload):
+    return isinstance(payload, dict) and ("prompts" in payload or "customer_ids" in payload)
+
+
+def message_text(message):
+    return "\n".join(c["text"] for c in message.get("content", []) if "text" in c)
+
+
+class BatchRunner:
+    """Expands a batch payload into items and answers them with shared setup"""
+
+    def __init__(self, limiter, scorer=None, max_parallel=None, max_items=None):
+        self.limiter = limiter
+        self.scorer = scorer
+        self.max_parallel = max_parallel or int(os.getenv("BATCH_MAX_PARALLEL", "4"))
+        self.max_items = max_items or int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
+    def items(self, payload, customer_prompt=None):
+        """[(id, prompt or None, error or None)] for a batch payload"""
+        if "customer_ids" in payload:
+            return self.customer_items(payload["customer_ids"], payload.get("prompt") or customer_prompt)
+        items = []
+        for index, item in enumerate(payload["prompts"]):
+            if isinstance(item, dict):
+                items.append((item.get("id", index), item.get("prompt"), None if item.get("prompt") else "Missing prompt"))
+            else:
+                items.append((index, str(item), None))
+        return items
+
+    def customer_items(self, customer_ids, template=None):
+        """One item per customer, with its scored profile prefetched for the whole batch"""
+        template = template or DEFAULT_CUSTOMER_PROMPT
+        if "{customer_id}" not in template:
+            template += " (customer {customer_id})"
+        profiles = {}
+        if self.scorer is not None:
+            numeric = [i for i in customer_ids if str(i).strip().isdigit()]
+            profiles = self.scorer.customers(numeric)
+        items = []
+        for customer_id in customer_ids:
+            key = int(customer_id) if str(customer_id).strip().isdigit() else None
+            if key is None:
+                items.append((customer_id, None, f"Invalid customer ID '{customer_id}'"))
+                continue
+            prompt = template.format(customer_id=key)
+            if self.scorer is not None:
+                profile = profiles.get(key)
+                if profile is None:
+                    items.append((key, None, f"Customer {key} not found"))
+                    continue
+                prompt += f"\n\n{CUSTOMER_INSTRUCTIONS}\nCustomer profile: {json.dumps(profile, default=str)}"
+            items.append((key, prompt, None))
+        return items
+
+    async def run(self, factory, payload, customer_prompt=None):
+        """Answer every item of a batch payload; never raises for a single item's failure"""
+        started = time.perf_counter()
+        try:
+            items = await asyncio.to_thread(self.items, payload, customer_prompt)
+            max_parallel = max(1, min(int(payload.get("max_parallel") or self.max_parallel), self.max_parallel))
+        except Exception as e:
+            return {"error": f"Invalid batch: {e}"}
+        if len(items) > self.max_items:
+            return {"error": f"Batch of {len(items)} items exceeds BATCH_MAX_ITEMS ({self.max_items})"}
+
+        # Built once so every item sends byte-identical, cacheable system prompt blocks
+        system_prompt = await asyncio.to_thread(factory.prompt)
+        # Customer items summarize a given profile: the summary model's job
+        model = for_role(factory.model, "summary") if "customer_ids" in payload else factory.model
+        parallel = asyncio.Semaphore(max_parallel)
+
+        async def run_item(index, item_id, prompt, error):
+            result = {"index": index, "id": item_id, "status": "error", "response": None,
+                      "error": error, "usage": None, "timings": None}
+            if error:
+                return result
+            async with parallel:
+                try:
+                    answer = await self.limiter.run(self.answer, factory, system_prompt, prompt, model)
+                    result.update(status="success", error=None, **answer)
+                except TimeoutError:
+                    result["error"] = f"Timed out after {self.limiter.timeout:.0f}s"
+                except Exception as e:
+                    logger.warning("Batch item %s failed: %s", item_id, e)
+                    result["error"] = f"{type(e).__name__}: {e}"
+            return result
+
+        results = await asyncio.gather(*(run_item(i, *item) for i, item in enumerate(items)))
+        usage = {key: sum((r["usage"] or {}).get(key, 0) for r in results) for key in USAGE_KEYS}
+        succeeded = sum(r["status"] == "success" for r in results)
+        return {
+            "results": results,
+            "summary": {
+                "items": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "usage": usage,
+            },
+        }
+
+    @staticmethod
+    async def answer(factory, system_prompt, prompt, model=None):
+        hooks = TracingHooks()
+        with span("agent.create", hooks.trace):
+            agent = await asyncio.to_thread(factory.create, system_prompt=system_prompt, hooks=[hooks],
+                                            model=model or factory.model)
+        result = await agent.invoke_async(prompt)
+        return {"response": message_text(result.message), "usage": usage_summary(result),
+                "timings": hooks.trace.summary()}
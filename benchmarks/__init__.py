@@ -0,0 +1 @@
+"""Offline benchmarks: mock Teradata MCP server, scripted model and runner (see run.py)"""
@@ -0,0 +1,134 @@
+"""
+Scripted Model
+Deterministic stand-in for BedrockModel used by the benchmarks.
+
+Each request follows the same script: a fixed sequence of tool-calling turns
+(tools the agent does not have are skipped), then a canned final answer. Every
+turn waits a fixed latency plus a per-output-token cost.
+
+Token usage is estimated from request size (about 4 characters per token) so
+changes to prompts, tool results and history show up in the numbers. When the
+system prompt carries cache checkpoints, a prefix already sent earlier is
+counted as cache read tokens, otherwise as cache write tokens.
+
+The calling benchmark can read per-request turn counts through the
+`request_stats` context variable.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import itertools
+import json
+
+from strands.models.model import Model
+
+from history import turn_starts
+
+CHARS_PER_TOKEN = 4
+
+TABLE = "demo_user.Churn_Modelling"
+
+# Tool calls per model turn; calls in one turn are independent and may run concurrently
+DEFAULT_SCRIPT = (
+    (
+        ("base_readQuery", {"sql": f"SELECT Geography, COUNT(*) AS customers, AVG(Balance) AS avg_balance, "
+                                   f"AVG(CAST(Exited AS FLOAT)) AS churn_rate FROM {TABLE} GROUP BY Geography"}),
+        ("base_readQuery", {"sql": f"SELECT NumOfProducts, COUNT(*) AS customers, SUM(Exited) AS churned "
+                                   f"FROM {TABLE} GROUP BY NumOfProducts ORDER BY NumOfProducts"}),
+        ("score_customers", {"group_by": "churn_risk"}),
+    ),
+    (
+        ("base_readQuery", {"sql": f"SELECT TOP 20 CustomerId, Surname, Geography, Age, Balance, CreditScore "
+                                   f"FROM {TABLE} WHERE Exited = 0 AND IsActiveMember = 0 ORDER BY Balance DESC"}),
+    ),
+)
+
+ANSWER = (
+    "**Portfolio analysis**\n\n"
+    "Germany shows the highest churn rate and the highest average balance, so the "
+    "retention budget should be weighted towards German customers. Customers holding "
+    "three or more products churn far more often than single- and two-product holders, "
+    "which points to cross-sell fatigue rather than product gaps.\n\n"
+    "**Recommendations**\n"
+    "1. Contact the 20 inactive high-balance customers listed above within 7 days.\n"
+    "2. Review the bundling offer for three-product customers.\n"
+    "3. Track churn monthly by Geography and product count.\n"
+)
+
+request_stats = contextvars.ContextVar("request_stats", default=None)
+
+
+def estimate_tokens(value):
+    return len(json.dumps(value, default=str)) // CHARS_PER_TOKEN
+
+
+class ScriptedModel(Model):
+    """strands Model that replays a fixed tool-calling script with simulated latency and usage"""
+
+    def __init__(self, script=DEFAULT_SCRIPT, latency_ms=300, ms_per_output_token=2.0):
+        self.config = {"model_id": "benchmark-scripted-model"}
+        self.script = script
+        self.latency = latency_ms / 1000
+        self.seconds_per_output_token = ms_per_output_token / 1000
+        self._ids = itertools.count(1)
+        self._cached_prefixes = set()
+
+    def update_config(self, **model_config):
+        self.config.update(model_config)
+
+    def get_config(self):
+        return self.config
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError("ScriptedModel does not support structured output")
+
+    def _usage(self, messages, tool_specs, system_prompt, system_prompt_content, output):
+        system = system_prompt_content or ([{"text": system_prompt}] if system_prompt else [])
+        usage = {
+            "inputTokens": estimate_tokens(messages) + estimate_tokens(tool_specs or []) + estimate_tokens(system),
+            "outputTokens": estimate_tokens(output),
+            "cacheReadInputTokens": 0,
+            "cacheWriteInputTokens": 0,
+        }
+        checkpoints = [i for i, block in enumerate(system) if "cachePoint" in block]
+        if checkpoints:
+            prefix = system[:checkpoints[-1]]
+            tokens = estimate_tokens(prefix) + estimate_tokens(tool_specs or [])
+            key = hashlib.sha256(json.dumps([prefix, tool_specs], default=str).encode()).hexdigest()
+            usage["cacheReadInputTokens" if key in self._cached_prefixes else "cacheWriteInputTokens"] = tokens
+            usage["inputTokens"] -= tokens
+            self._cached_prefixes.add(key)
+        usage["totalTokens"] = usage["inputTokens"] + usage["outputTokens"]
+        return usage
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, *, tool_choice=None,
+                     system_prompt_content=None, **kwargs):
+        turn = sum(1 for message in messages[turn_starts(messages)[-1]:] if message["role"] == "assistant")
+        available = {spec["name"] for spec in tool_specs or []}
+        calls = []
+        if turn < len(self.script):
+            calls = [(name, arguments) for name, arguments in self.script[turn] if name in available]
+
+        stats = request_stats.get()
+        if stats is not None:
+            stats["turns"] = stats.get("turns", 0) + 1
+
+        output = [{"toolUse": {"name": n, "input": a}} for n, a in calls] if calls else ANSWER
+        usage = self._usage(messages, tool_specs, system_prompt, system_prompt_content, output)
+        await asyncio.sleep(self.latency + self.seconds_per_output_token * usage["outputTokens"])
+
+        yield {"messageStart": {"role": "assistant"}}
+        if calls:
+            for name, arguments in calls:
+                tool_use_id = f"tooluse_bench{next(self._ids)}"
+                yield {"contentBlockStart": {"start": {"toolUse": {"toolUseId": tool_use_id, "name": name}}}}
+                yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(arguments)}}}}
+                yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "tool_use"}}
+        else:
+            yield {"contentBlockStart": {"start": {}}}
+            yield {"contentBlockDelta": {"delta": {"text": ANSWER}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {"usage": usage, "metrics": {"latencyMs": int(self.latency * 1000)}}}
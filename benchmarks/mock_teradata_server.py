@@ -0,0 +1,169 @@
+"""
+Mock Teradata MCP Server
+Deterministic, local stand-in for teradata-mcp-server used by the benchmarks.
+
+Serves a generated Churn_Modelling table (same columns as the demo dataset) from
+an in-memory SQLite database over MCP stdio, with the tool names, arguments and
+{"status", "results", "metadata"} JSON bodies of the real server. Teradata-only
+syntax the agents use (SEL, TOP n, SAMPLE n, database-qualified names) is
+rewritten for SQLite; anything SQLite cannot run comes back as an error body.
+
+Each call sleeps for a fixed latency plus a per-row cost before answering, and
+calls on one server process are served one at a time, like the real stdio server.
+
+Configuration via environment variables:
+- MOCK_TERADATA_LATENCY_MS: Fixed latency per tool call (default 20)
+- MOCK_TERADATA_ROW_LATENCY_US: Extra latency per returned row (default 2)
+- MOCK_TERADATA_ROWS: Customers in the generated table (default 10000)
+- MOCK_TERADATA_SEED: Random seed of the generated data (default 42)
+"""
+
+import json
+import os
+import random
+import re
+import sqlite3
+import time
+
+from mcp.server.fastmcp import FastMCP
+
+DATABASE = "demo_user"
+TABLE = "Churn_Modelling"
+
+# (name, Teradata CType, SQLite type)
+COLUMNS = (
+    ("RowNumber", "I", "INTEGER"),
+    ("CustomerId", "I", "INTEGER"),
+    ("Surname", "CV", "TEXT"),
+    ("CreditScore", "I", "INTEGER"),
+    ("Geography", "CV", "TEXT"),
+    ("Gender", "CV", "TEXT"),
+    ("Age", "I", "INTEGER"),
+    ("Tenure", "I", "INTEGER"),
+    ("Balance", "F", "REAL"),
+    ("NumOfProducts", "I", "INTEGER"),
+    ("HasCrCard", "I", "INTEGER"),
+    ("IsActiveMember", "I", "INTEGER"),
+    ("EstimatedSalary", "F", "REAL"),
+    ("Exited", "I", "INTEGER"),
+)
+
+SURNAMES = (
+    "Smith", "Chu", "Onio", "Boni", "Mitchell", "Bartlett", "Obinna", "He", "Hill", "Scott",
+    "Moretti", "Dubois", "Garcia", "Schmidt", "Lopez", "Martin", "Fischer", "Rossi", "Leroy", "Weber",
+)
+
+LATENCY = float(os.getenv("MOCK_TERADATA_LATENCY_MS", "20")) / 1000
+ROW_LATENCY = float(os.getenv("MOCK_TERADATA_ROW_LATENCY_US", "2")) / 1_000_000
+
+
+def generate_customers(count, seed):
+    """Churn_Modelling-like rows; churn is more likely for older, inactive and German customers"""
+    rng = random.Random(seed)
+    rows = []
+    for number in range(1, count + 1):
+        geography = rng.choices(("France", "Spain", "Germany"), weights=(50, 25, 25))[0]
+        age = max(18, min(92, int(rng.gauss(39, 10))))
+        active = int(rng.random() < 0.52)
+        products = rng.choices((1, 2, 3, 4), weights=(50, 46, 3, 1))[0]
+        balance = 0.0 if rng.random() < 0.36 else round(rng.gauss(120_000, 30_000), 2)
+        churn = 0.08 + 0.15 * (geography == "Germany") + 0.2 * (age > 45) + 0.1 * (not active) + 0.5 * (products > 2)
+        rows.append((
+            number, 15_565_700 + number, rng.choice(SURNAMES), max(350, min(850, int(rng.gauss(650, 97)))),
+            geography, rng.choice(("Male", "Female")), age, rng.randint(0, 10), max(0.0, balance), products,
+            int(rng.random() < 0.7), active, round(rng.uniform(11.58, 199_992.48), 2), int(rng.random() < min(churn, 0.95)),
+        ))
+    return rows
+
+
+def create_database():
+    db = sqlite3.connect(":memory:", check_same_thread=False)
+    db.row_factory = sqlite3.Row
+    db.execute(f"CREATE TABLE {TABLE} ({', '.join(f'{name} {kind}' for name, _, kind in COLUMNS)})")
+    rows = generate_customers(int(os.getenv("MOCK_TERADATA_ROWS", "10000")), int(os.getenv("MOCK_TERADATA_SEED", "42")))
+    db.executemany(f"INSERT INTO {TABLE} VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+    return db
+
+
+def to_sqlite(sql):
+    """Rewrite the Teradata dialect the agents use into SQLite"""
+    sql = sql.strip().rstrip(";")
+    sql = re.sub(r"^SEL\b", "SELECT", sql, flags=re.I)
+    sql = re.sub(rf"\b\w+\.({TABLE})\b", r"\1", sql, flags=re.I)
+    limit = None
+    top = re.match(r"^(\s*SELECT\s+(?:DISTINCT\s+)?)TOP\s+(\d+)\s+", sql, re.I)
+    if top:
+        sql, limit = top.group(1) + sql[top.end():], int(top.group(2))
+    sample = re.search(r"\s+SAMPLE\s+(\d+)\s*$", sql, re.I)
+    if sample:
+        sql, limit = sql[:sample.start()], int(sample.group(1))
+    return f"{sql} LIMIT {limit}" if limit is not None else sql
+
+
+db = create_database()
+mcp = FastMCP("teradata-mock", log_level="WARNING")
+
+
+def respond(tool_name, rows, **metadata):
+    time.sleep(LATENCY + ROW_LATENCY * len(rows))
+    return json.dumps({
+        "status": "success",
+        "results": rows,
+        "metadata": {"tool_name": tool_name, **metadata, "row_count": len(rows)},
+    })
+
+
+def error(message):
+    time.sleep(LATENCY)
+    return json.dumps({"status": "error", "message": message})
+
+
+@mcp.tool()
+def base_readQuery(sql: str) -> str:
+    """Execute a SQL query via SQLAlchemy, bind parameters if provided (prepared SQL), and return the fully rendered SQL (with literals) and results.
+
+    Arguments:
+      sql - SQL text, with optional bind-parameter placeholders
+    """
+    try:
+        cursor = db.execute(to_sqlite(sql))
+        rows = [dict(row) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        return error(f"[Error 3706] Syntax error: {e}")
+    columns = [{"name": c[0], "type": "unknown"} for c in cursor.description or ()]
+    return respond("base_readQuery", rows, sql=sql, columns=columns)
+
+
+@mcp.tool()
+def base_databaseList() -> str:
+    """Lists all databases in the Teradata System."""
+    return respond("base_databaseList", [{"DataBaseName": DATABASE, "DBType": "User"}])
+
+
+@mcp.tool()
+def base_tableList(database_name: str = DATABASE) -> str:
+    """Lists all tables in a database.
+
+    Arguments:
+      database_name - Database name
+    """
+    rows = [{"TableName": TABLE, "DataBaseName": DATABASE}] if database_name.lower() == DATABASE else []
+    return respond("base_tableList", rows, database=database_name)
+
+
+@mcp.tool()
+def base_columnDescription(database_name: str, obj_name: str) -> str:
+    """Shows detailed column information about a database table.
+
+    Arguments:
+      database_name - Database name
+      obj_name - table or view name
+    """
+    if database_name.lower() != DATABASE or obj_name not in ("%", TABLE):
+        return respond("base_columnDescription", [], database=database_name, object=obj_name)
+    rows = [{"TableName": TABLE, "ColumnName": name, "CType": ctype} for name, ctype, _ in COLUMNS]
+    return respond("base_columnDescription", rows, database=database_name, object=obj_name)
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,86 @@
+"""
+Circuit Breaker
+Fail-fast guard for the Teradata MCP channel during warehouse incidents.
+
+Without it, every request keeps sending queries to an unhealthy cluster and
+each one holds a pooled MCP session and a request slot until its deadline.
+After MCP_BREAKER_FAILURES consecutive channel failures (timeouts, broken MCP
+sessions, Teradata connection errors) the breaker opens and calls fail at once
+with an error the model can act on. After MCP_BREAKER_RESET_SECONDS one trial
+call is let through: success closes the breaker, failure opens it again.
+Query errors (bad SQL, missing objects) say nothing about the cluster and do
+not count.
+
+Configuration via environment variables:
+- MCP_BREAKER_FAILURES: Consecutive failures that open the breaker (default 5, 0 disables it)
+- MCP_BREAKER_RESET_SECONDS: Seconds the breaker stays open before a trial call (default 30)
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpen(RuntimeError):
+    """A call refused because the breaker is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker, safe to share between threads"""
+
+    def __init__(self, failures=None, reset_seconds=None):
+        self.failures = failures if failures is not None else int(os.getenv("MCP_BREAKER_FAILURES", "5"))
+        self.reset_seconds = reset_seconds or float(os.getenv("MCP_BREAKER_RESET_SECONDS", "30"))
+        self.state = CLOSED
+        self.consecutive = 0
+        self.opened_at = None
+        self._trial_at = None
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Raise CircuitOpen unless a call may go ahead"""
+        if self.failures <= 0:
+            return
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            retry_in = self.opened_at + self.reset_seconds - time.monotonic()
+            if self.state == OPEN and retry_in <= 0:
+                self.state = HALF_OPEN
+            # One trial call at a time; a trial that never reported back is replaced
+            now = time.monotonic()
+            if self.state == HALF_OPEN and (self._trial_at is None or now - self._trial_at > self.reset_seconds):
+                self._trial_at = now
+                return
+        raise CircuitOpen(
+            f"Teradata is unavailable after {self.consecutive} consecutive failures; "
+            f"not retrying for {max(retry_in, 0):.0f}s. Answer from the data already retrieved "
+            "or tell the user the warehouse is unavailable."
+        )
+
+    def success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Teradata circuit breaker closed")
+            self.state = CLOSED
+            self.consecutive = 0
+            self._trial_at = None
+
+    def failure(self):
+        if self.failures <= 0:
+            return
+        with self._lock:
+            self.consecutive += 1
+            self._trial_at = None
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.consecutive >= self.failures):
+                logger.warning("Teradata circuit breaker open after %d consecutive failures", self.consecutive)
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        return {"state": self.state, "consecutive_failures": self.consecutive}
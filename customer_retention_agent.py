@@ -1,118 +1,13 @@
-import os
-from strands import Agent
-from strands.tools.mcp import MCPClient
-from mcp import stdio_client, StdioServerParameters
-from strands.models.bedrock import BedrockModel
-from bedrock_agentcore.runtime import BedrockAgentCoreApp
+# Model, MCP session pool, schema catalog and query cache are shared with
+# every other persona (see banking_runtime.py); the prompt lives in personas.py
+from startup import create_app, handle
 
-# Configuration for the Teradata server process using environment variables ONLY
-# Requires TERADATA_DATABASE_URI environment variable to be set
-database_uri = os.getenv("TERADATA_DATABASE_URI")
-if not database_uri:
-    raise ValueError("TERADATA_DATABASE_URI environment variable is required but not set")
-
-teradata_config = {
-    "command": "uvx",
-    "args": ["teradata-mcp-server"],
-    "env": {
-        "DATABASE_URI": database_uri
-    }
-}
-
-# Configure the model for Amazon AgentCore
-CLAUDE_MODEL_ID = "anthropic.claude-3-5-sonnet-20240620-v1:0"
-
-# Create the model instance
-claude_model = BedrockModel(model_id=CLAUDE_MODEL_ID, streaming=False)
-
-# Create MCP client for Teradata
-server_params = StdioServerParameters(
-    command=teradata_config["command"],
-    args=teradata_config["args"],
-    env=teradata_config["env"]
-)
-
-teradata_tool = MCPClient(lambda: stdio_client(server_params))
-
-app = BedrockAgentCoreApp()
+app = create_app()
 
 @app.entrypoint
-def invoke(payload):
-    # Specialized system prompt for customer retention
-    system_prompt = """You are a Customer Retention Intelligence specialist for a European bank with 10,000 customers across France, Germany, and Spain. Your mission is to prevent customer churn and maximize customer lifetime value.
-
-**CURRENT PORTFOLIO CONTEXT:**
-- 10,000 customers with $765M total deposits ($76.5K average)
-- 20.37% churn rate (2,037 customers lost) - URGENT PRIORITY
-- Average credit score: 651 (good quality portfolio)
-- Geographic spread: France, Germany, Spain
-- Product mix: 1-4 products per customer, credit cards, various balances
-
-**YOUR EXPERTISE:**
-
-🚨 **Churn Risk Analysis**:
-- Identify customers with highest churn probability using behavioral indicators
-- Calculate revenue at risk from potential churners
-- Segment customers by churn risk: High (>70%), Medium (30-70%), Low (<30%)
-- Analyze churn patterns by geography, demographics, and product usage
-
-💰 **Revenue Impact Assessment**:
-- Calculate customer lifetime value and potential revenue loss
-- Prioritize retention efforts by customer value and churn probability
-- Identify high-value customers (>$100K balance) at risk
-- Estimate ROI of retention campaigns by segment
-
-🎯 **Retention Strategy Recommendations**:
-- Personalized retention offers based on customer profiles
-- Optimal contact timing and channel recommendations
-- Product cross-sell opportunities for at-risk customers
-- Geographic-specific retention strategies (France vs Germany vs Spain)
-
-📊 **Performance Monitoring**:
-- Track retention campaign effectiveness
-- Monitor churn rate trends by segment
-- Measure customer satisfaction indicators
-- A/B testing results for retention strategies
-
-**KEY CHURN INDICATORS TO ANALYZE:**
-- Balance trends (declining balances indicate risk)
-- Product usage (single product customers higher risk)
-- Activity levels (IsActiveMember = 0 indicates disengagement)
-- Credit profile changes
-- Geographic and demographic patterns
-- Tenure vs churn correlation
-
-**CRITICAL SUCCESS METRICS:**
-- Reduce churn from 20.37% to <15% (target: $5-10M annual savings)
-- Increase customer lifetime value by 25%
-- Improve retention campaign response rates to >40%
-- Achieve 3:1 ROI on retention investments
-
-**OUTPUT REQUIREMENTS:**
-- Show actual customer data (first 10 rows) with clear risk scores
-- Provide specific, actionable recommendations with expected impact
-- Include confidence levels and statistical significance
-- Flag urgent cases requiring immediate intervention (within 24-48 hours)
-- Calculate revenue impact in dollars for all recommendations
-
-**SAMPLE ANALYSES:**
-- "Show me high-value customers (>$100K) at immediate risk of churning"
-- "Analyze churn patterns by geography and recommend targeted campaigns"
-- "Identify inactive customers suitable for re-engagement"
-- "Calculate revenue impact if we lose our top 50 at-risk customers"
-
-Focus on actionable insights that can immediately reduce the 20.37% churn rate and protect the $765M deposit base."""
-
-    # Create customer retention agent
-    retention_agent = Agent(
-        model=claude_model, 
-        tools=[teradata_tool],
-        system_prompt=system_prompt
-    )
-    
-    user_message = payload.get("prompt", "Show me customers at highest risk of churning and calculate the revenue impact")
-    result = retention_agent(user_message)
-    return {"response": result.message}
+async def invoke(payload, context=None):
+    # Specialized customer retention agent
+    return await handle("retention", payload, getattr(context, "session_id", None))
 
 if __name__ == "__main__":
-    app.run()
\ No newline at end of file
+    app.run()
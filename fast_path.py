@@ -0,0 +1,448 @@
+"""
+Fast Path
+Answers the standard sample analyses directly in SQL, without a model call.
+
+Prompts are matched against parameterized question templates (the SAMPLE
+ANALYSES of the persona prompts and their common variants). A template only
+applies when the whole prompt is one of its phrasings: every word has to be
+accounted for, so a question with any further qualifier ("... for customers
+over 60") is left to the agent. Parameters - a balance threshold (">$150K"), a
+top-N ("top 50"), a subset of countries - are slots in those phrasings; a value
+outside its range also leaves the prompt to the agent. The template's
+precompiled SQL runs once through the MCP pool, and the rows are rendered as a
+markdown answer with a few rule-based observations. Anything that does not
+match - or whose query fails - goes to the agent as usual; so do requests with
+{"fast_path": false} and follow-up turns of a session.
+
+Configuration via environment variables:
+- FAST_PATH_ENABLED: "true" (default) or "false"
+- FAST_PATH_NET_INTEREST_MARGIN: Margin used for revenue impact figures (default 0.02)
+"""
+
+import logging
+import os
+import re
+import time
+
+from kpi_snapshot import SEGMENTS, money
+from prompt_cache import USAGE_KEYS
+from teradata_tools import QUERY_TOOL, call_tool, result_rows
+
+logger = logging.getLogger(__name__)
+
+GEOGRAPHIES = ("France", "Germany", "Spain")
+
+MAX_TOP = 100
+MAX_AMOUNT = 1_000_000_000
+
+# Slots of the template phrasings
+_SLOTS = {
+    "verb": r"(?:(?:please\s+)?(?:show(?:\s+me)?|list|find|identify|analy[sz]e|calculate|get|give\s+me|display)\s+)?",
+    "amount": r"(?P<amount>\$?\s*\d[\d,]*(?:\.\d+)?\s*[km]?)",
+    "top": r"(?P<top>\d+)",
+    "countries": r"(?P<countries>(?:france|germany|spain)(?:(?:\s*,\s*(?:and\s+)?|\s+and\s+)(?:france|germany|spain))*)",
+}
+_SLOTS["in_countries"] = rf"(?:\s+(?:in|for|across)\s+{_SLOTS['countries']})?"
+_SLOTS["more_than"] = r"(?:>|over|above|greater\s+than|more\s+than|of\s+more\s+than)"
+_SLOTS["top_n"] = rf"(?:the\s+)?(?:top\s+{_SLOTS['top']}\s+)?"
+_SLOTS["markets"] = rf"(?:\s+(?:across|by|in|for)\s+(?:{_SLOTS['countries']}|geography|countries|markets))?"
+
+
+def normalize_prompt(prompt):
+    """Lower-case prompt with collapsed whitespace and no surrounding quotes or final punctuation"""
+    text = re.sub(r"\s+", " ", prompt).strip().strip("\"'").strip()
+    return re.sub(r"[.?!]+$", "", text).strip().lower()
+
+
+def parse_amount(text):
+    """Dollar amount of "$150,000", "150K" or "1.5m"; None if it does not parse"""
+    match = re.fullmatch(r"\$?\s*(\d[\d,]*(?:\.\d+)?)\s*([km])?", text.strip())
+    if not match:
+        return None
+    value = float(match.group(1).replace(",", ""))
+    return int(value * {"k": 1_000, "m": 1_000_000}.get(match.group(2) or "", 1))
+
+
+def parse_params(match):
+    """Parameters captured by a template phrasing; None if any is out of range"""
+    groups = {k: v for k, v in match.groupdict().items() if v is not None}
+    params = {}
+    if "amount" in groups:
+        amount = parse_amount(groups["amount"])
+        if amount is None or not 0 < amount <= MAX_AMOUNT:
+            return None
+        params["amount"] = amount
+    if "top" in groups:
+        top = int(groups["top"])
+        if not 1 <= top <= MAX_TOP:
+            return None
+        params["top"] = top
+    countries = groups.get("countries", "")
+    params["geographies"] = [g for g in GEOGRAPHIES if g.lower() in countries] or list(GEOGRAPHIES)
+    return params
+
+
+# Churn indicators from the retention prompt that the table can show directly
+RISK_INDICATORS = "(CASE WHEN IsActiveMember = 0 THEN 1 ELSE 0 END) + (CASE WHEN NumOfProducts = 1 THEN 1 ELSE 0 END)"
+
+CREDIT_TIER = SEGMENTS["credit_tier"]
+WEALTH_TIER = SEGMENTS["wealth_tier"]
+
+
+def geography_filter(params):
+    if len(params["geographies"]) == len(GEOGRAPHIES):
+        return ""
+    return f" AND Geography IN ({', '.join(repr(g) for g in params['geographies'])})"
+
+
+class Template:
+    """Question phrasings, their parameterized SQL and how to render the rows"""
+
+    def __init__(self, name, phrasings, title, sql, notes=None, defaults=None):
+        self.name = name
+        # Each phrasing must match the whole normalized prompt
+        self.phrasings = [re.compile(p.format(**_SLOTS)) for p in phrasings]
+        self.title = title
+        self.sql = sql
+        self.notes = notes or (lambda rows, params: [])
+        self.defaults = defaults or {}
+
+    def params(self, prompt):
+        """Parameters of a prompt that is one of the phrasings, else None"""
+        text = normalize_prompt(prompt)
+        for phrasing in self.phrasings:
+            match = phrasing.fullmatch(text)
+            if match:
+                params = parse_params(match)
+                return None if params is None else {**self.defaults, **params}
+        return None
+
+
+# -- Templates ---------------------------------------------------------------
+
+def _high_value_churn_sql(p, table):
+    return f"""SELECT TOP {p['top']} CustomerId, Surname, Geography, Age, Balance, CreditScore,
+        NumOfProducts, IsActiveMember, {RISK_INDICATORS} AS risk_indicators,
+        COUNT(*) OVER () AS matching_customers, SUM(Balance) OVER () AS matching_balance
+    FROM {table}
+    WHERE Exited = 0 AND Balance > {p['amount']} AND {RISK_INDICATORS} > 0{geography_filter(p)}
+    ORDER BY risk_indicators DESC, Balance DESC"""
+
+
+def _high_value_churn_notes(rows, p):
+    if not rows:
+        return [f"No active customers above {money(p['amount'])} show churn indicators."]
+    first = rows[0]
+    both = sum(1 for r in rows if _num(r["risk_indicators"]) >= 2)
+    return [
+        f"{_num(first['matching_customers']):,.0f} active customers above {money(p['amount'])} show at least one "
+        f"churn indicator (inactive or single product), holding {money(_num(first['matching_balance']))} in deposits.",
+        f"{both} of the {len(rows)} listed customers are both inactive and single-product - contact them within 24-48 hours.",
+    ]
+
+
+def _churn_by_geography_sql(p, table):
+    return f"""SELECT Geography, COUNT(*) AS customers, SUM(Exited) AS churned,
+        AVG(CAST(Exited AS FLOAT)) AS churn_rate,
+        SUM(CASE WHEN Exited = 1 THEN Balance ELSE 0 END) AS lost_balance,
+        AVG(CASE WHEN IsActiveMember = 0 THEN 1.0 ELSE 0.0 END) AS inactive_share
+    FROM {table}
+    WHERE 1 = 1{geography_filter(p)}
+    GROUP BY Geography
+    ORDER BY churn_rate DESC"""
+
+
+def _churn_by_geography_notes(rows, p):
+    if not rows:
+        return []
+    worst, best = rows[0], rows[-1]
+    return [
+        f"{worst['Geography']} has the highest churn rate ({_num(worst['churn_rate']):.1%}) and lost "
+        f"{money(_num(worst['lost_balance']))} in deposits - prioritize retention campaigns there.",
+        f"{best['Geography']} has the lowest churn rate ({_num(best['churn_rate']):.1%}).",
+    ]
+
+
+def _inactive_sql(p, table):
+    return f"""SELECT Geography, COUNT(*) AS inactive_customers, SUM(Balance) AS inactive_balance,
+        AVG(Balance) AS avg_balance, AVG(CAST(NumOfProducts AS FLOAT)) AS avg_products,
+        AVG(CAST(HasCrCard AS FLOAT)) AS credit_card_share
+    FROM {table}
+    WHERE Exited = 0 AND IsActiveMember = 0{geography_filter(p)}
+    GROUP BY Geography
+    ORDER BY inactive_balance DESC"""
+
+
+def _inactive_notes(rows, p):
+    if not rows:
+        return []
+    total = sum(_num(r["inactive_customers"]) for r in rows)
+    balance = sum(_num(r["inactive_balance"]) for r in rows)
+    return [f"{total:,.0f} active-account customers are inactive members, holding {money(balance)} - "
+            f"re-engagement candidates, largest pool in {rows[0]['Geography']}."]
+
+
+def _revenue_impact_sql(p, table):
+    return f"""SELECT TOP {p['top']} CustomerId, Surname, Geography, Balance, EstimatedSalary, NumOfProducts,
+        IsActiveMember, {RISK_INDICATORS} AS risk_indicators
+    FROM {table}
+    WHERE Exited = 0 AND {RISK_INDICATORS} > 0{geography_filter(p)}
+    ORDER BY risk_indicators DESC, Balance DESC"""
+
+
+def _revenue_impact_notes(rows, p):
+    margin = float(os.getenv("FAST_PATH_NET_INTEREST_MARGIN", "0.02"))
+    balance = sum(_num(r["Balance"]) for r in rows)
+    return [
+        f"Losing these {len(rows)} at-risk customers would remove {money(balance)} in deposits, about "
+        f"{money(balance * margin)} in annual net interest revenue at a {margin:.1%} margin.",
+    ]
+
+
+def _credit_distribution_sql(p, table):
+    return f"""SELECT Geography, credit_tier, COUNT(*) AS customers, AVG(CAST(CreditScore AS FLOAT)) AS avg_credit_score,
+        SUM(Balance) AS total_balance
+    FROM (SELECT c.*, {CREDIT_TIER} AS credit_tier FROM {table} c WHERE Exited = 0{geography_filter(p)}) s
+    GROUP BY Geography, credit_tier
+    ORDER BY Geography, avg_credit_score DESC"""
+
+
+def _credit_distribution_notes(rows, p):
+    subprime = {}
+    totals = {}
+    for r in rows:
+        totals[r["Geography"]] = totals.get(r["Geography"], 0) + _num(r["customers"])
+        if r["credit_tier"].strip() == "Subprime":
+            subprime[r["Geography"]] = _num(r["customers"])
+    shares = {g: subprime.get(g, 0) / totals[g] for g in totals if totals[g]}
+    if not shares:
+        return []
+    worst = max(shares, key=shares.get)
+    return [f"{worst} has the largest Subprime share ({shares[worst]:.1%} of active customers)."]
+
+
+def _credit_limit_sql(p, table):
+    return f"""SELECT TOP {p['top']} CustomerId, Surname, Geography, CreditScore, Balance, EstimatedSalary,
+        NumOfProducts, Tenure, COUNT(*) OVER () AS matching_customers
+    FROM {table}
+    WHERE Exited = 0 AND IsActiveMember = 1 AND CreditScore > 700 AND NumOfProducts >= 2{geography_filter(p)}
+    ORDER BY CreditScore DESC, Balance DESC"""
+
+
+def _credit_limit_notes(rows, p):
+    if not rows:
+        return []
+    return [f"{_num(rows[0]['matching_customers']):,.0f} active Prime customers with multiple products qualify "
+            f"(low risk: credit score >700 and 2+ products)."]
+
+
+def _product_usage_sql(p, table):
+    return f"""SELECT NumOfProducts, COUNT(*) AS customers, AVG(Balance) AS avg_balance,
+        AVG(EstimatedSalary) AS avg_salary, AVG(CAST(HasCrCard AS FLOAT)) AS credit_card_share,
+        AVG(CAST(IsActiveMember AS FLOAT)) AS active_share, AVG(CAST(Exited AS FLOAT)) AS churn_rate
+    FROM {table}
+    WHERE Balance > {p['amount']}{geography_filter(p)}
+    GROUP BY NumOfProducts
+    ORDER BY NumOfProducts"""
+
+
+def _product_usage_notes(rows, p):
+    total = sum(_num(r["customers"]) for r in rows)
+    single = sum(_num(r["customers"]) for r in rows if _num(r["NumOfProducts"]) == 1)
+    if not total:
+        return []
+    return [f"{single / total:.0%} of the {total:,.0f} customers above {money(p['amount'])} hold a single "
+            f"product - the main cross-selling opportunity."]
+
+
+def _single_product_sql(p, table):
+    return f"""SELECT TOP {p['top']} CustomerId, Surname, Geography, Balance, EstimatedSalary, CreditScore,
+        IsActiveMember, COUNT(*) OVER () AS matching_customers, SUM(Balance) OVER () AS matching_balance
+    FROM {table}
+    WHERE Exited = 0 AND NumOfProducts = 1 AND Balance > {p['amount']}{geography_filter(p)}
+    ORDER BY Balance DESC"""
+
+
+def _single_product_notes(rows, p):
+    if not rows:
+        return []
+    return [f"{_num(rows[0]['matching_customers']):,.0f} single-product customers above {money(p['amount'])} "
+            f"hold {money(_num(rows[0]['matching_balance']))} - cross-sell candidates."]
+
+
+def _wealth_distribution_sql(p, table):
+    return f"""SELECT Geography, wealth_tier, COUNT(*) AS customers, SUM(Balance) AS total_balance,
+        AVG(EstimatedSalary) AS avg_salary
+    FROM (SELECT c.*, {WEALTH_TIER} AS wealth_tier FROM {table} c WHERE Exited = 0{geography_filter(p)}) s
+    GROUP BY Geography, wealth_tier
+    ORDER BY Geography, total_balance DESC"""
+
+
+def _wealth_distribution_notes(rows, p):
+    by_geography = {}
+    for r in rows:
+        by_geography[r["Geography"]] = by_geography.get(r["Geography"], 0) + _num(r["total_balance"])
+    if not by_geography:
+        return []
+    top = max(by_geography, key=by_geography.get)
+    return [f"{top} holds the most deposits among active customers ({money(by_geography[top])})."]
+
+
+def _high_income_sql(p, table):
+    return f"""SELECT TOP {p['top']} CustomerId, Surname, Geography, EstimatedSalary, Balance, NumOfProducts,
+        CreditScore, COUNT(*) OVER () AS matching_customers
+    FROM {table}
+    WHERE Exited = 0 AND EstimatedSalary > {p['amount']} AND Balance < 50000{geography_filter(p)}
+    ORDER BY EstimatedSalary DESC"""
+
+
+def _high_income_notes(rows, p):
+    if not rows:
+        return []
+    return [f"{_num(rows[0]['matching_customers']):,.0f} active customers earn over {money(p['amount'])} but keep "
+            f"under $50K with us (Premium Potential) - deposit acquisition targets."]
+
+
+TEMPLATES = (
+    Template("high_value_churn_risk", (
+        r"{verb}{top_n}high[- ]value customers(?: ?\( ?{more_than} ?{amount} ?\))? (?:at|with) (?:an? )?"
+        r"(?:immediate |high )?risk of churn(?:ing)?{in_countries}",
+        r"{verb}{top_n}customers with (?:a )?balances? ?{more_than} ?{amount} "
+        r"(?:who (?:have|show) churn risk indicators|(?:at|with) (?:immediate |high )?risk of churn(?:ing)?){in_countries}",
+    ), "High-value customers at risk of churning",
+        _high_value_churn_sql, _high_value_churn_notes, {"amount": 100_000, "top": 20}),
+    Template("churn_by_geography", (
+        r"{verb}churn(?: patterns| rates?)? (?:by|across) (?:geography|countries|markets|regions)"
+        r"(?: and recommend (?:targeted |retention )?campaigns)?{in_countries}",
+    ), "Churn by geography", _churn_by_geography_sql, _churn_by_geography_notes),
+    Template("inactive_reengagement", (
+        r"{verb}inactive customers (?:(?:suitable|eligible) )?for re-?engagement(?: campaigns?)?{in_countries}",
+        r"{verb}inactive customers{in_countries} (?:who|that) (?:could|can|should) be re-?engaged",
+    ), "Inactive customers for re-engagement", _inactive_sql, _inactive_notes),
+    Template("revenue_impact_top_at_risk", (
+        r"{verb}(?:the )?revenue impact (?:of losing|if we lose|of) (?:our |the )?top {top} at[- ]risk customers"
+        r"{in_countries}",
+    ), "Revenue impact of losing the top at-risk customers",
+        _revenue_impact_sql, _revenue_impact_notes, {"top": 50}),
+    Template("credit_risk_distribution", (
+        r"{verb}(?:the )?credit (?:risk|score|tier) distribution{markets}",
+    ), "Credit tier distribution by geography", _credit_distribution_sql, _credit_distribution_notes),
+    Template("credit_limit_increase", (
+        r"{verb}{top_n}customers (?:suitable|eligible) for (?:a )?credit limit increases?{in_countries}",
+    ), "Candidates for credit limit increases", _credit_limit_sql, _credit_limit_notes, {"top": 20}),
+    Template("high_balance_product_usage", (
+        r"{verb}customers with (?:a )?balances? ?{more_than} ?{amount}{in_countries} and analy[sz]e their product usage",
+        r"{verb}customers with (?:a )?{more_than} ?{amount} balances?{in_countries} and analy[sz]e their product usage",
+        r"{verb}(?:the )?product usage of customers with (?:a )?balances? ?{more_than} ?{amount}{in_countries}",
+    ), "Product usage of high-balance customers",
+        _product_usage_sql, _product_usage_notes, {"amount": 150_000}),
+    Template("single_product_wealthy", (
+        r"{verb}{top_n}(?:wealthy|high[- ]balance|affluent) customers with (?:a )?single[- ]products?{in_countries}"
+        r"(?: ?[-:,]? cross[- ]selling opportunities| for cross[- ]selling)?",
+    ), "Wealthy single-product customers",
+        _single_product_sql, _single_product_notes, {"amount": 100_000, "top": 20}),
+    Template("wealth_distribution", (
+        r"{verb}(?:the )?wealth (?:tier )?distribution{markets}",
+    ), "Wealth tier distribution by geography", _wealth_distribution_sql, _wealth_distribution_notes),
+    Template("high_income_low_balance", (
+        r"{verb}{top_n}high[- ]income customers with low(?: current)? balances?{in_countries}"
+        r"(?: ?[-:,]? (?:deposit )?acquisition targets)?",
+    ), "High-income customers with low balances",
+        _high_income_sql, _high_income_notes, {"amount": 150_000, "top": 20}),
+)
+
+
+# -- Rendering ---------------------------------------------------------------
+
+_MONEY_COLUMNS = re.compile(r"balance|salary|revenue|deposits", re.I)
+_SHARE_COLUMNS = re.compile(r"rate|share", re.I)
+_HIDDEN_COLUMNS = {"matching_customers", "matching_balance"}
+
+
+def _num(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def format_value(column, value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return value.strip()
+    if _MONEY_COLUMNS.search(column):
+        return f"${value:,.0f}"
+    if _SHARE_COLUMNS.search(column):
+        return f"{value:.1%}"
+    if column == "CustomerId":
+        return f"{value:.0f}"
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.1f}"
+
+
+def render(template, params, rows):
+    """Markdown answer: title, result table and observations"""
+    lines = [f"**{template.title}**", ""]
+    columns = [c for c in (rows[0] if rows else {}) if c not in _HIDDEN_COLUMNS]
+    if rows:
+        lines.append("| " + " | ".join(columns) + " |")
+        lines.append("|" + "---|" * len(columns))
+        for row in rows:
+            lines.append("| " + " | ".join(format_value(c, row[c]) for c in columns) + " |")
+    else:
+        lines.append("No matching customers.")
+    notes = template.notes(rows, params)
+    if notes:
+        lines += ["", "**Key observations:**"] + [f"- {note}" for note in notes]
+    return "\n".join(lines)
+
+
+class FastPath:
+    """Template matcher in front of the agents"""
+
+    def __init__(self, pool, table, enabled=None, templates=TEMPLATES):
+        self.pool = pool
+        self.table = table
+        if enabled is None:
+            enabled = os.getenv("FAST_PATH_ENABLED", "true").lower() in ("true", "1", "yes")
+        self.enabled = enabled
+        self.templates = templates
+        self.hits = 0
+        self.fallbacks = 0
+
+    def match(self, prompt):
+        """(template, params) for the template the whole prompt is a phrasing of, or None"""
+        if not self.enabled or not prompt:
+            return None
+        for template in self.templates:
+            params = template.params(prompt)
+            if params is not None:
+                return template, params
+        return None
+
+    def answer(self, prompt):
+        """Response dict for a matching prompt, or None to let the agent answer"""
+        matched = self.match(prompt)
+        if matched is None:
+            return None
+        template, params = matched
+        started = time.perf_counter()
+        try:
+            rows = result_rows(call_tool(self.pool, QUERY_TOOL, {"sql": template.sql(params, self.table)}))
+            text = render(template, params, rows)
+        except Exception as e:
+            logger.warning("Fast path %s failed, using the agent: %s", template.name, e)
+            self.fallbacks += 1
+            return None
+        self.hits += 1
+        elapsed = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("Fast path %s answered in %.0f ms", template.name, elapsed)
+        return {
+            "response": {"role": "assistant", "content": [{"text": text}]},
+            "usage": {key: 0 for key in USAGE_KEYS},
+            "timings": {"total_ms": elapsed, "fast_path_ms": elapsed},
+            "fast_path": template.name,
+        }
@@ -0,0 +1,115 @@
+"""
+Conversation History
+Token-budgeted history for long-lived conversations: the interactive REPL and
+multi-turn runtime sessions (see session_store.py).
+
+After every invocation the conversation is kept near HISTORY_TOKEN_BUDGET:
+- Tool results older than the last HISTORY_KEEP_TURNS turns are compacted to a
+  short stub (status, row count, result_id for fetch_full_result, and the start
+  of the text) - the model's written answers keep what was learned from them.
+- If the history is still over budget, whole turns are dropped oldest first,
+  so tool calls and their results always stay paired.
+
+Token counts are estimated from message size (about 4 characters per token).
+
+Configuration via environment variables:
+- HISTORY_TOKEN_BUDGET: Target history size in tokens (default 40000)
+- HISTORY_KEEP_TURNS: Most recent turns always kept verbatim (default 3)
+- HISTORY_TOOL_RESULT_CHARS: Text kept from a compacted tool result (default 300)
+"""
+
+import json
+import logging
+import os
+
+from strands.agent.conversation_manager import SlidingWindowConversationManager
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+# Prefix marking a tool result that has already been compacted
+COMPACTED = "[Earlier result, compacted]"
+
+# Keys of a JSON tool result that survive compaction
+_SUMMARY_KEYS = ("status", "sql", "row_count", "truncated", "result_id")
+
+
+def estimate_tokens(messages):
+    """Rough token count of a message list"""
+    return len(json.dumps(messages, default=str)) // CHARS_PER_TOKEN
+
+
+class TokenBudgetConversationManager(SlidingWindowConversationManager):
+    """Keeps recent turns verbatim, compacts old tool output and drops the oldest turns"""
+
+    def __init__(self, token_budget=None, keep_turns=None, tool_result_chars=None):
+        super().__init__()
+        self.token_budget = token_budget or int(os.getenv("HISTORY_TOKEN_BUDGET", "40000"))
+        self.keep_turns = keep_turns or int(os.getenv("HISTORY_KEEP_TURNS", "3"))
+        self.tool_result_chars = tool_result_chars or int(os.getenv("HISTORY_TOOL_RESULT_CHARS", "300"))
+        self.context_tokens = 0
+
+    def apply_management(self, agent, **kwargs):
+        messages = agent.messages
+        turns = turn_starts(messages)
+        if len(turns) > self.keep_turns:
+            self.compact_tool_results(messages, turns[-self.keep_turns])
+        self.context_tokens = estimate_tokens(messages)
+        while self.context_tokens > self.token_budget and self.drop_oldest_turn(messages):
+            self.context_tokens = estimate_tokens(messages)
+        logger.debug("History: %d messages, ~%d tokens", len(messages), self.context_tokens)
+
+    def reduce_context(self, agent, e=None, **kwargs):
+        """Context window overflow: compact all but the latest message, then drop a turn"""
+        messages = agent.messages
+        if self.compact_tool_results(messages, len(messages) - 1) or self.drop_oldest_turn(messages):
+            self.context_tokens = estimate_tokens(messages)
+            return
+        super().reduce_context(agent, e, **kwargs)
+
+    def compact_tool_results(self, messages, end):
+        """Replace tool results in messages[:end] with short stubs; True if any changed"""
+        changed = False
+        for message in messages[:end]:
+            for content in message.get("content", []):
+                tool_result = content.get("toolResult")
+                if tool_result and not is_compacted(tool_result):
+                    tool_result["content"] = [{"text": self.compact_text(tool_result)}]
+                    changed = True
+        return changed
+
+    def compact_text(self, tool_result):
+        text = "\n".join(c["text"] for c in tool_result.get("content", []) if "text" in c)
+        try:
+            body = json.loads(text)
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            summary = {key: body[key] for key in _SUMMARY_KEYS if key in body}
+            if summary:
+                return f"{COMPACTED} {json.dumps(summary, default=str)}"
+        suffix = "..." if len(text) > self.tool_result_chars else ""
+        return f"{COMPACTED} {text[:self.tool_result_chars]}{suffix}"
+
+    def drop_oldest_turn(self, messages):
+        """Remove the oldest turn if more than keep_turns remain; True if removed"""
+        turns = turn_starts(messages)
+        if len(turns) <= self.keep_turns:
+            return False
+        del messages[:turns[1]]
+        self.removed_message_count += turns[1]
+        return True
+
+
+def turn_starts(messages):
+    """Indices of user messages that start a turn (prompts, not tool results)"""
+    return [
+        index for index, message in enumerate(messages)
+        if message["role"] == "user" and not any("toolResult" in c for c in message["content"])
+    ]
+
+
+def is_compacted(tool_result):
+    content = tool_result.get("content", [])
+    return len(content) == 1 and content[0].get("text", "").startswith(COMPACTED)
@@ -0,0 +1,297 @@
+"""
+KPI Snapshot
+Precomputed portfolio KPIs and segment breakdowns, refreshed on a schedule.
+
+Headline numbers (customers, deposits, churn rate, average credit score) and the
+standard breakdowns by Geography, credit tier and wealth tier are computed in
+one set-based query against the customer table, stored in a local JSON file with
+their timestamp, and served from memory:
+- as a "Portfolio KPIs" section of every agent's system prompt
+- through the local portfolio_kpis tool, so headline questions skip Teradata
+- to agentcore_demo.py, which prints the latest snapshot
+
+Run `python kpi_snapshot.py` (e.g. from cron) to refresh the file out of process.
+
+Configuration via environment variables:
+- KPI_TABLE: Customer table (default Churn_Modelling in the TERADATA_DATABASE_URI database)
+- KPI_SNAPSHOT_INTERVAL: Seconds between refreshes (default 900)
+- KPI_SNAPSHOT_PATH: JSON file holding the latest snapshot (default kpi_snapshot.json)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from strands import tool
+
+from schema_catalog import database_from_uri
+from teradata_tools import QUERY_TOOL, call_tool, result_rows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLE = "Churn_Modelling"
+DEFAULT_PATH = "kpi_snapshot.json"
+
+# Segment expressions; same tier rules as scoring.py (from the credit risk and wealth prompts)
+SEGMENTS = {
+    "geography": "Geography",
+    "credit_tier": """CASE
+        WHEN CreditScore > 700 THEN 'Prime'
+        WHEN CreditScore >= 600 THEN 'Near-Prime'
+        ELSE 'Subprime' END""",
+    "wealth_tier": """CASE
+        WHEN Balance > 500000 AND EstimatedSalary > 200000 THEN 'Ultra High Net Worth'
+        WHEN Balance > 250000 AND EstimatedSalary > 150000 THEN 'High Net Worth'
+        WHEN Balance > 100000 AND EstimatedSalary > 100000 THEN 'Mass Affluent'
+        WHEN Balance BETWEEN 50000 AND 100000 AND EstimatedSalary > 80000 THEN 'Emerging Affluent'
+        WHEN Balance < 50000 AND EstimatedSalary > 150000 THEN 'Premium Potential'
+        ELSE 'Mass Market' END""",
+}
+
+METRICS = """COUNT(*) AS customers,
+        SUM(Balance) AS total_balance,
+        AVG(Balance) AS avg_balance,
+        SUM(Exited) AS churned,
+        AVG(CAST(Exited AS FLOAT)) AS churn_rate,
+        AVG(CAST(CreditScore AS FLOAT)) AS avg_credit_score,
+        AVG(EstimatedSalary) AS avg_salary,
+        AVG(CAST(NumOfProducts AS FLOAT)) AS avg_products,
+        AVG(CAST(IsActiveMember AS FLOAT)) AS active_rate"""
+
+
+def snapshot_sql(table):
+    """One UNION ALL query returning the portfolio total and every segment breakdown"""
+    parts = [
+        f"SELECT CAST('portfolio' AS VARCHAR(20)) AS dimension_name, "
+        f"CAST('All customers' AS VARCHAR(40)) AS segment_name,\n        {METRICS}\nFROM {table}"
+    ]
+    for dimension, expression in SEGMENTS.items():
+        parts.append(
+            f"SELECT CAST('{dimension}' AS VARCHAR(20)), CAST(segment_name AS VARCHAR(40)),\n        {METRICS}\n"
+            f"FROM (SELECT c.*, {expression} AS segment_name FROM {table} c) s\nGROUP BY 1, 2"
+        )
+    return "\nUNION ALL\n".join(parts)
+
+
+def load_snapshot(path=None):
+    """Latest snapshot saved to disk, or None"""
+    path = path or os.getenv("KPI_SNAPSHOT_PATH", DEFAULT_PATH)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class KPISnapshot:
+    """Scheduled, file-backed snapshot of portfolio KPIs"""
+
+    def __init__(self, pool, table=None, database_uri=None, interval=None, path=None):
+        self.pool = pool
+        if table is None:
+            table = os.getenv("KPI_TABLE")
+        if table is None:
+            database = database_from_uri(database_uri)
+            table = f"{database}.{DEFAULT_TABLE}" if database else DEFAULT_TABLE
+        self.table = table
+        self.interval = interval or float(os.getenv("KPI_SNAPSHOT_INTERVAL", "900"))
+        self.path = path or os.getenv("KPI_SNAPSHOT_PATH", DEFAULT_PATH)
+
+        self._snapshot = load_snapshot(self.path)
+        if self._snapshot and self._snapshot.get("table") != self.table:
+            self._snapshot = None
+        self._lock = threading.Lock()
+        self._fill_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._refreshing = False
+
+    def refresh(self):
+        """Recompute every KPI from Teradata and save the snapshot"""
+        started = time.monotonic()
+        rows = result_rows(call_tool(self.pool, QUERY_TOOL, {"sql": snapshot_sql(self.table)}))
+        snapshot = {
+            "computed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "table": self.table,
+            "portfolio": {},
+            "segments": {dimension: [] for dimension in SEGMENTS},
+        }
+        for row in rows:
+            row = {key.lower(): value for key, value in row.items()}
+            dimension = row.pop("dimension_name").strip()
+            segment = row.pop("segment_name").strip()
+            metrics = {key: _number(value) for key, value in row.items()}
+            if dimension == "portfolio":
+                snapshot["portfolio"] = metrics
+            else:
+                snapshot["segments"][dimension].append({"segment": segment, **metrics})
+        for breakdown in snapshot["segments"].values():
+            breakdown.sort(key=lambda item: -item["customers"])
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._refreshing = False
+        try:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Could not save KPI snapshot to %s: %s", self.path, e)
+        logger.info("KPI snapshot refreshed in %.2fs", time.monotonic() - started)
+        return snapshot
+
+    def snapshot(self, wait=True):
+        """Latest snapshot. Computed synchronously if none exists yet (with wait=False,
+        None is returned while it is computed in the background); without the
+        scheduler running, a stale snapshot is served while a background refresh runs."""
+        if self._snapshot is None and not wait:
+            self._refresh_in_background()
+        elif self._snapshot is None:
+            with self._fill_lock:
+                if self._snapshot is None:
+                    self.refresh()
+        elif self._thread is None and self.age() >= self.interval:
+            self._refresh_in_background()
+        return self._snapshot
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("KPI snapshot refresh failed: %s", e)
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def age(self):
+        """Seconds since the current snapshot was computed (None if there is none)"""
+        if not self._snapshot:
+            return None
+        computed_at = datetime.fromisoformat(self._snapshot["computed_at"])
+        return (datetime.now(timezone.utc) - computed_at).total_seconds()
+
+    # -- Schedule ----------------------------------------------------------
+
+    def start(self):
+        """Refresh in a background thread every `interval` seconds"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="kpi-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self):
+        age = self.age()
+        wait = 0 if age is None else max(0, self.interval - age)
+        while not self._stop.wait(wait):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("KPI snapshot refresh failed: %s", e)
+            wait = self.interval
+
+    # -- Consumers ---------------------------------------------------------
+
+    def prompt_section(self):
+        """System prompt block with the headline KPIs and segment breakdowns"""
+        try:
+            # Agent creation never waits for the KPI query; the section appears once a snapshot exists
+            snapshot = self.snapshot(wait=False)
+        except Exception as e:
+            logger.warning("KPI snapshot unavailable for prompt: %s", e)
+            return ""
+        if not snapshot or not snapshot.get("portfolio"):
+            return ""
+        lines = [f"**Portfolio KPIs (snapshot of {snapshot['table']} as of {snapshot['computed_at']}):**"]
+        lines += [f"- {line}" for line in portfolio_lines(snapshot["portfolio"])]
+        for dimension, breakdown in snapshot["segments"].items():
+            lines.append(f"By {dimension.replace('_', ' ')}:")
+            lines += [f"- {segment_line(item)}" for item in breakdown]
+        lines.append("Use these figures directly; call portfolio_kpis for the full metrics of a segment.")
+        return "\n".join(lines)
+
+    def as_tool(self):
+        """A local tool serving KPIs from the snapshot without touching Teradata"""
+        kpis = self
+
+        @tool
+        def portfolio_kpis(breakdown: str = "") -> str:
+            """Precomputed portfolio KPIs: customers, deposits, churn, credit score, salary, products.
+
+            Args:
+                breakdown: Optional segment breakdown: "geography", "credit_tier" or "wealth_tier".
+                    Leave empty for portfolio totals.
+            """
+            snapshot = kpis.snapshot()
+            if not breakdown:
+                data = snapshot["portfolio"]
+            elif breakdown in snapshot["segments"]:
+                data = snapshot["segments"][breakdown]
+            else:
+                return f"Unknown breakdown '{breakdown}'. Use one of: {', '.join(snapshot['segments'])}."
+            return json.dumps({"as_of": snapshot["computed_at"], "table": snapshot["table"], breakdown or "portfolio": data})
+
+        return portfolio_kpis
+
+
+def portfolio_lines(portfolio):
+    """Headline KPI lines (shared by the prompt section and the demo)"""
+    return [
+        f"{portfolio['customers']:,.0f} customers",
+        f"{money(portfolio['total_balance'])} total deposits ({money(portfolio['avg_balance'])} average balance)",
+        f"{portfolio['churn_rate']:.2%} churn rate ({portfolio['churned']:,.0f} customers churned)",
+        f"{portfolio['avg_credit_score']:.0f} average credit score",
+        f"{portfolio['active_rate']:.1%} active members, {portfolio['avg_products']:.2f} products per customer",
+    ]
+
+
+def segment_line(item):
+    return (
+        f"{item['segment']}: {item['customers']:,.0f} customers, {money(item['total_balance'])} deposits, "
+        f"{item['churn_rate']:.2%} churn, {item['avg_credit_score']:.0f} avg credit score"
+    )
+
+
+def money(value):
+    for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= threshold:
+            return f"${value / threshold:,.1f}{suffix}"
+    return f"${value:,.0f}"
+
+
+def _number(value):
+    if value is None:
+        return 0
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    from banking_runtime import kpi_snapshot, mcp_pool
+
+    mcp_pool.start()
+    try:
+        snapshot = kpi_snapshot.refresh()
+        print("\n".join(portfolio_lines(snapshot["portfolio"])))
+    finally:
+        mcp_pool.close()
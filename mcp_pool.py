@@ -0,0 +1,418 @@
+"""
+Teradata MCP Session Pool
+Keeps a small set of long-lived, pre-initialized Teradata MCP server sessions.
+
+Starting a session means resolving the MCP server, starting a Python interpreter
+and logging in to Teradata, so agents lease already-running sessions instead.
+
+Tool calls (call_tool_async / call_tool_sync) run under a deadline: at most
+MCP_CALL_TIMEOUT_SECONDS, cut to what is left of the request's budget (see
+request_limits.py) minus MCP_DEADLINE_RESERVE_SECONDS for the model to answer.
+A call that times out, is cancelled or loses its session leaves that server
+process wedged on its query, so the session is restarted rather than reused;
+stopping the process drops its Teradata connection, which aborts the running
+request on the warehouse side. Timeouts and channel or connection errors (not
+cancellations, which only mean the caller went away) feed a circuit breaker
+(see circuit_breaker.py) that fails calls fast while the cluster is unhealthy.
+
+Configuration via environment variables:
+- MCP_POOL_SIZE: Number of sessions to keep warm; also the number of tool calls
+  that can run in parallel (default 3)
+- MCP_SESSION_MAX_CALLS: Recycle a session after this many leases (default 200)
+- MCP_SESSION_MAX_AGE: Recycle a session after this many seconds (default 1800)
+- MCP_HEALTH_CHECK_INTERVAL: Seconds between background health checks (default 60)
+- MCP_STARTUP_TIMEOUT: Seconds to wait for a session to initialize (default 30)
+- MCP_CALL_TIMEOUT_SECONDS: Longest a single tool call may run (default 120)
+- MCP_DEADLINE_RESERVE_SECONDS: Request budget kept back from each call for the model (default 10)
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+from strands.tools.mcp import MCPClient
+from mcp import stdio_client
+
+from circuit_breaker import CircuitBreaker, CircuitOpen
+from request_limits import remaining
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Error text of a Teradata connection that is down or refusing work (as opposed to a bad query)
+_UNAVAILABLE = re.compile(
+    r"socket|connection (?:refused|reset|closed|lost|aborted)|network|logons are (?:disabled|only enabled)"
+    r"|not (?:currently )?available|database is (?:restarting|down)",
+    re.I,
+)
+
+
+def error_result(tool_use_id, text):
+    return {"toolUseId": tool_use_id, "status": "error", "content": [{"text": text}]}
+
+
+def failure_text(result):
+    """Why a ToolResult shows the channel or the cluster failing, or None"""
+    text = "\n".join(c.get("text", "") for c in result.get("content", []))
+    if result.get("status") == "error" and text.startswith("Tool execution failed"):
+        return text  # the MCP client raised: timeout, closed pipe, dead server process
+    if (result.get("status") == "error" or '"status": "error"' in text) and _UNAVAILABLE.search(text):
+        return text
+    return None
+
+
+class PooledSession:
+    """A started MCPClient plus the bookkeeping used to decide when to recycle it"""
+
+    def __init__(self, client):
+        self.client = client
+        self.created_at = time.monotonic()
+        self.calls = 0
+        self.healthy = True
+
+    def expired(self, max_calls, max_age):
+        if self.calls >= max_calls:
+            return True
+        return time.monotonic() - self.created_at >= max_age
+
+
+class MCPSessionPool:
+    """Thread-safe pool of warm Teradata MCP sessions"""
+
+    def __init__(self, server_params, size=None, max_calls=None, max_age=None,
+                 health_check_interval=None, startup_timeout=None, call_timeout=None,
+                 deadline_reserve=None, breaker=None):
+        self.server_params = server_params
+        self.size = size or int(os.getenv("MCP_POOL_SIZE", "3"))
+        self.max_calls = max_calls or int(os.getenv("MCP_SESSION_MAX_CALLS", "200"))
+        self.max_age = max_age or float(os.getenv("MCP_SESSION_MAX_AGE", "1800"))
+        self.health_check_interval = health_check_interval or float(
+            os.getenv("MCP_HEALTH_CHECK_INTERVAL", "60")
+        )
+        self.startup_timeout = startup_timeout or int(os.getenv("MCP_STARTUP_TIMEOUT", "30"))
+        self.call_timeout = call_timeout or float(os.getenv("MCP_CALL_TIMEOUT_SECONDS", "120"))
+        self.deadline_reserve = deadline_reserve if deadline_reserve is not None else float(
+            os.getenv("MCP_DEADLINE_RESERVE_SECONDS", "10")
+        )
+        self.breaker = breaker or CircuitBreaker()
+
+        self._idle = deque()
+        self._open = 0  # Sessions that exist (idle + leased + starting)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._started = False
+        self._maintenance_thread = None
+
+    # -- Session lifecycle -------------------------------------------------
+
+    def _new_session(self):
+        """Start a new MCP server process and initialize its session"""
+        started = time.monotonic()
+        client = MCPClient(lambda: stdio_client(self.server_params),
+                           startup_timeout=self.startup_timeout)
+        with span("mcp.session_start"):
+            client.start()
+        logger.info("MCP session started in %.2fs", time.monotonic() - started)
+        return PooledSession(client)
+
+    def _stop_session(self, session):
+        try:
+            session.client.stop(None, None, None)
+        except Exception as e:
+            logger.warning("Error stopping MCP session: %s", e)
+
+    def _discard(self, session):
+        """Drop a session from the pool and stop it off the caller's thread"""
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+        threading.Thread(target=self._stop_session, args=(session,), daemon=True).start()
+
+    def _check(self, session):
+        """Health check: a list_tools round-trip proves the server process is responsive"""
+        try:
+            session.client.list_tools_sync()
+            session.healthy = True
+        except Exception as e:
+            logger.warning("MCP session failed health check: %s", e)
+            session.healthy = False
+        return session.healthy
+
+    def _fill(self):
+        """Start sessions until the pool holds `size` of them"""
+        while True:
+            with self._cond:
+                if self._closed or self._open >= self.size:
+                    return
+                self._open += 1
+            try:
+                session = self._new_session()
+            except Exception as e:
+                logger.error("Failed to start MCP session: %s", e)
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                return
+            with self._cond:
+                if not self._closed:
+                    self._idle.append(session)
+                    self._cond.notify()
+                    continue
+            # Pool was closed while this session was starting
+            self._discard(session)
+            return
+
+    # -- Public API --------------------------------------------------------
+
+    def start(self):
+        """Warm the pool and start background maintenance (returns immediately)"""
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.size):
+            threading.Thread(target=self._fill, daemon=True).start()
+        self._maintenance_thread = threading.Thread(target=self._maintain, daemon=True)
+        self._maintenance_thread.start()
+
+    def warm_up(self, timeout=None):
+        """Start the pool and block until every session is ready (or timeout)"""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while len(self._idle) < self.size and not self._closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return len(self._idle)
+
+    def acquire(self, timeout=None):
+        """Take a session out of the pool, starting one if there is capacity"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("MCP session pool is closed")
+                session = None
+                create = False
+                if self._idle:
+                    session = self._idle.pop()
+                elif self._open < self.size:
+                    self._open += 1
+                    create = True
+                else:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Timed out waiting for an MCP session")
+                    self._cond.wait(remaining)
+                    continue
+
+            if create:
+                try:
+                    return self._new_session()
+                except Exception:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+
+            if session.expired(self.max_calls, self.max_age) or not session.healthy:
+                self._discard(session)
+                continue
+            return session
+
+    async def acquire_async(self, timeout=None):
+        """acquire() without blocking the event loop.
+
+        The waiting thread cannot be cancelled, so a session it gets after the
+        caller was cancelled (request deadline, client disconnect) goes straight
+        back to the pool instead of leaking.
+        """
+        future = asyncio.ensure_future(asyncio.to_thread(self.acquire, timeout))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(self._release_abandoned)
+            raise
+
+    def _release_abandoned(self, future):
+        if not future.cancelled() and future.exception() is None:
+            self.release(future.result())
+
+    def release(self, session):
+        """Return a leased session, recycling it if it is worn out or broken"""
+        session.calls += 1
+        if self._closed or not session.healthy or session.expired(self.max_calls, self.max_age):
+            self._discard(session)
+            if not self._closed:
+                threading.Thread(target=self._fill, daemon=True).start()
+            return
+        with self._cond:
+            self._idle.append(session)
+            self._cond.notify()
+
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        """Lease a started MCPClient for the duration of a `with` block"""
+        with span("mcp.acquire"):
+            session = self.acquire(timeout)
+        try:
+            yield session.client
+        except Exception:
+            # The failure may have come from the session itself; verify before reuse
+            self._check(session)
+            raise
+        finally:
+            self.release(session)
+
+    @contextlib.asynccontextmanager
+    async def lease_async(self, timeout=None):
+        """Async variant of lease(); waits for a session without blocking the event loop"""
+        with span("mcp.acquire"):
+            session = await self.acquire_async(timeout)
+        try:
+            yield session.client
+        except Exception:
+            await asyncio.to_thread(self._check, session)
+            raise
+        finally:
+            self.release(session)
+
+    # -- Deadline-bounded tool calls ---------------------------------------
+
+    def timeout_for_call(self, limit=None):
+        """Seconds the next call may take; raises TimeoutError when the request has no time left"""
+        timeout = min(limit or self.call_timeout, self.call_timeout)
+        left = remaining()
+        if left is not None:
+            timeout = min(timeout, left - self.deadline_reserve)
+        if timeout <= 0:
+            raise TimeoutError("No time left in the request budget for another Teradata call; "
+                               "answer from the data already retrieved")
+        return timeout
+
+    async def call_tool_async(self, tool_use_id, name, arguments, timeout=None):
+        """Call a tool on a leased session under the call deadline; always returns a ToolResult"""
+        try:
+            timeout = self.timeout_for_call(timeout)
+            self.breaker.check()
+            deadline = time.monotonic() + timeout
+            with span("mcp.acquire"):
+                session = await self.acquire_async(timeout)
+        except (TimeoutError, CircuitOpen) as e:
+            return error_result(tool_use_id, str(e))
+        try:
+            result = await session.client.call_tool_async(
+                tool_use_id=tool_use_id, name=name, arguments=arguments,
+                read_timeout_seconds=timedelta(seconds=max(deadline - time.monotonic(), 0.1)),
+            )
+        except BaseException:
+            # Cancelled with the request: the server is still busy with the query
+            self._settle(session, None, timeout)
+            raise
+        return self._settle(session, result, timeout)
+
+    def call_tool_sync(self, tool_use_id, name, arguments, timeout=None):
+        """Blocking variant of call_tool_async(), for code running outside the event loop"""
+        try:
+            timeout = self.timeout_for_call(timeout)
+            self.breaker.check()
+            deadline = time.monotonic() + timeout
+            with span("mcp.acquire"):
+                session = self.acquire(timeout)
+        except (TimeoutError, CircuitOpen) as e:
+            return error_result(tool_use_id, str(e))
+        try:
+            result = session.client.call_tool_sync(
+                tool_use_id=tool_use_id, name=name, arguments=arguments,
+                read_timeout_seconds=timedelta(seconds=max(deadline - time.monotonic(), 0.1)),
+            )
+        except BaseException:
+            self._settle(session, None, timeout)
+            raise
+        return self._settle(session, result, timeout)
+
+    def _settle(self, session, result, timeout):
+        """Record a call's outcome: release the session (restarting it if wedged) and update the breaker.
+        `result` is None when the caller was cancelled."""
+        if result is None:
+            # The request's deadline or client went away, which says nothing about the cluster;
+            # the server process is still busy with the query, though
+            logger.info("Teradata MCP call cancelled, restarting its session")
+            session.healthy = False
+            self.release(session)
+            return None
+        failure = failure_text(result)
+        if failure is None:
+            self.breaker.success()
+            self.release(session)
+            return result
+        logger.warning("Teradata MCP call failed, restarting its session: %s", failure[:300])
+        session.healthy = False
+        self.breaker.failure()
+        self.release(session)
+        if "Timed out" in failure:
+            return error_result(
+                result["toolUseId"],
+                f"Teradata call timed out after {timeout:.0f}s and was cancelled. "
+                "Narrow the query (filters, aggregation, TOP n) or answer from the data already retrieved.",
+            )
+        return result
+
+    def health_check(self):
+        """Check idle sessions, replacing any that fail. Returns the healthy count."""
+        with self._cond:
+            sessions = list(self._idle)
+            self._idle.clear()
+        healthy = 0
+        for session in sessions:
+            if session.expired(self.max_calls, self.max_age) or not self._check(session):
+                self._discard(session)
+                continue
+            healthy += 1
+            with self._cond:
+                self._idle.append(session)
+                self._cond.notify()
+        self._fill()
+        return healthy
+
+    def stats(self):
+        with self._cond:
+            return {"size": self.size, "open": self._open, "idle": len(self._idle), "breaker": self.breaker.state}
+
+    def close(self):
+        """Stop every idle session; leased sessions are stopped when released"""
+        with self._cond:
+            self._closed = True
+            sessions = list(self._idle)
+            self._idle.clear()
+            self._open -= len(sessions)
+            self._cond.notify_all()
+        for session in sessions:
+            self._stop_session(session)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app):
+        """Starlette lifespan hook: warm the pool when BedrockAgentCoreApp starts"""
+        self.start()
+        try:
+            yield
+        finally:
+            self.close()
+
+    def _maintain(self):
+        while True:
+            time.sleep(self.health_check_interval)
+            if self._closed:
+                return
+            try:
+                self.health_check()
+            except Exception as e:
+                logger.error("MCP pool health check failed: %s", e)
@@ -0,0 +1,207 @@
+"""
+Model Routing
+Per-step model selection: a small, fast Bedrock model for the mechanical steps
+of an agent run and the large model for the analysis the user reads.
+
+Roles:
+- analysis: first turn, every turn after data results, the final answer (default model)
+- sql: turns that write or fix a query - after schema discovery tools
+  (databases, tables, columns, describe_schema) or after a failed query
+- summary: per-customer batch items, answered from a prefetched profile (see batch.py)
+- intent: picking a persona for prompts without routing keywords (see personas.py)
+
+CLAUDE_MODEL_ID is either one model ID (every role uses it, as before) or a
+comma-separated role mapping; roles left out use the analysis model:
+
+    CLAUDE_MODEL_ID=analysis=anthropic.claude-3-5-sonnet-20240620-v1:0,sql=anthropic.claude-3-5-haiku-20241022-v1:0,intent=anthropic.claude-3-5-haiku-20241022-v1:0
+
+A turn routed to a smaller model that ends without a tool call is an attempt at
+the final answer; it is discarded and the turn re-run on the analysis model
+(MODEL_ROUTING_ESCALATE=false keeps the small model's answer instead). The
+discarded attempt's tokens and latency are added to the re-run's usage, so
+metrics and benchmarks count the extra call. Prompt
+caching is decided per model (see prompt_cache.py): cache checkpoints in the
+system prompt are dropped for models that do not support them.
+
+Configuration via environment variables:
+- CLAUDE_MODEL_ID: Model ID or role=model mapping (default Claude 3.5 Sonnet for every role)
+- MODEL_ROUTING_ESCALATE: "true" (default) or "false"
+"""
+
+import logging
+import os
+from collections import Counter
+
+from strands.models.model import Model
+
+from prompt_cache import prompt_caching_enabled
+from teradata_tools import COLUMN_DESCRIPTION_TOOL, DATABASE_LIST_TOOL, QUERY_TOOL
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_ID = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+
+ROLES = ("analysis", "sql", "summary", "intent")
+
+# Tools whose results lead to writing a query rather than to the analysis
+DISCOVERY_TOOLS = {DATABASE_LIST_TOOL, COLUMN_DESCRIPTION_TOOL, "base_tableList", "describe_schema"}
+
+
+def model_roles(setting=None):
+    """{role: model ID} from CLAUDE_MODEL_ID"""
+    setting = (setting if setting is not None else os.getenv("CLAUDE_MODEL_ID", "")).strip()
+    if "=" not in setting:
+        model_id = setting or DEFAULT_MODEL_ID
+        return {role: model_id for role in ROLES}
+    roles = {}
+    for pair in filter(None, (p.strip() for p in setting.split(","))):
+        role, _, model_id = pair.partition("=")
+        role = role.strip().lower()
+        if role not in ROLES:
+            raise ValueError(f"Unknown model role '{role}' in CLAUDE_MODEL_ID. Roles: {', '.join(ROLES)}")
+        roles[role] = model_id.strip()
+    roles.setdefault("analysis", DEFAULT_MODEL_ID)
+    return {role: roles.get(role, roles["analysis"]) for role in ROLES}
+
+
+def turn_role(messages):
+    """Role of the model turn that follows `messages`"""
+    if not messages:
+        return "analysis"
+    results = [c["toolResult"] for c in messages[-1].get("content", []) if "toolResult" in c]
+    if not results or len(messages) < 2:
+        return "analysis"
+    names = {
+        c["toolUse"]["toolUseId"]: c["toolUse"]["name"]
+        for c in messages[-2].get("content", []) if "toolUse" in c
+    }
+    if any(names.get(r["toolUseId"]) == QUERY_TOOL and failed(r) for r in results):
+        return "sql"
+    if all(names.get(r["toolUseId"]) in DISCOVERY_TOOLS for r in results):
+        return "sql"
+    return "analysis"
+
+
+def failed(tool_result):
+    if tool_result.get("status") == "error":
+        return True
+    text = "".join(c.get("text", "") for c in tool_result.get("content", []))
+    return '"status": "error"' in text or '"status":"error"' in text
+
+
+def strip_cache_points(blocks):
+    return [block for block in blocks if "cachePoint" not in block]
+
+
+def calls_tools(events):
+    return any(e.get("messageStop", {}).get("stopReason") == "tool_use" for e in events)
+
+
+def merged_metadata(metadata, others):
+    """Metadata of a model call with the token usage and latency of `others` added"""
+    merged = dict(metadata)
+    for part in ("usage", "metrics"):
+        totals = dict(metadata.get(part, {}))
+        for other in others:
+            for key, value in other.get(part, {}).items():
+                if isinstance(value, (int, float)):
+                    totals[key] = totals.get(key, 0) + value
+        merged[part] = totals
+    return merged
+
+
+class TieredModel(Model):
+    """Strands model that sends each turn to the model of its role"""
+
+    def __init__(self, models, caching=None, role=None, escalate=None):
+        self.models = models
+        self.caching = caching or {}
+        self.role = role
+        if escalate is None:
+            escalate = os.getenv("MODEL_ROUTING_ESCALATE", "true").lower() in ("true", "1", "yes")
+        self.escalate = escalate
+        self.turns = Counter()
+
+    def for_role(self, role):
+        """Same models, with every turn sent to `role`"""
+        return TieredModel(self.models, self.caching, role=role, escalate=False)
+
+    @property
+    def config(self):
+        return self.models[self.role or "analysis"].config
+
+    def update_config(self, **model_config):
+        for model in {id(m): m for m in self.models.values()}.values():
+            model.update_config(**model_config)
+
+    def get_config(self):
+        return self.models[self.role or "analysis"].get_config()
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        async for event in self.models[self.role or "analysis"].structured_output(
+            output_model, prompt, system_prompt=system_prompt, **kwargs
+        ):
+            yield event
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        role = self.role or turn_role(messages)
+        if self.models[role] is self.models["analysis"] or not self.escalate:
+            self.turns[role] += 1
+            async for event in self._stream(role, messages, tool_specs, system_prompt, **kwargs):
+                yield event
+            return
+
+        # Buffered, so an attempted final answer can be discarded
+        events = [event async for event in self._stream(role, messages, tool_specs, system_prompt, **kwargs)]
+        if calls_tools(events):
+            self.turns[role] += 1
+            for event in events:
+                yield event
+            return
+        logger.debug("Escalating a %s turn to the analysis model", role)
+        self.turns["escalated"] += 1
+        discarded = [event["metadata"] for event in events if "metadata" in event]
+        async for event in self._stream("analysis", messages, tool_specs, system_prompt, **kwargs):
+            if "metadata" in event and discarded:
+                event = dict(event, metadata=merged_metadata(event["metadata"], discarded))
+                discarded = []
+            yield event
+
+    def _stream(self, role, messages, tool_specs, system_prompt, system_prompt_content=None, **kwargs):
+        if system_prompt_content and not self.caching.get(role, True):
+            system_prompt_content = strip_cache_points(system_prompt_content)
+        return self.models[role].stream(
+            messages, tool_specs, system_prompt, system_prompt_content=system_prompt_content, **kwargs
+        )
+
+    async def classify(self, prompt, choices):
+        """One of `choices` ({name: description}) for a prompt, using the intent model; None if unclear"""
+        options = "\n".join(f"- {name}: {description}" for name, description in choices.items())
+        messages = [{"role": "user", "content": [{"text": f"{prompt}\n\nAgents:\n{options}"}]}]
+        text = ""
+        async for event in self.models["intent"].stream(
+            messages, system_prompt="Pick the agent best suited to the request. Reply with its name only."
+        ):
+            text += event.get("contentBlockDelta", {}).get("delta", {}).get("text", "")
+        answer = text.strip().strip(".`'\"").lower()
+        return answer if answer in choices else None
+
+
+def for_role(model, role):
+    """`model` restricted to one role, if it routes by role at all"""
+    return model.for_role(role) if isinstance(model, TieredModel) else model
+
+
+def bedrock_models(model_ids, streaming=False):
+    """TieredModel over one BedrockModel per distinct model ID"""
+    from strands.models.bedrock import BedrockModel
+
+    clients = {}
+    caching = {}
+    for role, model_id in model_ids.items():
+        caching[role] = prompt_caching_enabled(model_id)
+        if model_id not in clients:
+            clients[model_id] = BedrockModel(
+                model_id=model_id, streaming=streaming, cache_tools="default" if caching[role] else None
+            )
+    return TieredModel({role: clients[model_id] for role, model_id in model_ids.items()}, caching)
@@ -0,0 +1,69 @@
+"""
+Prompt Cache
+Bedrock prompt-caching checkpoints for the large, fixed part of every request.
+
+Each model turn resends the tool specs, the persona's system prompt and the
+schema and KPI sections. With caching on, a checkpoint is placed after the tool
+specs (BedrockModel cache_tools), after the static prompt and after each
+section, so follow-up turns of a tool loop - and other requests within the
+cache TTL - read that prefix from the cache instead of reprocessing it.
+
+Configuration via environment variables:
+- PROMPT_CACHING: "auto" (default) enables caching for models known to support
+  it, "true" forces it on, "false" turns it off
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Bedrock model ID fragments that support prompt caching
+PROMPT_CACHE_MODELS = (
+    "claude-3-5-haiku",
+    "claude-3-7-sonnet",
+    "claude-sonnet-4",
+    "claude-opus-4",
+    "claude-haiku-4",
+    "amazon.nova-",
+)
+
+CACHE_POINT = {"cachePoint": {"type": "default"}}
+MAX_PROMPT_CHECKPOINTS = 3
+
+USAGE_KEYS = ("inputTokens", "outputTokens", "cacheReadInputTokens", "cacheWriteInputTokens")
+
+
+def prompt_caching_enabled(model_id):
+    """Whether to send cache checkpoints for this model (see PROMPT_CACHING)"""
+    setting = os.getenv("PROMPT_CACHING", "auto").lower()
+    if setting in ("true", "1", "yes"):
+        return True
+    if setting in ("false", "0", "no"):
+        return False
+    return any(fragment in model_id for fragment in PROMPT_CACHE_MODELS)
+
+
+def cached_system_prompt(*sections):
+    """System prompt content blocks with a cache checkpoint after each non-empty section"""
+    sections = [section for section in sections if section]
+    if len(sections) > MAX_PROMPT_CHECKPOINTS:
+        # Bedrock allows four checkpoints per request, one of which is used by the tools
+        keep = MAX_PROMPT_CHECKPOINTS - 1
+        sections = sections[:keep] + ["\n\n".join(sections[keep:])]
+    blocks = []
+    for section in sections:
+        blocks.extend([{"text": section}, dict(CACHE_POINT)])
+    return blocks
+
+
+def usage_summary(result):
+    """Token usage of an agent run, including cache reads and writes"""
+    usage = result.metrics.accumulated_usage
+    summary = {key: usage.get(key, 0) for key in USAGE_KEYS}
+    logger.info(
+        "Token usage: %(inputTokens)d in, %(outputTokens)d out, "
+        "%(cacheReadInputTokens)d cache read, %(cacheWriteInputTokens)d cache write",
+        summary,
+    )
+    return summary
@@ -0,0 +1,221 @@
+"""
+Query Result Cache
+Caches Teradata query results in front of the base_readQuery MCP tool.
+
+SQL is normalized before lookup (comments and whitespace dropped, keywords and
+identifiers upper-cased, literal IN-lists sorted) so near-identical dashboard
+queries share one entry. Entries live in a size-bounded LRU and expire after a
+per-table TTL.
+
+Agents can force a warehouse round-trip with the tool's `fresh` argument or a
+`-- nocache` / `/*+ NOCACHE */` comment in the SQL.
+
+Configuration via environment variables:
+- QUERY_CACHE_MAX_ENTRIES: Maximum cached result sets (default 512)
+- QUERY_CACHE_MAX_BYTES: Maximum total size of cached results (default 32MB)
+- QUERY_CACHE_TTL: Default TTL in seconds (default 300)
+- QUERY_CACHE_TABLE_TTLS: Per-table TTLs, e.g. "Churn_Modelling=3600,Transactions=30"
+"""
+
+import copy
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from teradata_tools import QUERY_TOOL, ToolProxy, result_rows
+
+# Tokens that must survive normalization untouched, plus comments to drop
+_TOKENS = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/", re.S)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|[-+]?\d+(?:\.\d+)?")
+_IN_LIST = re.compile(r"\bIN\(([^()]*)\)")
+_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+((?:\"[^\"]+\"|[\w$#]+)(?:\.(?:\"[^\"]+\"|[\w$#]+))?)")
+_NOCACHE = re.compile(r"(?:--|/\*)\s*\+?\s*nocache\b", re.I)
+_VOLATILE = re.compile(r"\b(?:CURRENT_DATE|CURRENT_TIME|CURRENT_TIMESTAMP|RANDOM|SAMPLE)\b")
+_READ_ONLY = re.compile(r"^(?:SELECT|SEL|WITH)\b")
+
+
+def normalize_sql(sql):
+    """Canonical form of a query used as the cache key"""
+    parts = []
+    code = []  # SQL text since the last literal, comments replaced by a space
+    pos = 0
+    for match in _TOKENS.finditer(sql):
+        code.append(sql[pos:match.start()])
+        token = match.group(0)
+        if token.startswith("'") or token.startswith('"'):
+            # Literals and quoted identifiers are kept byte for byte
+            parts.append(_normalize_code("".join(code)))
+            parts.append(token)
+            code = []
+        else:
+            code.append(" ")
+        pos = match.end()
+    code.append(sql[pos:])
+    parts.append(_normalize_code("".join(code)))
+    text = "".join(parts).strip().rstrip(";").strip()
+    return _IN_LIST.sub(_sort_in_list, text)
+
+
+def _normalize_code(segment):
+    """Collapse whitespace, drop it around operators and punctuation, upper-case (no literals inside)"""
+    segment = re.sub(r"\s+", " ", segment).upper()
+    return re.sub(r"\s*([(),=<>+*/])\s*", r"\1", segment)
+
+
+def _sort_in_list(match):
+    items = _LITERAL.findall(match.group(1))
+    if ",".join(items) != match.group(1):
+        return match.group(0)
+    return f"IN({','.join(sorted(set(items)))})"
+
+
+def referenced_tables(normalized_sql):
+    """Unqualified, upper-case names of the tables a normalized query reads"""
+    return {name.split(".")[-1].strip('"').upper() for name in _TABLES.findall(normalized_sql)}
+
+
+def is_cacheable(sql, normalized_sql):
+    if _NOCACHE.search(sql):
+        return False
+    return bool(_READ_ONLY.match(normalized_sql)) and not _VOLATILE.search(normalized_sql)
+
+
+class QueryCache:
+    """Thread-safe LRU of query results bounded by entry count and total bytes"""
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None, table_ttls=None):
+        self.max_entries = max_entries or int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "512"))
+        self.max_bytes = max_bytes or int(os.getenv("QUERY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        self.ttl = ttl or float(os.getenv("QUERY_CACHE_TTL", "300"))
+        if table_ttls is None:
+            table_ttls = {}
+            for item in os.getenv("QUERY_CACHE_TABLE_TTLS", "").split(","):
+                if "=" in item:
+                    table, seconds = item.split("=", 1)
+                    table_ttls[table.strip()] = float(seconds)
+        self.table_ttls = {table.upper(): seconds for table, seconds in table_ttls.items()}
+
+        self._entries = OrderedDict()  # key -> (expires_at, size, tables, result)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    def ttl_for(self, tables):
+        """Shortest TTL of the tables involved (the default TTL if none are configured)"""
+        ttls = [self.table_ttls[t] for t in tables if t in self.table_ttls]
+        return min(ttls) if ttls else self.ttl
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def put(self, key, result, tables, ttl=None):
+        size = len(json.dumps(result["content"], default=str))
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl_for(tables) if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, size, tables, result)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[1]
+
+    def record_bypass(self):
+        with self._lock:
+            self.bypassed += 1
+
+    def invalidate(self, table=None):
+        """Drop every entry, or only those reading `table`"""
+        with self._lock:
+            if table is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            table = table.split(".")[-1].upper()
+            for key in [k for k, e in self._entries.items() if table in e[2]]:
+                self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def wrap(self, tool):
+        """Tool layer: put the cache in front of the Teradata query tool"""
+        if tool.tool_name == QUERY_TOOL:
+            return CachingQueryTool(tool, self)
+        return tool
+
+
+class CachingQueryTool(ToolProxy):
+    """base_readQuery with a result cache and a `fresh` opt-out argument"""
+
+    def __init__(self, inner, cache):
+        super().__init__(inner)
+        self.cache = cache
+
+    @property
+    def tool_spec(self):
+        spec = copy.deepcopy(self.inner.tool_spec)
+        schema = spec["inputSchema"]["json"]
+        schema.setdefault("properties", {})["fresh"] = {
+            "type": "boolean",
+            "description": "Set to true to bypass the result cache when the data must be current.",
+        }
+        return spec
+
+    async def call(self, tool_use, invocation_state):
+        arguments = dict(tool_use["input"])
+        fresh = arguments.pop("fresh", False)
+        tool_use = dict(tool_use, input=arguments)
+        sql = arguments.get("sql") or ""
+        normalized = normalize_sql(sql)
+
+        if fresh or not is_cacheable(sql, normalized):
+            self.cache.record_bypass()
+            return await self.inner.call(tool_use, invocation_state)
+
+        key = json.dumps([normalized, {k: v for k, v in arguments.items() if k != "sql"}],
+                         sort_keys=True, default=str)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dict(cached, toolUseId=tool_use["toolUseId"])
+
+        result = await self.inner.call(tool_use, invocation_state)
+        try:
+            result_rows(result)  # Only successful result sets are cached
+        except Exception:
+            return result
+        self.cache.put(key, result, referenced_tables(normalized))
+        return result
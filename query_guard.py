@@ -0,0 +1,209 @@
+"""
+Query Guard
+Keeps base_readQuery results small before they reach the model.
+
+Every query the agent runs goes through this layer:
+- Anything but a single read-only SELECT / WITH statement is rejected.
+- A top-level SELECT (the main SELECT of a WITH query) without a row limit gets
+  TOP n added (an existing TOP or SAMPLE larger than n is lowered), so Teradata
+  never ships thousands of rows through the MCP stdio pipe. UNION / INTERSECT /
+  EXCEPT / MINUS queries are wrapped as SELECT TOP n * FROM (...) q, since a TOP
+  in the first branch would leave the others unbounded. TOP n PERCENT has no
+  row bound and is rejected.
+- The result is returned as a compact summary - row count, per-column stats
+  and the first rows - with a flag when rows were cut off, instead of the raw dump.
+
+Configuration via environment variables:
+- QUERY_GUARD_MAX_ROWS: Most rows fetched from Teradata per query (default 1000)
+- QUERY_GUARD_SAMPLE_ROWS: Rows shown to the model by default (default 10)
+"""
+
+import copy
+import json
+import os
+import re
+
+from result_encoding import column_type, compact_value, encode_rows
+from teradata_tools import QUERY_TOOL, ToolProxy, result_body, result_rows
+
+# String literals, quoted identifiers and comments (masked before keyword checks)
+_MASKED = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/", re.S)
+_LEADING_COMMENTS = re.compile(r"^(?:\s+|--[^\n]*|/\*.*?\*/)*", re.S)
+_READ_ONLY = re.compile(r"^(?:SELECT|SEL|WITH)\b", re.I)
+_SELECT_HEAD = re.compile(r"(SELECT|SEL)(\s+(?:DISTINCT|ALL))?\b", re.I)
+_SELECT = re.compile(r"\b(?:SELECT|SEL)\b", re.I)
+_SET_OPERATION = re.compile(r"\b(?:UNION|INTERSECT|EXCEPT|MINUS)\b", re.I)
+_ORDER_BY = re.compile(r"\bORDER\s+BY\b", re.I)
+_TOP = re.compile(r"(\s+TOP\s+)(\d+)(\s+PERCENT)?", re.I)
+_SAMPLE = re.compile(r"\bSAMPLE\s+(\d+)\s*(?:;\s*)?$", re.I)
+
+
+class QueryRejected(ValueError):
+    """A query the guard refuses to send to Teradata"""
+
+
+def bound_query(sql, max_rows):
+    """Return `sql` limited to at most `max_rows` + 1 rows; raises QueryRejected.
+
+    The extra row lets the caller tell a complete result from a truncated one.
+    Queries that are already limited to `max_rows` or fewer are returned unchanged.
+    """
+    masked = _MASKED.sub(lambda m: " " * len(m.group(0)), sql)
+    code = masked.strip().rstrip(";").strip()
+    if not _READ_ONLY.match(code):
+        raise QueryRejected("only read-only SELECT or WITH queries are allowed")
+    if ";" in code:
+        raise QueryRejected("send one statement per query")
+
+    limit = max_rows + 1
+    sample = _SAMPLE.search(masked)
+    if sample:
+        if int(sample.group(1)) <= max_rows:
+            return sql
+        return f"{sql[:sample.start(1)]}{limit}{sql[sample.end(1):]}"
+
+    start = _LEADING_COMMENTS.match(sql).end()
+    head = _SELECT_HEAD.match(sql, start) or _SELECT_HEAD.match(sql, _main_select(masked))
+    operations = _top_level(masked, _SET_OPERATION, head.start())
+    if operations:
+        return _wrap_set_operation(sql, masked, head.start(), operations[-1], limit)
+    top = _TOP.match(sql, head.end())
+    if top:
+        if top.group(3):
+            raise QueryRejected(f"TOP n PERCENT is not bounded; use TOP {max_rows} or fewer rows")
+        if int(top.group(2)) <= max_rows:
+            return sql
+        return f"{sql[:top.start(2)]}{limit}{sql[top.end(2):]}"
+    return f"{sql[:head.end()]} TOP {limit}{sql[head.end():]}"
+
+
+def _top_level(masked, pattern, start=0):
+    """Matches of `pattern` from `start` on that are outside any parentheses"""
+    matches, depth = [], 0
+    for match in re.finditer(rf"[()]|{pattern.pattern}", masked[start:], re.I):
+        token = match.group(0)
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0:
+            matches.append(start + match.start())
+    return matches
+
+
+def _main_select(masked):
+    """Offset of the SELECT outside any parentheses, i.e. after the CTEs of a WITH query"""
+    selects = _top_level(masked, _SELECT)
+    if not selects:
+        raise QueryRejected("WITH query without a main SELECT")
+    return selects[0]
+
+
+def _wrap_set_operation(sql, masked, start, last_operation, limit):
+    """Bound a set operation as a whole: SELECT TOP limit * FROM (<branches>) q [ORDER BY ...]"""
+    end = len(masked.rstrip().rstrip(";").rstrip())
+    # A final ORDER BY sorts the whole result and is not allowed in a derived table
+    orders = [o for o in _top_level(masked[:end], _ORDER_BY, start) if o > last_operation]
+    split = orders[-1] if orders else end
+    wrapped = f"SELECT TOP {limit} * FROM ({sql[start:split].rstrip()}) q"
+    if orders:
+        wrapped += f" {sql[split:end]}"
+    return f"{sql[:start]}{wrapped}"
+
+
+def summarize_rows(rows, max_rows, sample_rows):
+    """Compact summary of a result set: counts, column stats and leading rows"""
+    truncated = len(rows) > max_rows
+    rows = rows[:max_rows]
+    summary = {
+        "row_count": len(rows),
+        "truncated": truncated,
+        "rows": rows[:sample_rows],
+    }
+    if len(rows) > sample_rows and rows:
+        summary["columns"] = {name: column_stats([row.get(name) for row in rows]) for name in rows[0]}
+    if truncated:
+        summary["note"] = (
+            f"Only the first {max_rows} rows were fetched. Aggregate in SQL "
+            "(GROUP BY, COUNT, AVG, ...) instead of fetching raw rows."
+        )
+    elif len(rows) > sample_rows:
+        summary["note"] = f"Showing {sample_rows} of {len(rows)} rows; column stats cover all of them."
+    return summary
+
+
+def column_stats(values):
+    present = [compact_value(v) for v in values if v is not None]
+    stats = {"nulls": len(values) - len(present)}
+    numbers = present if column_type(present) in ("int", "float") else None
+    if numbers:
+        stats.update(min=min(numbers), max=max(numbers), mean=round(sum(numbers) / len(numbers), 4))
+    else:
+        stats["distinct"] = len({str(v) for v in present})
+    return stats
+
+
+class QueryGuard:
+    """Row limits and result summaries for the Teradata query tool"""
+
+    def __init__(self, max_rows=None, sample_rows=None):
+        self.max_rows = max_rows or int(os.getenv("QUERY_GUARD_MAX_ROWS", "1000"))
+        self.sample_rows = sample_rows or int(os.getenv("QUERY_GUARD_SAMPLE_ROWS", "10"))
+
+    def wrap(self, tool):
+        """Tool layer: guard the Teradata query tool"""
+        if tool.tool_name == QUERY_TOOL:
+            return GuardedQueryTool(tool, self)
+        return tool
+
+
+class GuardedQueryTool(ToolProxy):
+    """base_readQuery with enforced row limits and summarized results"""
+
+    def __init__(self, inner, guard):
+        super().__init__(inner)
+        self.guard = guard
+
+    @property
+    def tool_spec(self):
+        spec = copy.deepcopy(self.inner.tool_spec)
+        spec["description"] = (
+            f"{spec['description']}\n\nResults are capped at {self.guard.max_rows} rows and returned "
+            "as a summary (row count, column stats, first rows) with a `truncated` flag. "
+            "Aggregate in SQL rather than fetching raw rows."
+        )
+        spec["inputSchema"]["json"].setdefault("properties", {})["rows"] = {
+            "type": "integer",
+            "description": f"Rows to include in the result (default {self.guard.sample_rows}, "
+                           f"at most {self.guard.max_rows}).",
+        }
+        return spec
+
+    async def call(self, tool_use, invocation_state):
+        arguments = dict(tool_use["input"])
+        try:
+            sample_rows = int(arguments.pop("rows", None) or self.guard.sample_rows)
+            sql = bound_query(arguments.get("sql") or "", self.guard.max_rows)
+        except (TypeError, ValueError) as e:
+            reason = e if isinstance(e, QueryRejected) else "rows must be a whole number"
+            return {
+                "toolUseId": tool_use["toolUseId"],
+                "status": "error",
+                "content": [{"text": f"Query rejected: {reason}."}],
+            }
+        sample_rows = min(max(sample_rows, 1), self.guard.max_rows)
+        arguments["sql"] = sql
+
+        result = await self.inner.call(dict(tool_use, input=arguments), invocation_state)
+        try:
+            body = result_body(result)
+            rows = result_rows(result)
+        except Exception:
+            return result
+        summary = summarize_rows(rows, self.guard.max_rows, sample_rows)
+        summary = {"status": "success", "sql": sql, **summary}
+        if isinstance(body.get("results"), dict):
+            # Keep the columnar encoding (and its result_id) of a ResultEncoder below
+            summary["rows"] = encode_rows(summary["rows"])
+            summary["result_id"] = body.get("result_id")
+        return dict(result, content=[{"text": json.dumps(summary, separators=(",", ":"), default=str)}])
@@ -0,0 +1,101 @@
+"""
+Request Limits
+Bounded concurrency and per-request deadlines for the asyncio entrypoints.
+
+Each container runs at most MAX_CONCURRENT_REQUESTS agent invocations at once;
+extra requests wait for a slot. Time spent waiting counts towards the request's
+REQUEST_TIMEOUT_SECONDS budget, so a request never runs past its deadline.
+The deadline is also published to the request's tool calls (see remaining()),
+which cut their own timeouts to fit it (see mcp_pool.py).
+
+Configuration via environment variables:
+- MAX_CONCURRENT_REQUESTS: Agent runs allowed in flight per container (default 8)
+- REQUEST_TIMEOUT_SECONDS: End-to-end budget per request (default 300)
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import os
+import time
+
+# time.monotonic() deadline of the request being handled, None outside a request
+deadline = contextvars.ContextVar("request_deadline", default=None)
+
+
+def remaining():
+    """Seconds left in the current request's budget, or None outside a request"""
+    value = deadline.get()
+    return None if value is None else value - time.monotonic()
+
+
+class RequestLimiter:
+    """Semaphore-bounded request slots with a per-request timeout"""
+
+    def __init__(self, max_concurrent=None, timeout=None):
+        self.max_concurrent = max_concurrent or int(os.getenv("MAX_CONCURRENT_REQUESTS", "8"))
+        self.timeout = timeout or float(os.getenv("REQUEST_TIMEOUT_SECONDS", "300"))
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+
+    @property
+    def busy(self):
+        """True when every slot is taken (reported to AgentCore as HealthyBusy)"""
+        return self.in_flight >= self.max_concurrent
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def run(self, func, *args):
+        """Await func(*args) inside a slot; raises TimeoutError past the deadline"""
+        token = deadline.set(time.monotonic() + self.timeout)
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self.slot():
+                    return await func(*args)
+        finally:
+            deadline.reset(token)
+
+    async def stream(self, events):
+        """Relay an async generator of events inside a slot, ending it at the deadline"""
+        loop = asyncio.get_running_loop()
+        end = loop.time() + self.timeout
+        token = deadline.set(time.monotonic() + self.timeout)
+        try:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await self._slots.acquire()
+            except TimeoutError:
+                yield {"type": "error", "error": f"Request timed out after {self.timeout:.0f}s"}
+                return
+            self.in_flight += 1
+            try:
+                while True:
+                    try:
+                        event = await asyncio.wait_for(anext(events), end - loop.time())
+                    except StopAsyncIteration:
+                        return
+                    except TimeoutError:
+                        yield {"type": "error", "error": f"Request timed out after {self.timeout:.0f}s"}
+                        return
+                    yield event
+            finally:
+                await events.aclose()
+                self.in_flight -= 1
+                self._slots.release()
+        finally:
+            # The generator runs in its consumer's context: do not leave this request's deadline behind
+            with contextlib.suppress(ValueError):  # finalized from another context (garbage collection)
+                deadline.reset(token)
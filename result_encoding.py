@@ -0,0 +1,151 @@
+"""
+Result Encoding
+Compact, columnar encoding of Teradata MCP results before they enter the conversation.
+
+teradata-mcp-server returns a list of row objects, repeating every column name
+on every row and often rendering numbers as strings. This layer rewrites the
+"results" of each tool response as
+
+    {"fields": ["Geography", "customers"], "types": ["str", "int"],
+     "data": [["France", "Spain"], [5014, 2477]]}
+
+with numeric strings converted and floats rounded to RESULT_DECIMALS places.
+The original response is kept in an in-memory side store under the returned
+"result_id"; the local fetch_full_result tool reads it back at full precision.
+
+Configuration via environment variables:
+- RESULT_DECIMALS: Decimal places kept for floats (default 4)
+- RESULT_STORE_MAX_ENTRIES: Full-fidelity results kept per process (default 64)
+"""
+
+import json
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+from strands import tool
+
+from teradata_tools import ToolProxy, result_body
+
+# Numeric strings safe to convert (no leading zeros, so IDs and codes stay strings)
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+
+def compact_value(value, decimals=None):
+    """`value` with numeric strings parsed and floats rounded to `decimals` places"""
+    if isinstance(value, str) and _NUMBER.fullmatch(value):
+        value = int(value) if value.lstrip("-").isdigit() else float(value)
+    elif isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, float) and decimals is not None:
+        value = round(value, decimals)
+    return value
+
+
+def column_type(values):
+    kinds = {type(v) for v in values if v is not None}
+    if not kinds:
+        return "null"
+    if kinds <= {int}:
+        return "int"
+    if kinds <= {int, float}:
+        return "float"
+    if kinds == {bool}:
+        return "bool"
+    if kinds == {str}:
+        return "str"
+    return "mixed"
+
+
+def encode_rows(rows, decimals=None):
+    """Columnar {"fields", "types", "data"} table for a list of row dicts"""
+    fields = list(rows[0]) if rows else []
+    data = [[compact_value(row.get(field), decimals) for row in rows] for field in fields]
+    return {"fields": fields, "types": [column_type(column) for column in data], "data": data}
+
+
+class ResultEncoder:
+    """Tool layer that encodes results compactly and keeps the originals on the side"""
+
+    def __init__(self, decimals=None, max_results=None):
+        self.decimals = decimals if decimals is not None else int(os.getenv("RESULT_DECIMALS", "4"))
+        self.max_results = max_results or int(os.getenv("RESULT_STORE_MAX_ENTRIES", "64"))
+        self._store = OrderedDict()  # result_id -> original response body
+        self._lock = threading.Lock()
+
+    def wrap(self, tool):
+        """Tool layer: encode every Teradata tool's results"""
+        return EncodedResultTool(tool, self)
+
+    def keep(self, body):
+        """Store an original response body and return its result_id"""
+        result_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._store[result_id] = body
+            while len(self._store) > self.max_results:
+                self._store.popitem(last=False)
+        return result_id
+
+    def restore(self, result_id, body):
+        """Put back a result saved elsewhere (e.g. with a session, see session_store.py)"""
+        with self._lock:
+            self._store[result_id] = body
+            self._store.move_to_end(result_id)
+            while len(self._store) > self.max_results:
+                self._store.popitem(last=False)
+
+    def full_result(self, result_id):
+        with self._lock:
+            body = self._store.get(result_id)
+            if body is not None:
+                self._store.move_to_end(result_id)
+            return body
+
+    def as_tool(self):
+        """A local tool that returns stored results at full precision"""
+        encoder = self
+
+        @tool
+        def fetch_full_result(result_id: str, offset: int = 0, limit: int = 100) -> str:
+            """Fetch the original, full-precision rows of an earlier Teradata tool result.
+
+            Args:
+                result_id: The result_id returned with the compact result.
+                offset: First row to return.
+                limit: Maximum number of rows to return.
+            """
+            body = encoder.full_result(result_id)
+            if body is None:
+                return f"No stored result {result_id!r}; it may have expired. Run the query again."
+            rows = body.get("results", [])
+            return json.dumps({
+                "result_id": result_id,
+                "row_count": len(rows),
+                "offset": offset,
+                "rows": rows[offset:offset + limit],
+            }, default=str)
+
+        return fetch_full_result
+
+
+class EncodedResultTool(ToolProxy):
+    """A Teradata tool whose row results are returned in columnar form"""
+
+    def __init__(self, inner, encoder):
+        super().__init__(inner)
+        self.encoder = encoder
+
+    async def call(self, tool_use, invocation_state):
+        result = await self.inner.call(tool_use, invocation_state)
+        try:
+            body = result_body(result)
+        except Exception:
+            return result
+        rows = body.get("results")
+        if not rows or not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            return result
+        encoded = dict(body, results=encode_rows(rows, self.encoder.decimals), result_id=self.encoder.keep(body))
+        return dict(result, content=[{"text": json.dumps(encoded, separators=(",", ":"), default=str)}])
@@ -0,0 +1,303 @@
+"""
+Customer Scoring
+Vectorized, rule-based segmentation of the whole customer table in one pass.
+
+The rules are the ones the persona prompts define:
+- credit tier: Prime (>700), Near-Prime (600-700), Subprime (<600)
+- credit risk: Premium / Low / Medium / High per the credit risk thresholds
+  (balance-trend terms are left out - the table has no balance history)
+- wealth tier: Ultra High Net Worth / High Net Worth / Mass Affluent /
+  Emerging Affluent / Premium Potential / Mass Market on Balance + EstimatedSalary
+- churn risk: High (>70%) / Medium (30-70%) / Low (<30%) churn probability
+
+Churn probability is a naive-Bayes combination of the observed churn rate of each
+customer's Geography, Gender, age band, product count, activity and zero-balance
+segments, computed from the table itself. The same data always gives the same scores.
+
+The customer table is extracted once (read from the local table mirror when one
+is available, see table_mirror.py), scored with NumPy in milliseconds and served
+by the local score_customers tool until it is older than SCORING_TTL.
+
+Configuration via environment variables:
+- SCORING_TTL: Seconds before the table is extracted and scored again (default 900)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from strands import tool
+
+from teradata_tools import QUERY_TOOL, call_tool, result_rows
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    "CustomerId", "Surname", "CreditScore", "Geography", "Gender", "Age", "Tenure", "Balance",
+    "NumOfProducts", "HasCrCard", "IsActiveMember", "EstimatedSalary", "Exited",
+)
+TEXT_COLUMNS = ("Surname", "Geography", "Gender")
+
+SEGMENT_COLUMNS = ("credit_tier", "credit_risk", "wealth_tier", "churn_risk")
+
+# Pseudo-count pulling small segments towards the portfolio churn rate
+SMOOTHING = 20.0
+
+
+def customers_from_rows(rows):
+    """Column arrays from query result rows"""
+    columns = {}
+    for name in COLUMNS:
+        values = [row.get(name) for row in rows]
+        if name in TEXT_COLUMNS:
+            columns[name] = np.array([(v or "").strip() for v in values], dtype=object)
+        else:
+            columns[name] = np.array([0 if v is None else v for v in values], dtype=np.float64)
+    return columns
+
+
+def credit_tier(credit_score):
+    return np.select(
+        [credit_score > 700, credit_score >= 600],
+        ["Prime", "Near-Prime"],
+        "Subprime",
+    ).astype(object)
+
+
+def credit_risk(credit_score, balance, products):
+    return np.select(
+        [
+            (credit_score > 750) & (balance > 100_000) & (products >= 3),
+            (credit_score < 600) | (products == 1),
+            (credit_score > 700) & (products >= 2),
+        ],
+        ["Premium", "High", "Low"],
+        "Medium",
+    ).astype(object)
+
+
+def wealth_tier(balance, salary):
+    return np.select(
+        [
+            (balance > 500_000) & (salary > 200_000),
+            (balance > 250_000) & (salary > 150_000),
+            (balance > 100_000) & (salary > 100_000),
+            (balance >= 50_000) & (balance <= 100_000) & (salary > 80_000),
+            (balance < 50_000) & (salary > 150_000),
+        ],
+        ["Ultra High Net Worth", "High Net Worth", "Mass Affluent", "Emerging Affluent", "Premium Potential"],
+        "Mass Market",
+    ).astype(object)
+
+
+def churn_probability(columns):
+    """Naive-Bayes churn probability from per-segment churn rates"""
+    exited = columns["Exited"]
+    base = float(np.clip(exited.mean(), 1e-3, 1 - 1e-3)) if len(exited) else 0.5
+    base_log_odds = np.log(base / (1 - base))
+    factors = [
+        np.unique(columns["Geography"], return_inverse=True)[1],
+        np.unique(columns["Gender"], return_inverse=True)[1],
+        np.digitize(columns["Age"], [30, 40, 50, 60]),
+        np.clip(columns["NumOfProducts"], 1, 4).astype(np.int64) - 1,
+        (columns["IsActiveMember"] > 0).astype(np.int64),
+        (columns["Balance"] > 0).astype(np.int64),
+    ]
+    log_odds = np.full(len(exited), base_log_odds)
+    for codes in factors:
+        counts = np.bincount(codes)
+        churned = np.bincount(codes, weights=exited, minlength=len(counts))
+        rate = np.clip((churned + base * SMOOTHING) / (counts + SMOOTHING), 1e-3, 1 - 1e-3)
+        log_odds += np.log(rate / (1 - rate))[codes] - base_log_odds
+    return 1 / (1 + np.exp(-log_odds))
+
+
+def churn_risk(probability):
+    return np.select([probability > 0.7, probability >= 0.3], ["High", "Medium"], "Low").astype(object)
+
+
+def score_table(columns):
+    """Every segmentation for every customer, as column arrays"""
+    probability = churn_probability(columns)
+    return {
+        "credit_tier": credit_tier(columns["CreditScore"]),
+        "credit_risk": credit_risk(columns["CreditScore"], columns["Balance"], columns["NumOfProducts"]),
+        "wealth_tier": wealth_tier(columns["Balance"], columns["EstimatedSalary"]),
+        "churn_probability": probability,
+        "churn_risk": churn_risk(probability),
+    }
+
+
+class CustomerScorer:
+    """Extracts the customer table, scores it and answers segment queries from memory"""
+
+    def __init__(self, pool, table, ttl=None, mirror=None):
+        self.pool = pool
+        self.table = table
+        self.mirror = mirror
+        self.ttl = ttl or float(os.getenv("SCORING_TTL", "900"))
+        self._data = None
+        self._scored_at = None
+        self._lock = threading.Lock()
+        self._fill_lock = threading.Lock()
+        self._refreshing = False
+
+    def load(self):
+        """Customer table as column arrays"""
+        if self.mirror is not None and self.mirror.enabled:
+            columns = self.mirror.columns(self.table, COLUMNS)
+            if columns is not None:
+                return {
+                    name: values if name in TEXT_COLUMNS else np.nan_to_num(values, nan=0.0)
+                    for name, values in columns.items()
+                }
+        sql = f"SELECT {', '.join(COLUMNS)} FROM {self.table}"
+        return customers_from_rows(result_rows(call_tool(self.pool, QUERY_TOOL, {"sql": sql})))
+
+    def refresh(self):
+        """Extract and score the customer table"""
+        started = time.monotonic()
+        columns = self.load()
+        loaded = time.monotonic()
+        data = {**columns, **score_table(columns)}
+        with self._lock:
+            self._data = data
+            self._scored_at = time.time()
+            self._refreshing = False
+        logger.info("Scored %d customers (extract %.2fs, scoring %.3fs)",
+                    len(columns["CustomerId"]), loaded - started, time.monotonic() - loaded)
+        return data
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Customer scoring refresh failed: %s", e)
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def data(self):
+        """Scored customer columns. Scored synchronously on first use; once older
+        than the TTL they are served while a background refresh runs."""
+        if self._data is None:
+            with self._fill_lock:
+                if self._data is None:
+                    self.refresh()
+        elif time.time() - self._scored_at >= self.ttl:
+            self._refresh_in_background()
+        return self._data
+
+    def query(self, filters=None, group_by="", sort_by="churn_probability", limit=10, include_exited=False):
+        """Customers matching `filters` ({column: value}), grouped or as a top-N list"""
+        data = self.data()
+        mask = np.ones(len(data["CustomerId"]), dtype=bool)
+        if not include_exited:
+            mask &= data["Exited"] == 0
+        for column, value in (filters or {}).items():
+            if value:
+                mask &= np.char.lower(data[column].astype(str)) == str(value).lower()
+
+        result = {
+            "customers": int(mask.sum()),
+            "total_balance": round(float(data["Balance"][mask].sum()), 2),
+            "scored_at": datetime.fromtimestamp(self._scored_at, timezone.utc).isoformat(timespec="seconds"),
+        }
+        if group_by:
+            groups, codes = np.unique(data[group_by][mask], return_inverse=True)
+            counts = np.bincount(codes, minlength=len(groups))
+            balances = np.bincount(codes, weights=data["Balance"][mask], minlength=len(groups))
+            churn = np.bincount(codes, weights=data["churn_probability"][mask], minlength=len(groups))
+            result["groups"] = [
+                {
+                    group_by: str(group),
+                    "customers": int(count),
+                    "total_balance": round(float(balance), 2),
+                    "avg_churn_probability": round(float(total / count), 4),
+                }
+                for group, count, balance, total in zip(groups, counts, balances, churn)
+            ]
+            return result
+
+        indices = np.flatnonzero(mask)
+        order = np.lexsort((data["CustomerId"][indices], -data[sort_by][indices].astype(np.float64)))
+        result["top"] = [self._customer(data, i) for i in indices[order[:limit]]]
+        return result
+
+    def customers(self, customer_ids):
+        """Scored profiles of the given customers keyed by CustomerId (unknown IDs are left out)"""
+        data = self.data()
+        wanted = np.array([float(customer_id) for customer_id in customer_ids], dtype=np.float64)
+        indices = np.flatnonzero(np.isin(data["CustomerId"], wanted))
+        return {int(data["CustomerId"][i]): self._customer(data, i) for i in indices}
+
+    @staticmethod
+    def _customer(data, index):
+        row = {}
+        for name in (*COLUMNS, *SEGMENT_COLUMNS, "churn_probability"):
+            value = data[name][index]
+            if isinstance(value, np.floating):
+                value = int(value) if value.is_integer() else round(float(value), 4)
+            row[name] = value
+        return row
+
+    def as_tool(self):
+        """A local tool serving deterministic customer scores and segments"""
+        scorer = self
+
+        @tool
+        def score_customers(
+            group_by: str = "",
+            churn_risk: str = "",
+            credit_tier: str = "",
+            credit_risk: str = "",
+            wealth_tier: str = "",
+            geography: str = "",
+            sort_by: str = "churn_probability",
+            limit: int = 10,
+            include_exited: bool = False,
+        ) -> str:
+            """Rule-based scores for every customer: credit tier, credit risk, wealth tier and churn risk.
+
+            Filters are exact segment names. With group_by, returns counts, balances and
+            average churn probability per group; otherwise the top customers by sort_by.
+
+            Args:
+                group_by: Optional column to group by: churn_risk, credit_tier, credit_risk, wealth_tier or Geography.
+                churn_risk: High (>70% churn probability), Medium (30-70%) or Low (<30%).
+                credit_tier: Prime (>700), Near-Prime (600-700) or Subprime (<600).
+                credit_risk: Premium, Low, Medium or High.
+                wealth_tier: Ultra High Net Worth, High Net Worth, Mass Affluent, Emerging Affluent,
+                    Premium Potential or Mass Market.
+                geography: France, Germany or Spain.
+                sort_by: Numeric column to rank customers by (e.g. churn_probability, Balance, EstimatedSalary).
+                limit: Number of customers to return.
+                include_exited: Include customers who have already churned.
+            """
+            if group_by and group_by not in (*SEGMENT_COLUMNS, "Geography"):
+                return f"Cannot group by '{group_by}'. Use one of: {', '.join(SEGMENT_COLUMNS)}, Geography."
+            if sort_by not in ("churn_probability", "CreditScore", "Balance", "EstimatedSalary", "Age",
+                               "Tenure", "NumOfProducts"):
+                return f"Cannot sort by '{sort_by}'."
+            filters = {
+                "churn_risk": churn_risk,
+                "credit_tier": credit_tier,
+                "credit_risk": credit_risk,
+                "wealth_tier": wealth_tier,
+                "Geography": geography,
+            }
+            result = scorer.query(filters, group_by, sort_by, max(1, min(limit, 100)), include_exited)
+            return json.dumps(result, default=str)
+
+        return score_customers
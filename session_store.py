@@ -0,0 +1,170 @@
+"""
+Session Store
+Conversation state for multi-turn AgentCore runtime sessions.
+
+The deployment runs without AgentCore memory and every invocation builds a fresh
+Agent, so a follow-up question used to start from nothing and re-run the
+discovery and base queries of the turn before. Requests that carry a runtime
+session ID (X-Amzn-Bedrock-AgentCore-Runtime-Session-Id, set by the CLI and by
+agentcore_client.py) now continue that session's conversation:
+
+- The messages of earlier turns, including their tool results, seed the new
+  Agent; a TokenBudgetConversationManager (see history.py) keeps them compact.
+- Full-precision results referenced by result_id in those messages (see
+  result_encoding.py) are saved with the session and restored into the result
+  store, so fetch_full_result keeps working for earlier intermediate tables
+  after they leave the process-wide store or the container restarts.
+
+Sessions live in an in-process LRU. With SESSION_STORE_PATH set, every save is
+also written to a local SQLite file, which takes sessions evicted from the LRU
+and survives restarts. Sessions idle longer than SESSION_TTL_SECONDS expire;
+saves purge expired sessions from memory and the file every few minutes. A
+session keeps the persona of its first turn, so follow-ups without an explicit
+agent are not re-routed.
+
+Configuration via environment variables:
+- SESSION_STATE_ENABLED: "true" (default) or "false"
+- SESSION_MAX_SESSIONS: Sessions kept in memory (default 256)
+- SESSION_TTL_SECONDS: Idle time before a session expires (default 3600)
+- SESSION_MAX_RESULTS: Full results kept per session (default 16)
+- SESSION_STORE_PATH: SQLite file for spill-over and restarts (default: memory only)
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+_RESULT_ID = re.compile(r'"?result_id"?\s*[:=]\s*"?([0-9a-f]{12})\b')
+
+
+def result_ids(messages):
+    """result_ids referenced by tool results in a conversation, oldest first"""
+    ids = []
+    for message in messages:
+        for content in message.get("content", []):
+            for item in (content.get("toolResult") or {}).get("content", []):
+                for result_id in _RESULT_ID.findall(item.get("text", "")):
+                    if result_id not in ids:
+                        ids.append(result_id)
+    return ids
+
+
+class SessionStore:
+    """Session-keyed conversation state: in-memory LRU with optional SQLite spill-over"""
+
+    def __init__(self, max_sessions=None, ttl=None, path=None, max_results=None, encoder=None, enabled=None):
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_MAX_SESSIONS", "256"))
+        self.ttl = ttl or float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+        self.max_results = max_results or int(os.getenv("SESSION_MAX_RESULTS", "16"))
+        self.path = path if path is not None else os.getenv("SESSION_STORE_PATH") or None
+        if enabled is None:
+            enabled = os.getenv("SESSION_STATE_ENABLED", "true").lower() in ("true", "1", "yes")
+        self.enabled = enabled
+        self.encoder = encoder
+        self.purge_interval = min(self.ttl, 300)
+        self._next_purge = time.time() + self.purge_interval
+        self._sessions = OrderedDict()  # session_id -> state
+        self._lock = threading.Lock()
+        self._db = None
+        if self.path:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, updated REAL, state TEXT)"
+            )
+            self._db.commit()
+
+    def load(self, session_id):
+        """State {"persona", "messages", "results", "updated"} of a live session, or None"""
+        if not self.enabled or not session_id:
+            return None
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is not None:
+                self._sessions.move_to_end(session_id)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT state FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                if row:
+                    state = json.loads(row[0])
+                    self._remember(session_id, state)
+        if state is None:
+            return None
+        if time.time() - state["updated"] > self.ttl:
+            self.delete(session_id)
+            return None
+        if self.encoder is not None:
+            for result_id, body in state.get("results", {}).items():
+                self.encoder.restore(result_id, body)
+        return state
+
+    def messages(self, session_id):
+        state = self.load(session_id)
+        return state["messages"] if state else None
+
+    def persona(self, session_id):
+        state = self.load(session_id)
+        return state.get("persona") if state else None
+
+    def save(self, session_id, messages, persona=None):
+        """Store a session's conversation and the full results it refers to"""
+        if not self.enabled or not session_id:
+            return
+        results = {}
+        if self.encoder is not None:
+            for result_id in result_ids(messages)[-self.max_results:]:
+                body = self.encoder.full_result(result_id)
+                if body is not None:
+                    results[result_id] = body
+        state = {"persona": persona, "messages": messages, "results": results, "updated": time.time()}
+        # Serialized now, so later changes to the messages cannot leak into the saved turn
+        text = json.dumps(state, default=str)
+        with self._lock:
+            self._remember(session_id, json.loads(text))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, updated, state) VALUES (?, ?, ?)",
+                    (session_id, state["updated"], text),
+                )
+                self._db.commit()
+        if state["updated"] >= self._next_purge:
+            self._next_purge = state["updated"] + self.purge_interval
+            self.purge_expired()
+
+    def append(self, session_id, prompt, message, persona=None):
+        """Add a turn answered without an agent (e.g. by fast_path.py)"""
+        if not self.enabled or not session_id:
+            return
+        messages = self.messages(session_id) or []
+        self.save(session_id, messages + [{"role": "user", "content": [{"text": prompt}]}, message], persona)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self._db.commit()
+
+    def purge_expired(self):
+        """Drop expired sessions from memory and the SQLite file"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for session_id in [s for s, state in self._sessions.items() if state["updated"] < cutoff]:
+                del self._sessions[session_id]
+            if self._db is not None:
+                self._db.execute("DELETE FROM sessions WHERE updated < ?", (cutoff,))
+                self._db.commit()
+
+    def _remember(self, session_id, state):
+        self._sessions[session_id] = state
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            # Still in the SQLite file when there is one
+            self._sessions.popitem(last=False)
@@ -0,0 +1,468 @@
+"""
+SQL Preflight
+Checks base_readQuery SQL locally before it is sent to Teradata.
+
+A bad query used to cost a full MCP round-trip to the warehouse and then
+another model turn to read the error. This layer rejects it up front, with a
+message precise enough to fix it in one go:
+
+- Tables: FROM / JOIN tables of cataloged databases must exist in the schema
+  catalog (see schema_catalog.py).
+- Columns: qualified references (c.Balance) must exist in their table; in a
+  single SELECT over cataloged tables, unqualified columns must exist in one
+  of them. Close matches are suggested.
+- GROUP BY: a SELECT mixing aggregates with plain columns needs those columns
+  (or their output aliases) in GROUP BY.
+- Cartesian joins: CROSS JOIN, and comma-separated tables without an equality
+  condition linking them.
+
+Queries the checks cannot follow (CTEs, subqueries, set operations) only get
+the table check; anything uncertain is passed through rather than rejected.
+
+With SQL_PREFLIGHT_EXPLAIN on, the query is also EXPLAINed (one cheap
+round-trip, no data read) and rejected when the optimizer's estimated time or
+row count exceeds the limits, or when Teradata reports an error.
+
+The layer sits innermost in the tool chain, so query-cache hits and
+table-mirror answers skip it.
+
+Configuration via environment variables:
+- SQL_PREFLIGHT: "true" (default) or "false"
+- SQL_PREFLIGHT_EXPLAIN: "false" (default) or "true"
+- SQL_PREFLIGHT_MAX_SECONDS: Largest EXPLAIN total estimated time (default 120)
+- SQL_PREFLIGHT_MAX_ROWS: Largest EXPLAIN row estimate of any step (default 50000000)
+"""
+
+import asyncio
+import difflib
+import logging
+import os
+import re
+
+from teradata_tools import QUERY_TOOL, ToolProxy, call_tool, result_rows
+
+logger = logging.getLogger(__name__)
+
+# String literals and comments, replaced before tokenizing
+_LITERALS = re.compile(r"'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/", re.S)
+_QUOTED = re.compile(r'"((?:[^"]|"")*)"')
+_TOKEN = re.compile(r"[A-Za-z_#$][\w#$]*(?:\s*\.\s*(?:[A-Za-z_#$][\w#$]*|\*))*|\d+(?:\.\d+)?(?:[eE][-+]?\d+)?|<>|<=|>=|\|\||\S")
+
+KEYWORDS = set("""
+SELECT SEL FROM WHERE GROUP BY ORDER HAVING QUALIFY AND OR NOT IN IS NULL AS ON USING JOIN INNER LEFT RIGHT
+FULL OUTER CROSS UNION INTERSECT MINUS EXCEPT ALL DISTINCT TOP PERCENT WITH TIES SAMPLE CASE WHEN THEN ELSE END
+BETWEEN LIKE ESCAPE ASC DESC NULLS FIRST LAST OVER PARTITION ROWS RANGE UNBOUNDED PRECEDING FOLLOWING CURRENT
+ROW EXISTS ANY SOME TRUE FALSE INTERVAL YEAR MONTH DAY HOUR MINUTE SECOND TIME ZONE AT LOCAL FORMAT TITLE
+CHARACTER CHARACTERS CHAR VARCHAR INTEGER INT BYTEINT SMALLINT BIGINT DECIMAL NUMERIC NUMBER FLOAT REAL DOUBLE
+PRECISION DATE TIMESTAMP CURRENT_DATE CURRENT_TIME CURRENT_TIMESTAMP USER DATABASE FOR BOTH LEADING TRAILING
+CASESPECIFIC CS LATIN UNICODE RECURSIVE LIMIT OFFSET FETCH NEXT ONLY MOD SET
+""".split())
+
+AGGREGATES = {"COUNT", "SUM", "AVG", "AVERAGE", "MIN", "MINIMUM", "MAX", "MAXIMUM", "STDDEV_POP", "STDDEV_SAMP",
+              "VAR_POP", "VAR_SAMP", "CORR", "COVAR_POP", "COVAR_SAMP", "REGR_SLOPE", "REGR_INTERCEPT"}
+
+_JOIN_WORDS = {"INNER", "LEFT", "RIGHT", "FULL", "OUTER", "CROSS"}
+
+_CLAUSES = ("FROM", "WHERE", "GROUP", "HAVING", "QUALIFY", "ORDER", "SAMPLE")
+
+_EXPLAIN_ROWS = re.compile(r"to be (?:about )?([\d,]+) rows", re.I)
+_EXPLAIN_TIME = re.compile(r"total estimated time is ([^.]*(?:\.\d+[^.]*)?)", re.I)
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(hour|minute|second)", re.I)
+_CLOCK = re.compile(r"(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+class PreflightRejected(ValueError):
+    """A query that would fail or is too expensive, with the reason"""
+
+
+def tokenize(sql):
+    """Tokens of a statement; literals become '?' and quoted identifiers plain names"""
+    sql = _LITERALS.sub(lambda m: " " if m.group(0)[0] in "-/" else " '?' ", sql)
+    sql = _QUOTED.sub(lambda m: m.group(1) if re.fullmatch(r"[A-Za-z_#$][\w#$]*", m.group(1)) else "?", sql)
+    tokens = []
+    for token in _TOKEN.findall(sql.replace("'?'", " ? ")):
+        tokens.append(re.sub(r"\s+", "", token))
+    return tokens
+
+
+def is_name(token):
+    return bool(re.match(r"[A-Za-z_#$]", token)) and token.upper() not in KEYWORDS
+
+
+def split_top(tokens, separators):
+    """Split tokens at depth 0 on any token in `separators` (upper-case)"""
+    parts, current, depth = [], [], 0
+    for token in tokens:
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        if depth == 0 and token.upper() in separators:
+            parts.append(current)
+            current = []
+            continue
+        current.append(token)
+    parts.append(current)
+    return parts
+
+
+def clauses(tokens):
+    """{clause: tokens} of a single SELECT, split at depth 0; None if not one plain SELECT"""
+    if not tokens or tokens[0].upper() not in ("SELECT", "SEL"):
+        return None
+    found, depth, current = {"SELECT": []}, 0, "SELECT"
+    index = 1
+    while index < len(tokens):
+        token, upper = tokens[index], tokens[index].upper()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        if depth == 0 and upper in _CLAUSES:
+            current = upper
+            found[current] = []
+            if upper in ("GROUP", "ORDER") and index + 1 < len(tokens) and tokens[index + 1].upper() == "BY":
+                index += 1
+        elif depth == 0 and upper in ("UNION", "INTERSECT", "MINUS", "EXCEPT"):
+            return None
+        else:
+            found[current].append(token)
+        index += 1
+    return found
+
+
+def select_items(select_tokens):
+    """SELECT list items, without DISTINCT / TOP n [PERCENT] [WITH TIES]"""
+    tokens = list(select_tokens)
+    while tokens and tokens[0].upper() in ("DISTINCT", "ALL"):
+        tokens = tokens[1:]
+    if tokens and tokens[0].upper() == "TOP":
+        tokens = tokens[2:]
+        while tokens and tokens[0].upper() in ("PERCENT", "WITH", "TIES"):
+            tokens = tokens[1:]
+    return [item for item in split_top(tokens, {","}) if item]
+
+
+def item_alias(item):
+    """(expression tokens, alias or None) of a SELECT item"""
+    if len(item) >= 3 and item[-2].upper() == "AS" and is_name(item[-1]):
+        return item[:-2], item[-1]
+    if len(item) >= 2 and is_name(item[-1]) and "." not in item[-1] and (item[-2] == ")" or is_name(item[-2])
+                                                                          or item[-2] == "?" or item[-2][0].isdigit()):
+        return item[:-1], item[-1]
+    return item, None
+
+
+def table_refs(from_tokens):
+    """[(name, alias, joined_by, condition tokens)] of a FROM clause.
+    joined_by is None for the first table, then ",", "JOIN" or "CROSS"."""
+    segments, current, separator, depth = [], [], None, 0
+    for token in from_tokens:
+        upper = token.upper()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        if depth == 0 and upper in (",", "JOIN"):
+            kind = ","
+            if upper == "JOIN":
+                kind = "CROSS" if "CROSS" in (t.upper() for t in current[-2:]) else "JOIN"
+                while current and current[-1].upper() in _JOIN_WORDS:
+                    current.pop()
+            segments.append((separator, current))
+            current, separator = [], kind
+            continue
+        current.append(token)
+    segments.append((separator, current))
+
+    refs = []
+    for separator, segment in segments:
+        condition = []
+        for i, token in enumerate(segment):
+            if token.upper() in ("ON", "USING"):
+                segment, condition = segment[:i], segment[i + 1:]
+                break
+        if not segment or segment[0] == "(":
+            continue
+        rest = [t for t in segment[1:] if t.upper() != "AS"]
+        refs.append((segment[0], rest[0] if rest and is_name(rest[0]) else None, separator, condition))
+    return refs
+
+
+def function_froms(tokens):
+    """Indexes of FROM keywords inside function calls (EXTRACT(YEAR FROM x), TRIM(... FROM x))"""
+    inside, stack = set(), []
+    for i, token in enumerate(tokens):
+        if token == "(":
+            stack.append(i > 0 and is_name(tokens[i - 1]))
+        elif token == ")" and stack:
+            stack.pop()
+        elif token.upper() == "FROM" and stack and stack[-1]:
+            inside.add(i)
+    return inside
+
+
+def parse_explain(text):
+    """(total estimated seconds or None, largest row estimate or None) of EXPLAIN text"""
+    rows = [int(n.replace(",", "")) for n in _EXPLAIN_ROWS.findall(text)]
+    seconds = None
+    total = _EXPLAIN_TIME.search(text)
+    if total:
+        clock = _CLOCK.search(total.group(1))
+        if clock:
+            seconds = int(clock.group(1)) * 3600 + int(clock.group(2)) * 60 + float(clock.group(3))
+        else:
+            units = {"hour": 3600, "minute": 60, "second": 1}
+            seconds = sum(float(n) * units[u.lower()] for n, u in _DURATION.findall(total.group(1))) or None
+    return seconds, max(rows) if rows else None
+
+
+class SQLPreflight:
+    """Local schema, GROUP BY and join checks, plus an optional EXPLAIN cost limit"""
+
+    def __init__(self, catalog, pool=None, enabled=None, explain=None, max_seconds=None, max_rows=None):
+        self.catalog = catalog
+        self.pool = pool
+        if enabled is None:
+            enabled = os.getenv("SQL_PREFLIGHT", "true").lower() in ("true", "1", "yes")
+        if explain is None:
+            explain = os.getenv("SQL_PREFLIGHT_EXPLAIN", "false").lower() in ("true", "1", "yes")
+        self.enabled = enabled
+        self.explain = explain and pool is not None
+        self.max_seconds = max_seconds or float(os.getenv("SQL_PREFLIGHT_MAX_SECONDS", "120"))
+        self.max_rows = max_rows or int(os.getenv("SQL_PREFLIGHT_MAX_ROWS", "50000000"))
+        self.checked = 0
+        self.rejected = 0
+
+    def wrap(self, tool):
+        """Tool layer: preflight the Teradata query tool"""
+        if tool.tool_name == QUERY_TOOL and self.enabled:
+            return PreflightQueryTool(tool, self)
+        return tool
+
+    def check(self, sql):
+        """Raise PreflightRejected for a query that should not be sent"""
+        self.checked += 1
+        problems = self.problems(sql)
+        if not problems and self.explain:
+            problems = self.explain_problems(sql)
+        if problems:
+            self.rejected += 1
+            raise PreflightRejected("; ".join(problems))
+
+    # -- Static checks -----------------------------------------------------
+
+    def tables(self):
+        """{table name (lower): (database, table, {column (lower): column})} of the catalog"""
+        tables = {}
+        for database, entries in (self.catalog.schema() or {}).items():
+            for table, columns in entries.items():
+                entry = (database, table, {name.lower(): name for name, _ in columns})
+                tables.setdefault(table.lower(), entry)
+                tables[f"{database}.{table}".lower()] = entry
+        return tables
+
+    def problems(self, sql):
+        try:
+            catalog = self.tables()
+        except Exception as e:
+            logger.warning("Preflight skipped, schema catalog unavailable: %s", e)
+            return []
+        if not catalog:
+            return []
+        tokens = tokenize(sql)
+        problems = unknown_tables(tokens, catalog)
+        parts = clauses(tokens)
+        if problems or parts is None or "FROM" not in parts or sum(t.upper() in ("SELECT", "SEL") for t in tokens) > 1:
+            return problems
+
+        refs = table_refs(parts["FROM"])
+        tables = {}  # name or alias (lower) -> catalog entry or None
+        for name, alias, _, _ in refs:
+            entry = catalog.get(name.lower())
+            for key in filter(None, (alias, name, name.rsplit(".", 1)[-1])):
+                tables[key.lower()] = entry
+        items = select_items(parts["SELECT"])
+        problems += join_problems(refs, parts.get("WHERE", []), catalog)
+        problems += column_problems(parts, refs, tables, items, tokens)
+        problems += group_by_problems(items, parts.get("GROUP"))
+        return list(dict.fromkeys(problems))
+
+    # -- EXPLAIN -----------------------------------------------------------
+
+    def explain_problems(self, sql):
+        try:
+            rows = result_rows(call_tool(self.pool, QUERY_TOOL, {"sql": f"EXPLAIN {sql}"}))
+        except Exception as e:
+            message = str(e)
+            if "Failure" in message or "Error" in message or "error" in message:
+                return [f"Teradata rejected the query: {message[:300]}"]
+            logger.warning("EXPLAIN preflight skipped: %s", e)
+            return []
+        text = " ".join(str(value) for row in rows for value in row.values())
+        seconds, estimated_rows = parse_explain(text)
+        problems = []
+        if seconds is not None and seconds > self.max_seconds:
+            problems.append(f"estimated to run {seconds:,.0f}s (limit {self.max_seconds:,.0f}s); "
+                            "filter earlier, aggregate, or narrow the join")
+        if estimated_rows is not None and estimated_rows > self.max_rows:
+            problems.append(f"a step is estimated at {estimated_rows:,} rows (limit {self.max_rows:,}); "
+                            "add selective WHERE conditions or aggregate before joining")
+        return problems
+
+
+def unknown_tables(tokens, catalog):
+    """FROM / JOIN tables of cataloged databases that the catalog does not have"""
+    databases = {entry[0].lower() for entry in catalog.values()}
+    ctes = {tokens[i - 1].lower() for i, t in enumerate(tokens[:-1])
+            if i > 0 and t.upper() == "AS" and tokens[i + 1] == "("}
+    skip = function_froms(tokens)
+    problems = []
+    for i, token in enumerate(tokens[:-1]):
+        if token.upper() not in ("FROM", "JOIN") or i in skip:
+            continue
+        name = tokens[i + 1]
+        if not is_name(name) or name.lower() in ctes or name.lower() in catalog:
+            continue
+        if "." in name and name.rsplit(".", 1)[0].lower() not in databases:
+            continue  # a database the catalog does not cover (e.g. DBC)
+        table = name.rsplit(".", 1)[-1]
+        problems.append(f"unknown table {name}{_suggest(table, [entry[1] for entry in catalog.values()])}")
+    return problems
+
+
+def join_problems(refs, where_tokens, catalog):
+    """Cartesian products: CROSS JOIN, or comma-separated tables not linked by an equality"""
+    problems = []
+    if any(joined_by == "CROSS" for _, _, joined_by, _ in refs):
+        problems.append("CROSS JOIN builds a Cartesian product; join the tables ON matching keys instead")
+    if not any(joined_by == "," for _, _, joined_by, _ in refs):
+        return problems
+
+    keys = [(alias or name).lower() for name, alias, _, _ in refs]
+    group = {key: {key} for key in keys}
+
+    def link(a, b):
+        if a and b and a != b and group[a] is not group[b]:
+            merged = group[a] | group[b]
+            for key in merged:
+                group[key] = merged
+
+    def owner(token):
+        if "." in token:
+            qualifier = token.rsplit(".", 1)[0].lower()
+            for key, (name, alias, _, _) in zip(keys, refs):
+                if qualifier in {(alias or "").lower(), name.lower(), name.rsplit(".", 1)[-1].lower()}:
+                    return key
+            return None
+        owners = [key for key, (name, _, _, _) in zip(keys, refs)
+                  if token.lower() in (catalog.get(name.lower()) or (None, None, {}))[2]]
+        return owners[0] if len(owners) == 1 else None
+
+    conditions = [where_tokens] + [condition for _, _, _, condition in refs]
+    for index, (_, _, joined_by, condition) in enumerate(refs):
+        if joined_by == "JOIN" and condition and index:
+            link(keys[index - 1], keys[index])
+    for condition in conditions:
+        for i in range(1, len(condition) - 1):
+            if condition[i] != "=" or not (is_name(condition[i - 1]) and is_name(condition[i + 1])):
+                continue
+            a, b = owner(condition[i - 1]), owner(condition[i + 1])
+            if a is None or b is None:
+                return problems  # cannot tell which tables are compared: do not guess
+            link(a, b)
+    if len({id(g) for g in group.values()}) > 1:
+        names = ", ".join(alias or name for name, alias, _, _ in refs)
+        problems.append(f"tables {names} are not all joined - add join conditions "
+                        "(WHERE a.key = b.key or JOIN ... ON) to avoid a Cartesian product")
+    return problems
+
+
+def column_problems(parts, refs, tables, items, tokens):
+    """Unknown qualified and unqualified columns of a single SELECT"""
+    known = [entry for entry in tables.values() if entry is not None]
+    all_known = all(entry is not None for entry in tables.values())
+    columns = {}
+    for entry in known:
+        columns.update(entry[2])
+    outputs = {alias.lower() for alias in (item_alias(item)[1] for item in items) if alias}
+    outputs |= {tokens[i + 1].lower() for i, t in enumerate(tokens[:-1]) if t.upper() == "AS"}
+    table_names = {key for key in tables} | {name.lower() for name, _, _, _ in refs}
+
+    problems = []
+    for clause_tokens in parts.values():
+        for i, token in enumerate(clause_tokens):
+            if not is_name(token) or token.lower() in table_names:
+                continue
+            if i + 1 < len(clause_tokens) and clause_tokens[i + 1] == "(":
+                continue  # function call
+            if "." in token:
+                qualifier, column = token.rsplit(".", 1)
+                if qualifier.lower() not in tables:
+                    if all_known:
+                        problems.append(f"unknown table or alias {qualifier} in {token}")
+                    continue
+                entry = tables[qualifier.lower()]
+                if entry is not None and column != "*" and column.lower() not in entry[2]:
+                    problems.append(f"unknown column {column} in {entry[1]}{_suggest(column, entry[2].values())}")
+            elif all_known and known and token.lower() not in columns and token.lower() not in outputs:
+                problems.append(f"unknown column {token}{_suggest(token, columns.values())}")
+    return problems
+
+
+def group_by_problems(items, group_tokens):
+    """Plain columns selected next to aggregates without being grouped"""
+    aggregated, plain = False, []
+    for item in items:
+        expression, alias = item_alias(item)
+        upper = [t.upper() for t in expression]
+        if "OVER" in upper:
+            return []
+        if any(t in AGGREGATES and i + 1 < len(upper) and upper[i + 1] == "(" for i, t in enumerate(upper)):
+            aggregated = True
+        elif len(expression) == 1 and is_name(expression[0]) and not expression[0].endswith("*"):
+            plain.append((expression[0], alias))
+    if not aggregated or not plain:
+        return []
+    if group_tokens is None:
+        return [f"{', '.join(c for c, _ in plain)} must be in GROUP BY (or inside an aggregate) "
+                "when selected with aggregates"]
+    grouped = [t for t in group_tokens if t not in (",", "(", ")")]
+    if any(t[0].isdigit() for t in grouped) or any(t.upper() in ("ROLLUP", "CUBE", "GROUPING") for t in grouped):
+        return []
+    grouped = {t.rsplit(".", 1)[-1].lower() for t in grouped}
+    # Teradata also groups by an item's output alias
+    missing = [column for column, alias in plain
+               if column.rsplit(".", 1)[-1].lower() not in grouped and (alias or "").lower() not in grouped]
+    if missing:
+        return [f"{', '.join(missing)} must be in GROUP BY (or inside an aggregate)"]
+    return []
+
+
+def _suggest(name, candidates):
+    match = difflib.get_close_matches(name, list(candidates), n=1, cutoff=0.6)
+    if not match:
+        match = difflib.get_close_matches(name.lower(), [c.lower() for c in candidates], n=1, cutoff=0.6)
+        match = [c for c in candidates if c.lower() in match]
+    return f" (did you mean {match[0]}?)" if match else ""
+
+
+class PreflightQueryTool(ToolProxy):
+    """base_readQuery that rejects failing or too expensive SQL before it runs"""
+
+    def __init__(self, inner, preflight):
+        super().__init__(inner)
+        self.preflight = preflight
+
+    async def call(self, tool_use, invocation_state):
+        sql = tool_use["input"].get("sql") or ""
+        try:
+            await asyncio.to_thread(self.preflight.check, sql)
+        except PreflightRejected as e:
+            logger.info("Preflight rejected query: %s", e)
+            return {
+                "toolUseId": tool_use["toolUseId"],
+                "status": "error",
+                "content": [{"text": f"Query rejected before running: {e}. Fix the SQL and try again."}],
+            }
+        return await self.inner.call(tool_use, invocation_state)
@@ -0,0 +1,180 @@
+"""
+Startup
+Fast container start for the AgentCore entrypoints.
+
+Importing the runtime stack (strands, mcp, boto3, the Bedrock model clients, see
+banking_runtime.py) takes longer than everything the HTTP server needs to come
+up. The entrypoints therefore import only this module and bedrock_agentcore:
+the server starts listening right away while banking_runtime is imported and
+warmed up in a background thread (MCP sessions, tool discovery, schema). A
+request that arrives earlier waits for the runtime instead of the container
+failing its first health check, and reports the wait as
+timings["runtime_wait_ms"]. If the import fails, /ping answers 503 "Unhealthy"
+so the container is replaced instead of failing every request.
+
+Startup timings (milliseconds since this module was imported) are logged once
+the runtime is warm and kept in `timings`:
+- app_ready_ms: server app created, ready to listen
+- runtime_import_ms: banking_runtime imported (models and pools constructed)
+- mcp_pool_ready_ms: every pooled MCP session started
+- tools_ready_ms: MCP tools discovered and schema loaded
+
+Configuration via environment variables:
+- LAZY_STARTUP: "true" (default) to import the runtime in the background,
+  "false" to import it before the server starts
+- STARTUP_WARM_UP_TIMEOUT: Seconds to wait for the MCP pool during warm-up (default 120)
+"""
+
+import time
+
+STARTED = time.perf_counter()
+
+import asyncio
+import contextlib
+import contextvars
+import importlib
+import json
+import logging
+import os
+import threading
+
+from bedrock_agentcore.runtime import BedrockAgentCoreApp, PingStatus
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+logger = logging.getLogger(__name__)
+
+timings = {}
+
+# Time the current request waited for the runtime to load, if it did
+runtime_wait = contextvars.ContextVar("runtime_wait", default=None)
+
+
+def mark(name):
+    timings[name] = round((time.perf_counter() - STARTED) * 1000, 1)
+
+
+class RuntimeLoader:
+    """Imports banking_runtime once, in a background thread"""
+
+    def __init__(self, module="banking_runtime"):
+        self.module = module
+        self.runtime = None
+        self.error = None
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self.load, daemon=True).start()
+
+    def load(self):
+        try:
+            self.runtime = importlib.import_module(self.module)
+            mark("runtime_import_ms")
+        except BaseException as e:
+            logger.exception("Runtime import failed")
+            self.error = e
+        finally:
+            self._loaded.set()
+
+    @property
+    def loaded(self):
+        return self._loaded.is_set()
+
+    def get(self):
+        """The runtime module, importing it in this thread if needed"""
+        self.start()
+        self._loaded.wait()
+        if self.error is not None:
+            raise RuntimeError(f"Runtime failed to start: {self.error}") from self.error
+        return self.runtime
+
+    async def get_async(self):
+        if not self.loaded:
+            started = time.perf_counter()
+            await asyncio.to_thread(self.get)
+            runtime_wait.set(round((time.perf_counter() - started) * 1000, 1))
+        return self.get()
+
+
+loader = RuntimeLoader()
+
+
+def warm_up(runtime):
+    """Block until the MCP pool and tools are ready, then log the startup timings"""
+    try:
+        runtime.mcp_pool.warm_up(timeout=float(os.getenv("STARTUP_WARM_UP_TIMEOUT", "120")))
+        mark("mcp_pool_ready_ms")
+        runtime.base_factory.tools()
+        runtime.schema_catalog.schema()
+        mark("tools_ready_ms")
+    except Exception as e:
+        logger.error("Runtime warm-up failed: %s", e)
+    logger.info("Startup timings: %s", json.dumps(timings))
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    """Enter the runtime's lifespan once it is imported, without holding up the server"""
+    stack = contextlib.AsyncExitStack()
+
+    async def start_runtime():
+        runtime = await loader.get_async()
+        await stack.enter_async_context(runtime.lifespan(app))
+        threading.Thread(target=warm_up, args=(runtime,), daemon=True).start()
+
+    task = asyncio.create_task(start_runtime())
+    try:
+        yield
+    finally:
+        if not task.done():
+            task.cancel()
+        with contextlib.suppress(BaseException):
+            await task
+        await stack.aclose()
+
+
+def create_app():
+    """BedrockAgentCoreApp that listens first and loads the runtime in the background"""
+    app = BedrockAgentCoreApp(lifespan=lifespan)
+    if os.getenv("LAZY_STARTUP", "true").lower() not in ("true", "1", "yes"):
+        loader.get()
+    mark("app_ready_ms")
+
+    @app.ping
+    def ping():
+        if loader.loaded and loader.runtime is not None and loader.runtime.limiter.busy:
+            return PingStatus.HEALTHY_BUSY
+        return PingStatus.HEALTHY
+
+    def health(request):
+        # PingStatus has no unhealthy state (a raising handler is reported healthy), so fail the route
+        if loader.error is not None:
+            return JSONResponse({"status": "Unhealthy", "error": f"Runtime failed to start: {loader.error}"},
+                                status_code=503)
+        return app._handle_ping(request)
+
+    app.router.routes.insert(0, Route("/ping", health, methods=["GET"]))
+
+    return app
+
+
+async def route(payload, session_id=None):
+    """banking_runtime.route: the persona for a request"""
+    runtime = await loader.get_async()
+    return await runtime.route(payload, session_id)
+
+
+async def handle(persona, payload, session_id=None):
+    """banking_runtime.handle, once the runtime is loaded"""
+    runtime = await loader.get_async()
+    response = await runtime.handle(persona, payload, session_id)
+    waited = runtime_wait.get()
+    if waited is not None and isinstance(response, dict) and isinstance(response.get("timings"), dict):
+        response["timings"]["runtime_wait_ms"] = waited
+    return response
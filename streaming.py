@@ -0,0 +1,75 @@
+"""
+Streaming Responses
+Turns a Strands agent run into a compact stream of JSON events that
+BedrockAgentCoreApp sends to the caller as server-sent events.
+
+An entrypoint opts in by returning stream_response(...) instead of a dict:
+BedrockAgentCoreApp streams any async generator it gets back from a handler.
+
+Event shapes:
+- {"type": "text", "data": "..."}                                  model tokens
+- {"type": "tool_use", "toolUseId": "...", "name": "...", "input": {...}}
+- {"type": "tool_result", "toolUseId": "...", "status": "success" | "error"}
+- {"type": "done", "response": {...}, "stop_reason": "...", "usage": {...}, "timings": {...}}
+- {"type": "error", "error": "..."}
+"""
+
+import logging
+
+from prompt_cache import usage_summary
+
+logger = logging.getLogger(__name__)
+
+
+async def stream_response(agent, prompt, request_trace=None):
+    """Yield JSON-serializable progress events while `agent` answers `prompt`.
+    With a RequestTrace (see tracing.py), the done event carries its timing summary."""
+    try:
+        async for event in agent.stream_async(prompt):
+            if "data" in event:
+                yield {"type": "text", "data": event["data"]}
+            elif "message" in event:
+                for item in stream_message_events(event["message"]):
+                    yield item
+            elif "result" in event:
+                result = event["result"]
+                yield {
+                    "type": "done",
+                    "response": result.message,
+                    "stop_reason": result.stop_reason,
+                    "usage": usage_summary(result),
+                    "timings": request_trace.summary() if request_trace else {},
+                }
+    except Exception as e:
+        logger.exception("Streaming invocation failed")
+        yield {"type": "error", "error": str(e)}
+
+
+def stream_message_events(message):
+    """Tool progress events for a completed assistant or tool-result message"""
+    events = []
+    for content in message.get("content", []):
+        if "toolUse" in content:
+            tool_use = content["toolUse"]
+            events.append({
+                "type": "tool_use",
+                "toolUseId": tool_use["toolUseId"],
+                "name": tool_use["name"],
+                "input": tool_use.get("input"),
+            })
+        elif "toolResult" in content:
+            tool_result = content["toolResult"]
+            events.append({
+                "type": "tool_result",
+                "toolUseId": tool_result["toolUseId"],
+                "status": tool_result.get("status", "success"),
+            })
+    return events
+
+
+async def stream_answer(response):
+    """Events for an answer that is already complete (e.g. from fast_path.py)"""
+    for content in response["response"].get("content", []):
+        if "text" in content:
+            yield {"type": "text", "data": content["text"]}
+    yield {"type": "done", "stop_reason": "end_turn", **response}
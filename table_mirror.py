@@ -0,0 +1,656 @@
+"""
+Table Mirror
+Optional local, memory-mapped columnar copy of frequently scanned Teradata tables.
+
+Each table listed in MIRROR_TABLES is exported once in key-ordered chunks
+(SELECT TOP n ... WHERE key > last ORDER BY key), streamed chunk by chunk into one
+file per column under MIRROR_DIR:
+- numeric columns as float64 (.f8, NULL = NaN)
+- text columns dictionary-encoded as int32 codes (.i4, NULL = -1)
+plus a manifest.json with row count, last key, dictionaries and refresh time.
+
+Refreshes are incremental: rows with a key above the mirrored maximum are appended.
+When Teradata reports fewer rows than expected (deletes) or every
+MIRROR_FULL_REFRESH_INTERVAL seconds, the table is re-exported into a fresh directory
+and the table's symlink is flipped to it atomically; the previous export is kept
+until the next one so readers still opening its files are not cut off. Updates
+to existing rows are only picked up by full refreshes.
+
+Simple read-only aggregates on a mirrored table are answered locally through
+the base_readQuery tool (see MirroredQueryTool):
+
+    SELECT [TOP n] col, ..., COUNT(*) | COUNT/SUM/AVG/MIN/MAX(col) [AS name], ...
+    FROM table [WHERE col op literal [AND ...]] [GROUP BY ...] [ORDER BY ...]
+
+with =, <>, <, <=, >, >=, IN, BETWEEN and IS [NOT] NULL conditions. Any other
+query goes to Teradata unchanged.
+
+Configuration via environment variables:
+- MIRROR_TABLES: Tables to mirror with their numeric key column,
+  e.g. "demo_user.Churn_Modelling=RowNumber" (mirror mode is off when unset)
+- MIRROR_DIR: Directory for the column files (default .mirror)
+- MIRROR_CHUNK_ROWS: Rows per export query (default 5000)
+- MIRROR_REFRESH_INTERVAL: Seconds between incremental refreshes (default 3600)
+- MIRROR_FULL_REFRESH_INTERVAL: Seconds between full re-exports (default 86400)
+"""
+
+import contextlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from result_encoding import compact_value
+from teradata_tools import QUERY_TOOL, ToolProxy, call_tool, result_rows
+
+logger = logging.getLogger(__name__)
+
+NUMERIC = "num"
+TEXT = "text"
+
+
+def parse_tables(spec):
+    """{table: key column} from "db.table=key,db.other=key" """
+    tables = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if item:
+            table, _, key = item.partition("=")
+            tables[table.strip()] = key.strip() or None
+    return tables
+
+
+class MirroredTable:
+    """Read-only view of one mirrored table's column files"""
+
+    def __init__(self, directory, manifest):
+        # Pinned to the export read, not the symlink a full refresh flips
+        self.directory = os.path.realpath(directory)
+        self.manifest = manifest
+        self.rows = manifest["rows"]
+        self.kinds = {c["name"]: c["kind"] for c in manifest["columns"]}
+        self.dictionaries = {c["name"]: c.get("dictionary", []) for c in manifest["columns"]}
+        self._names = {name.lower(): name for name in self.kinds}
+        self._arrays = {}
+
+    def column_name(self, name):
+        """Stored spelling of a column name (case-insensitive), or None"""
+        return self._names.get(name.strip('"').lower())
+
+    def array(self, name):
+        """Memory-mapped values (float64) or dictionary codes (int32) of a column"""
+        array = self._arrays.get(name)
+        if array is None:
+            kind = self.kinds[name]
+            path = os.path.join(self.directory, f"{name}.{'f8' if kind == NUMERIC else 'i4'}")
+            dtype = np.float64 if kind == NUMERIC else np.int32
+            if self.rows:
+                array = np.memmap(path, dtype=dtype, mode="r", shape=(self.rows,))
+            else:
+                array = np.empty(0, dtype=dtype)
+            self._arrays[name] = array
+        return array
+
+    def values(self, name):
+        """Column values, with text decoded to an object array ("" for NULL)"""
+        array = self.array(name)
+        if self.kinds[name] == NUMERIC:
+            return np.asarray(array)
+        dictionary = np.array(self.dictionaries[name] + [""], dtype=object)
+        return dictionary[array]
+
+
+class TableMirror:
+    """Chunked export, incremental refresh and local reads of mirrored tables"""
+
+    def __init__(self, pool, tables=None, directory=None, chunk_rows=None,
+                 refresh_interval=None, full_refresh_interval=None):
+        self.pool = pool
+        if tables is None:
+            tables = parse_tables(os.getenv("MIRROR_TABLES", ""))
+        self.tables = tables
+        self.directory = directory or os.getenv("MIRROR_DIR", ".mirror")
+        self.chunk_rows = chunk_rows or int(os.getenv("MIRROR_CHUNK_ROWS", "5000"))
+        self.refresh_interval = refresh_interval or float(os.getenv("MIRROR_REFRESH_INTERVAL", "3600"))
+        self.full_refresh_interval = full_refresh_interval or float(
+            os.getenv("MIRROR_FULL_REFRESH_INTERVAL", "86400"))
+
+        self._views = {}  # table -> (manifest mtime, MirroredTable)
+        self._locks = {table: threading.Lock() for table in tables}
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self):
+        return bool(self.tables)
+
+    def _path(self, table, suffix=""):
+        return os.path.join(self.directory, re.sub(r"[^\w.]", "_", table.lower()) + suffix)
+
+    # -- Export ------------------------------------------------------------
+
+    def _query(self, sql):
+        return result_rows(call_tool(self.pool, QUERY_TOOL, {"sql": sql}))
+
+    def _chunks(self, table, key, after=None):
+        """Rows of `table` in key order, one export query per chunk"""
+        if key is None:
+            yield self._query(f"SELECT * FROM {table}")
+            return
+        while True:
+            where = f" WHERE {key} > {_sql_literal(after)}" if after is not None else ""
+            rows = self._query(f"SELECT TOP {self.chunk_rows} * FROM {table}{where} ORDER BY {key}")
+            if not rows:
+                return
+            yield rows
+            if len(rows) < self.chunk_rows:
+                return
+            after = compact_value(rows[-1][key])
+
+    def _append(self, directory, manifest, rows):
+        """Append a chunk of rows to the column files and update the manifest"""
+        if not manifest["columns"]:
+            manifest["columns"] = [{"name": name, "kind": _kind(rows, name)} for name in rows[0]]
+        for column in manifest["columns"]:
+            name = column["name"]
+            values = [row.get(name) for row in rows]
+            if column["kind"] == NUMERIC:
+                data = np.array([_to_float(v) for v in values], dtype=np.float64)
+                suffix = "f8"
+            else:
+                dictionary = column.setdefault("dictionary", [])
+                index = column.setdefault("_index", {v: i for i, v in enumerate(dictionary)})
+                codes = []
+                for value in values:
+                    if value is None:
+                        codes.append(-1)
+                        continue
+                    value = str(value).rstrip()
+                    if value not in index:
+                        index[value] = len(dictionary)
+                        dictionary.append(value)
+                    codes.append(index[value])
+                data = np.array(codes, dtype=np.int32)
+                suffix = "i4"
+            with open(os.path.join(directory, f"{name}.{suffix}"), "ab") as f:
+                data.tofile(f)
+        manifest["rows"] += len(rows)
+        key = manifest["key"]
+        if key is not None:
+            manifest["max_key"] = compact_value(rows[-1][key])
+
+    def _truncate(self, directory, manifest):
+        """Cut the column files back to the manifest's rows, dropping chunks of a refresh that failed midway"""
+        for column in manifest["columns"]:
+            suffix, itemsize = ("f8", 8) if column["kind"] == NUMERIC else ("i4", 4)
+            with open(os.path.join(directory, f"{column['name']}.{suffix}"), "r+b") as f:
+                f.truncate(manifest["rows"] * itemsize)
+
+    def _write_manifest(self, directory, manifest):
+        manifest = dict(manifest, columns=[
+            {k: v for k, v in column.items() if not k.startswith("_")} for column in manifest["columns"]
+        ])
+        tmp = os.path.join(directory, "manifest.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, os.path.join(directory, "manifest.json"))
+
+    def export(self, table):
+        """Full export of `table` into a fresh directory that replaces the current mirror"""
+        started = time.monotonic()
+        key = self.tables[table]
+        final = self._path(table)
+        building = self._path(table, f".v{time.time_ns()}-{os.getpid()}")
+        os.makedirs(building)
+        now = time.time()
+        manifest = {"table": table, "key": key, "columns": [], "rows": 0, "max_key": None,
+                    "exported_at": now, "refreshed_at": now}
+        for rows in self._chunks(table, key):
+            self._append(building, manifest, rows)
+        self._write_manifest(building, manifest)
+
+        self._flip(table, building)
+        logger.info("Mirrored %s: %d rows in %.2fs", table, manifest["rows"], time.monotonic() - started)
+        return manifest["rows"]
+
+    def _flip(self, table, directory):
+        """Point the table's symlink at `directory` and drop exports older than the replaced one"""
+        final = self._path(table)
+        previous = None
+        if os.path.islink(final):
+            previous = os.readlink(final)
+        elif os.path.isdir(final):
+            shutil.rmtree(final)  # Mirror written before exports were versioned
+        link = self._path(table, f".link-{os.getpid()}")
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(link)
+        os.symlink(os.path.basename(directory), link)
+        os.replace(link, final)
+
+        keep = {os.path.basename(directory), previous}
+        prefix = os.path.basename(final) + ".v"
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name not in keep:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def refresh(self, table):
+        """Append new rows of `table`, or re-export it when an incremental refresh is not safe"""
+        with self._locks[table]:
+            manifest = self._load_manifest(table)
+            key = self.tables[table]
+            if (manifest is None or key is None or manifest.get("key") != key
+                    or time.time() - manifest["exported_at"] >= self.full_refresh_interval):
+                return self.export(table)
+
+            counts = self._query(f"SELECT COUNT(*) AS row_count FROM {table} WHERE {key} <= {_sql_literal(manifest['max_key'])}")
+            if counts and int(compact_value(next(iter(counts[0].values())))) != manifest["rows"]:
+                logger.info("Rows of %s were deleted since the last export; re-exporting", table)
+                return self.export(table)
+
+            directory = self._path(table)
+            manifest["columns"] = [dict(c) for c in manifest["columns"]]
+            self._truncate(directory, manifest)
+            appended = 0
+            for rows in self._chunks(table, key, after=manifest["max_key"]):
+                self._append(directory, manifest, rows)
+                appended += len(rows)
+            manifest["refreshed_at"] = time.time()
+            self._write_manifest(directory, manifest)
+            logger.info("Mirror of %s refreshed: %d new rows", table, appended)
+            return appended
+
+    def refresh_all(self):
+        for table in self.tables:
+            try:
+                self.refresh(table)
+            except Exception as e:
+                logger.error("Mirror refresh of %s failed: %s", table, e)
+
+    # -- Schedule ----------------------------------------------------------
+
+    def start(self):
+        """Refresh every mirrored table now and then every refresh_interval seconds"""
+        if not self.enabled or self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="table-mirror", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self):
+        wait = 0
+        while not self._stop.wait(wait):
+            self.refresh_all()
+            wait = self.refresh_interval
+
+    # -- Reads -------------------------------------------------------------
+
+    def _load_manifest(self, table):
+        try:
+            with open(os.path.join(self._path(table), "manifest.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def resolve(self, name):
+        """Mirrored table name matching `name` (qualified or not), or None"""
+        name = name.replace('"', "").lower()
+        for table in self.tables:
+            if table.lower() == name or table.lower().split(".")[-1] == name:
+                return table
+        return None
+
+    def view(self, table):
+        """Current MirroredTable of a mirrored table, or None before its first export"""
+        path = os.path.join(self._path(table), "manifest.json")
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._views.get(table)
+        if cached is None or cached[0] != mtime:
+            manifest = self._load_manifest(table)
+            if manifest is None:
+                return None
+            cached = self._views[table] = (mtime, MirroredTable(self._path(table), manifest))
+        return cached[1]
+
+    def columns(self, table, names):
+        """{name: array} for the requested columns of a mirrored table, or None"""
+        table = self.resolve(table)
+        view = self.view(table) if table else None
+        if view is None:
+            return None
+        stored = [view.column_name(name) for name in names]
+        if None in stored:
+            return None
+        return {name: view.values(column) for name, column in zip(names, stored)}
+
+    def wrap(self, tool):
+        """Tool layer: answer simple aggregates on mirrored tables locally"""
+        if self.enabled and tool.tool_name == QUERY_TOOL:
+            return MirroredQueryTool(tool, self)
+        return tool
+
+
+# -- Local aggregate queries -------------------------------------------------
+
+_QUERY = re.compile(
+    r"^\s*SEL(?:ECT)?\s+(?:TOP\s+(?P<top>\d+)\s+)?(?P<select>.+?)\s+FROM\s+(?P<table>[\w$#.\"]+)"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?(?:\s+GROUP\s+BY\s+(?P<group>.+?))?"
+    r"(?:\s+ORDER\s+BY\s+(?P<order>.+?))?\s*;?\s*$",
+    re.I | re.S,
+)
+_UNSUPPORTED = re.compile(r"\b(?:JOIN|UNION|INTERSECT|MINUS|EXCEPT|HAVING|QUALIFY|DISTINCT|SAMPLE|SELECT\s.*\bSELECT)\b|--|/\*",
+                          re.I | re.S)
+_IDENT = r'"?(\w+)"?'
+_LITERAL = r"'(?:[^']|'')*'|-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
+_ITEM = re.compile(rf"^(?:(?P<agg>COUNT|SUM|AVG|AVERAGE|MIN|MINIMUM|MAX|MAXIMUM)\s*\(\s*(?P<arg>\*|{_IDENT})\s*\)"
+                   rf"|{_IDENT})(?:\s+(?:AS\s+)?\"?(?P<alias>\w+)\"?)?$", re.I)
+_CONDITION = re.compile(
+    rf"\s*{_IDENT}\s*(?:"
+    rf"(?P<op><>|!=|<=|>=|=|<|>)\s*(?P<value>{_LITERAL})"
+    rf"|(?P<not_in>NOT\s+)?IN\s*\((?P<values>\s*(?:{_LITERAL})(?:\s*,\s*(?:{_LITERAL}))*\s*)\)"
+    rf"|BETWEEN\s+(?P<low>{_LITERAL})\s+AND\s+(?P<high>{_LITERAL})"
+    rf"|(?P<null>IS\s+(?P<not_null>NOT\s+)?NULL))\s*",
+    re.I,
+)
+_AGGREGATES = {"COUNT": "Count", "SUM": "Sum", "AVG": "Average", "AVERAGE": "Average",
+               "MIN": "Minimum", "MINIMUM": "Minimum", "MAX": "Maximum", "MAXIMUM": "Maximum"}
+
+
+class UnsupportedQuery(Exception):
+    """The query is outside what the mirror can answer; send it to Teradata"""
+
+
+def run_local_query(mirror, sql):
+    """Rows answering `sql` from the mirror; raises UnsupportedQuery otherwise"""
+    match = _QUERY.match(sql)
+    if not match or _UNSUPPORTED.search(sql):
+        raise UnsupportedQuery()
+    table = mirror.resolve(match["table"])
+    view = mirror.view(table) if table else None
+    if view is None:
+        raise UnsupportedQuery()
+
+    items = [_parse_item(view, item) for item in _split(match["select"])]
+    mask = _where(view, match["where"]) if match["where"] else np.ones(view.rows, dtype=bool)
+    groups = [_group_column(view, items, g) for g in _split(match["group"])] if match["group"] else []
+    if any(item["column"] and item["column"] not in groups for item in items if not item["agg"]):
+        raise UnsupportedQuery()
+    if not groups and not any(item["agg"] for item in items):
+        raise UnsupportedQuery()  # Plain row selects are left to Teradata
+
+    rows = _aggregate(view, items, groups, mask)
+    if match["order"]:
+        for name, descending in reversed(_order(items, match["order"])):
+            rows.sort(key=lambda row: _sort_key(row[name]), reverse=descending)
+    if match["top"]:
+        rows = rows[:int(match["top"])]
+    return rows
+
+
+def _split(text):
+    """Split on top-level commas"""
+    parts, depth, current = [], 0, ""
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    parts.append(current.strip())
+    return parts
+
+
+def _parse_item(view, text):
+    match = _ITEM.match(text)
+    if not match:
+        raise UnsupportedQuery()
+    if match["agg"]:
+        agg = _AGGREGATES[match["agg"].upper()]
+        column = None if match["arg"] == "*" else view.column_name(match.group(3))
+        if match["arg"] != "*" and column is None:
+            raise UnsupportedQuery()
+        if match["arg"] == "*" and agg != "Count":
+            raise UnsupportedQuery()
+        if agg != "Count" and view.kinds[column] != NUMERIC:
+            raise UnsupportedQuery()
+        name = match["alias"] or f"{agg}({column or '*'})"
+        return {"agg": agg, "column": column, "name": name}
+    column = view.column_name(match.group(4))
+    if column is None:
+        raise UnsupportedQuery()
+    return {"agg": None, "column": column, "name": match["alias"] or column}
+
+
+def _group_column(view, items, text):
+    text = text.strip()
+    if text.isdigit():
+        index = int(text) - 1
+        if not 0 <= index < len(items) or items[index]["agg"]:
+            raise UnsupportedQuery()
+        return items[index]["column"]
+    column = view.column_name(text)
+    if column is None:
+        raise UnsupportedQuery()
+    return column
+
+
+def _where(view, text):
+    mask = np.ones(view.rows, dtype=bool)
+    position = 0
+    while True:
+        match = _CONDITION.match(text, position)
+        if not match:
+            raise UnsupportedQuery()
+        column = view.column_name(match.group(1))
+        if column is None:
+            raise UnsupportedQuery()
+        mask &= _condition(view, column, match)
+        position = match.end()
+        if position == len(text):
+            return mask
+        conjunction = re.compile(r"AND\b", re.I).match(text, position)
+        if not conjunction:
+            raise UnsupportedQuery()
+        position = conjunction.end()
+
+
+def _literal(text):
+    if text.startswith("'"):
+        return text[1:-1].replace("''", "'")
+    return float(text)
+
+
+def _condition(view, column, match):
+    array = view.array(column)
+    numeric = view.kinds[column] == NUMERIC
+    if match["null"]:
+        is_null = np.isnan(array) if numeric else array < 0
+        return ~is_null if match["not_null"] else is_null
+
+    if match["op"]:
+        op, values = match["op"], [_literal(match["value"])]
+    elif match["values"] is not None:
+        op, values = ("NOT IN" if match["not_in"] else "IN"), [_literal(v) for v in _split(match["values"])]
+    else:
+        op, values = "BETWEEN", [_literal(match["low"]), _literal(match["high"])]
+
+    if numeric:
+        if any(isinstance(v, str) for v in values):
+            raise UnsupportedQuery()
+        comparisons = {
+            # NULL (NaN) never satisfies a comparison, and NaN != x is True in numpy
+            "=": lambda: array == values[0],
+            "<>": lambda: (array != values[0]) & ~np.isnan(array), "!=": lambda: (array != values[0]) & ~np.isnan(array),
+            "<": lambda: array < values[0], "<=": lambda: array <= values[0],
+            ">": lambda: array > values[0], ">=": lambda: array >= values[0],
+            "IN": lambda: np.isin(array, values), "NOT IN": lambda: ~np.isin(array, values) & ~np.isnan(array),
+            "BETWEEN": lambda: (array >= values[0]) & (array <= values[1]),
+        }
+        return comparisons[op]()
+
+    # Text: equality and membership only, compared like Teradata (case and trailing blanks ignored)
+    if op not in ("=", "<>", "!=", "IN", "NOT IN") or not all(isinstance(v, str) for v in values):
+        raise UnsupportedQuery()
+    wanted = {v.rstrip().lower() for v in values}
+    codes = [i for i, v in enumerate(view.dictionaries[column]) if v.lower() in wanted]
+    matches = np.isin(array, codes)
+    return matches if op in ("=", "IN") else ~matches & (array >= 0)
+
+
+def _aggregate(view, items, groups, mask):
+    indices = np.flatnonzero(mask)
+    if groups:
+        keys = [np.unique(view.array(g)[indices], return_inverse=True) for g in groups]
+        combined = np.zeros(len(indices), dtype=np.int64)
+        for uniques, inverse in keys:
+            combined = combined * len(uniques) + inverse
+        group_ids, inverse = np.unique(combined, return_inverse=True)
+        count = len(group_ids)
+        # Group key values of each group, recovered from its first row
+        first = np.zeros(count, dtype=np.int64)
+        first[inverse[::-1]] = np.arange(len(inverse))[::-1]
+        key_rows = indices[first]
+    else:
+        inverse = np.zeros(len(indices), dtype=np.int64)
+        count = 1
+        key_rows = None
+
+    columns = {}
+    for item in items:
+        if not item["agg"]:
+            values = view.array(item["column"])[key_rows]
+            columns[item["name"]] = [_output(view, item["column"], v) for v in values]
+            continue
+        if item["column"] is None:
+            columns[item["name"]] = [int(n) for n in np.bincount(inverse, minlength=count)]
+            continue
+        values = view.array(item["column"])[indices]
+        present = ~np.isnan(values) if view.kinds[item["column"]] == NUMERIC else values >= 0
+        counts = np.bincount(inverse, weights=present, minlength=count)
+        if item["agg"] == "Count":
+            columns[item["name"]] = [int(n) for n in counts]
+            continue
+        if item["agg"] in ("Sum", "Average"):
+            sums = np.bincount(inverse, weights=np.where(present, values, 0), minlength=count)
+            result = sums if item["agg"] == "Sum" else sums / np.maximum(counts, 1)
+        else:
+            reduce = np.fmin if item["agg"] == "Minimum" else np.fmax
+            result = np.full(count, np.nan)
+            reduce.at(result, inverse, values)
+        columns[item["name"]] = [None if n == 0 else _number(v) for v, n in zip(result, counts)]
+
+    names = [item["name"] for item in items]
+    rows = [dict(zip(names, values)) for values in zip(*(columns[name] for name in names))]
+    if groups and not rows:
+        return []
+    return rows
+
+
+def _output(view, column, value):
+    if view.kinds[column] == NUMERIC:
+        return None if np.isnan(value) else _number(value)
+    return None if value < 0 else view.dictionaries[column][value]
+
+
+def _order(items, text):
+    names = {item["name"].lower(): item["name"] for item in items}
+    names.update({item["column"].lower(): item["name"] for item in items if item["column"] and not item["agg"]})
+    order = []
+    for part in _split(text):
+        match = re.match(r'^"?(\w+|\w+\([^)]*\))"?(?:\s+(ASC|DESC))?$', part.strip(), re.I)
+        if not match:
+            raise UnsupportedQuery()
+        ref = match[1]
+        if ref.isdigit() and 0 < int(ref) <= len(items):
+            name = items[int(ref) - 1]["name"]
+        elif ref.lower() in names:
+            name = names[ref.lower()]
+        else:
+            raise UnsupportedQuery()
+        order.append((name, (match[2] or "").upper() == "DESC"))
+    return order
+
+
+def _sort_key(value):
+    # NULLs sort first, like Teradata's ascending order
+    return (value is not None, value if value is not None else 0)
+
+
+def _number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def _sql_literal(value):
+    """`value` as a Teradata literal (key values in export queries)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _kind(rows, name):
+    """NUMERIC if every non-NULL value of the column in `rows` is a number"""
+    values = [compact_value(row.get(name)) for row in rows if row.get(name) is not None]
+    return NUMERIC if values and all(_is_number(v) for v in values) else TEXT
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _to_float(value):
+    value = compact_value(value)
+    return float(value) if _is_number(value) else np.nan
+
+
+class MirroredQueryTool(ToolProxy):
+    """base_readQuery that answers supported aggregates from the local mirror"""
+
+    def __init__(self, inner, mirror):
+        super().__init__(inner)
+        self.mirror = mirror
+
+    async def call(self, tool_use, invocation_state):
+        sql = tool_use["input"].get("sql") or ""
+        if tool_use["input"].get("fresh"):
+            return await self.inner.call(tool_use, invocation_state)
+        try:
+            started = time.monotonic()
+            rows = run_local_query(self.mirror, sql)
+        except UnsupportedQuery:
+            return await self.inner.call(tool_use, invocation_state)
+        except Exception as e:
+            logger.warning("Local mirror query failed, using Teradata: %s", e)
+            return await self.inner.call(tool_use, invocation_state)
+
+        table = self.mirror.resolve(_QUERY.match(sql)["table"])
+        refreshed_at = self.mirror.view(table).manifest["refreshed_at"]
+        body = {
+            "status": "success",
+            "results": rows,
+            "metadata": {
+                "tool_name": QUERY_TOOL,
+                "source": "local_mirror",
+                "table": table,
+                "mirrored_at": datetime.fromtimestamp(refreshed_at, timezone.utc).isoformat(timespec="seconds"),
+                "row_count": len(rows),
+                "elapsed_ms": round((time.monotonic() - started) * 1000, 2),
+            },
+        }
+        return {"toolUseId": tool_use["toolUseId"], "status": "success",
+                "content": [{"text": json.dumps(body, default=str)}]}
@@ -0,0 +1,138 @@
+"""
+Teradata MCP Tools
+Agent tools backed by the MCP session pool rather than a single MCP connection.
+
+Tool specs are discovered once and the resulting tools can be shared by any number
+of agents; every call leases whichever pooled session is free at that moment and
+runs under the pool's call deadline and circuit breaker (see mcp_pool.py).
+"""
+
+import json
+import uuid
+
+from strands.types._events import ToolResultEvent
+from strands.types.tools import AgentTool
+
+from tracing import span
+
+
+# teradata-mcp-server tool names used directly by this project
+QUERY_TOOL = "base_readQuery"
+DATABASE_LIST_TOOL = "base_databaseList"
+COLUMN_DESCRIPTION_TOOL = "base_columnDescription"
+
+
+class PooledMCPTool(AgentTool):
+    """A Teradata MCP tool that leases a pooled session for each call"""
+
+    def __init__(self, mcp_tool, pool, timeout=None):
+        super().__init__()
+        self.mcp_tool = mcp_tool
+        self.pool = pool
+        self.timeout = timeout
+
+    @property
+    def tool_name(self):
+        return self.mcp_tool.name
+
+    @property
+    def tool_spec(self):
+        spec = {
+            "name": self.mcp_tool.name,
+            "description": self.mcp_tool.description or f"Tool which performs {self.mcp_tool.name}",
+            "inputSchema": {"json": self.mcp_tool.inputSchema},
+        }
+        if self.mcp_tool.outputSchema:
+            spec["outputSchema"] = {"json": self.mcp_tool.outputSchema}
+        return spec
+
+    @property
+    def tool_type(self):
+        return "python"
+
+    async def call(self, tool_use, invocation_state):
+        """Run the tool on a leased session and return its ToolResult"""
+        with span("mcp.call", **{"gen_ai.tool.name": self.mcp_tool.name}):
+            return await self.pool.call_tool_async(
+                tool_use["toolUseId"], self.mcp_tool.name, tool_use["input"], timeout=self.timeout
+            )
+
+    async def stream(self, tool_use, invocation_state, **kwargs):
+        yield ToolResultEvent(await self.call(tool_use, invocation_state))
+
+
+class ToolProxy(AgentTool):
+    """Base class for layers that wrap another tool's call() (caching, guarding, ...)"""
+
+    def __init__(self, inner):
+        super().__init__()
+        self.inner = inner
+
+    @property
+    def tool_name(self):
+        return self.inner.tool_name
+
+    @property
+    def tool_spec(self):
+        return self.inner.tool_spec
+
+    @property
+    def tool_type(self):
+        return self.inner.tool_type
+
+    async def call(self, tool_use, invocation_state):
+        return await self.inner.call(tool_use, invocation_state)
+
+    async def stream(self, tool_use, invocation_state, **kwargs):
+        yield ToolResultEvent(await self.call(tool_use, invocation_state))
+
+
+def discover_tools(pool, layers=()):
+    """List the MCP server's tools once and wrap them as pooled tools.
+
+    Each layer is a callable taking a tool and returning it, possibly wrapped in
+    a ToolProxy. Layers are applied in order, so the last one is outermost.
+    """
+    with pool.lease() as client:
+        tools = [PooledMCPTool(tool.mcp_tool, pool) for tool in client.list_tools_sync()]
+    for layer in layers:
+        tools = [layer(tool) for tool in tools]
+    return tools
+
+
+def call_tool(pool, name, arguments):
+    """Call a Teradata MCP tool outside of any agent and return its ToolResult"""
+    return pool.call_tool_sync(f"local-{uuid.uuid4().hex[:8]}", name, arguments)
+
+
+def result_body(result):
+    """Parsed {"status", "results", "metadata"} JSON of a teradata-mcp-server ToolResult"""
+    if result["status"] != "success":
+        raise RuntimeError(result_text(result) or "Teradata MCP tool failed")
+    for content in result["content"]:
+        if "text" not in content:
+            continue
+        try:
+            body = json.loads(content["text"])
+        except ValueError:
+            continue
+        if isinstance(body, dict) and body.get("status") == "error":
+            raise RuntimeError(str(body.get("message")))
+        if isinstance(body, dict) and "results" in body:
+            return body
+    return {}
+
+
+def result_rows(result):
+    """Rows from a teradata-mcp-server ToolResult, plain or columnar-encoded"""
+    results = result_body(result).get("results", [])
+    return columns_to_rows(results) if isinstance(results, dict) else results
+
+
+def columns_to_rows(table):
+    """Row dicts from a columnar {"fields", "types", "data"} table (see result_encoding.py)"""
+    return [dict(zip(table["fields"], values)) for values in zip(*table["data"])]
+
+
+def result_text(result):
+    return "\n".join(c["text"] for c in result["content"] if "text" in c)
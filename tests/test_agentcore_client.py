@@ -0,0 +1,17 @@
+import io
+
+from agentcore_client import print_stream
+
+
+def test_print_stream_reports_error_events():
+    done = print_stream([{"type": "text", "data": "partial"}, {"type": "error", "error": "timed out"}], io.StringIO())
+    assert done["error"] == "timed out"
+
+
+def test_print_stream_reports_a_stream_without_done_event():
+    assert "error" in print_stream([{"type": "text", "data": "partial"}], io.StringIO())
+
+
+def test_print_stream_returns_the_done_event():
+    done = print_stream([{"type": "text", "data": "ok"}, {"type": "done", "stop_reason": "end_turn"}], io.StringIO())
+    assert done == {"type": "done", "stop_reason": "end_turn"}
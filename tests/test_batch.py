@@ -0,0 +1,24 @@
+import asyncio
+
+import agent_factory
+from agent_factory import AgentFactory
+from batch import BatchRunner
+
+
+def test_invalid_max_parallel_is_an_invalid_batch():
+    runner = BatchRunner(limiter=None)
+    response = asyncio.run(runner.run(None, {"prompts": ["a", "b"], "max_parallel": "many"}))
+    assert response["error"].startswith("Invalid batch: ")
+
+
+def test_overridden_system_prompt_is_not_rebuilt(monkeypatch):
+    monkeypatch.setattr(agent_factory, "Agent", lambda **kwargs: kwargs)
+    built = []
+    factory = AgentFactory(model="model", pool=None, system_prompt="You are an analyst.",
+                           prompt_sections=[lambda: built.append(1) or "KPIs"])
+    factory._tool_cache["tools"] = []
+
+    assert factory.create(system_prompt="batch prompt")["system_prompt"] == "batch prompt"
+    assert built == []
+    assert factory.create()["system_prompt"] == "You are an analyst.\n\nKPIs"
+    assert built == [1]
@@ -0,0 +1,33 @@
+import threading
+import time
+
+from kpi_snapshot import KPISnapshot
+
+
+class SlowSnapshot(KPISnapshot):
+    """KPISnapshot whose refresh blocks until released"""
+
+    def __init__(self, tmp_path):
+        super().__init__(pool=None, table="bank.Churn_Modelling", path=str(tmp_path / "kpi.json"))
+        self.release = threading.Event()
+        self.refreshes = 0
+
+    def refresh(self):
+        self.refreshes += 1
+        self.release.wait(5)
+        with self._lock:
+            self._snapshot = {"computed_at": "2026-01-01T00:00:00+00:00", "table": self.table,
+                              "portfolio": {}, "segments": {}}
+            self._refreshing = False
+        return self._snapshot
+
+
+def test_prompt_section_does_not_wait_for_the_first_snapshot(tmp_path):
+    kpis = SlowSnapshot(tmp_path)
+    assert kpis.prompt_section() == ""
+    assert kpis.prompt_section() == ""
+    kpis.release.set()
+    while kpis._refreshing:
+        time.sleep(0.01)
+    assert kpis.refreshes == 1
+    assert kpis.snapshot(wait=False) is not None
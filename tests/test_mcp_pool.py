@@ -0,0 +1,72 @@
+import asyncio
+
+from mcp_pool import MCPSessionPool, PooledSession
+
+
+class FakePool(MCPSessionPool):
+    """Pool of placeholder sessions, no MCP server processes"""
+
+    def _new_session(self):
+        return PooledSession(client=object())
+
+    def _stop_session(self, session):
+        pass
+
+
+def test_cancelled_lease_does_not_leak_the_session():
+    pool = FakePool(server_params=None, size=1)
+    held = pool.acquire()
+
+    async def lease_and_cancel():
+        async def lease():
+            async with pool.lease_async(timeout=5):
+                pass
+
+        task = asyncio.create_task(lease())
+        await asyncio.sleep(0.1)  # waiting for the held session in a worker thread
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        # The worker thread gets the session once it is released
+        pool.release(held)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(lease_and_cancel())
+    assert pool.stats()["idle"] == 1
+    assert pool.acquire(timeout=1) is held
+
+
+def test_acquire_async_returns_a_session():
+    pool = FakePool(server_params=None, size=1)
+    session = asyncio.run(pool.acquire_async(timeout=1))
+    assert isinstance(session, PooledSession)
+
+
+class HangingClient:
+    async def call_tool_async(self, **kwargs):
+        await asyncio.sleep(60)
+
+
+def test_cancelled_call_restarts_the_session_without_tripping_the_breaker():
+    pool = FakePool(server_params=None, size=1)
+    started = []
+    pool._new_session = lambda: started.append(PooledSession(client=HangingClient())) or started[-1]
+    pool.breaker.failures = 1
+
+    async def cancel_call():
+        task = asyncio.create_task(pool.call_tool_async("t1", "base_readQuery", {"sql": "SELECT 1"}))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(cancel_call())
+    assert pool.breaker.state == "closed"
+    assert pool.breaker.consecutive == 0
+    # The wedged session was discarded and a fresh one started in its place
+    assert len(started) == 2
+    assert pool.acquire(timeout=1) is started[1]
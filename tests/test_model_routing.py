@@ -0,0 +1,39 @@
+import asyncio
+
+from model_routing import TieredModel
+
+
+class ScriptedModel:
+    """Streams one answer: a tool call or plain text, then its usage"""
+
+    def __init__(self, stop_reason, input_tokens, latency_ms):
+        self.stop_reason, self.input_tokens, self.latency_ms = stop_reason, input_tokens, latency_ms
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        yield {"messageStop": {"stopReason": self.stop_reason}}
+        yield {"metadata": {"usage": {"inputTokens": self.input_tokens, "outputTokens": 10, "totalTokens":
+                                      self.input_tokens + 10}, "metrics": {"latencyMs": self.latency_ms}}}
+
+
+def stream(model):
+    async def collect():
+        return [event async for event in model.stream([{"role": "user", "content": [{"text": "q"}]}])]
+    return asyncio.run(collect())
+
+
+def test_escalated_turn_reports_the_discarded_attempt():
+    models = {"analysis": ScriptedModel("end_turn", 1000, 900), "sql": ScriptedModel("end_turn", 200, 150)}
+    model = TieredModel(models, role="sql", escalate=True)
+    metadata = [event["metadata"] for event in stream(model) if "metadata" in event]
+
+    assert metadata == [{"usage": {"inputTokens": 1200, "outputTokens": 20, "totalTokens": 1220},
+                         "metrics": {"latencyMs": 1050}}]
+    assert model.turns["escalated"] == 1
+
+
+def test_kept_small_model_turn_is_unchanged():
+    models = {"analysis": ScriptedModel("end_turn", 1000, 900), "sql": ScriptedModel("tool_use", 200, 150)}
+    metadata = [event["metadata"] for event in stream(TieredModel(models, role="sql", escalate=True))
+                if "metadata" in event]
+    assert metadata == [{"usage": {"inputTokens": 200, "outputTokens": 10, "totalTokens": 210},
+                         "metrics": {"latencyMs": 150}}]
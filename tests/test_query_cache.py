@@ -0,0 +1,16 @@
+from query_cache import normalize_sql
+
+
+def test_formatting_differences_share_a_key():
+    assert normalize_sql("select a from t where x in ( 3, 1 ) -- note\n;") == \
+        normalize_sql("SELECT  a\nFROM t WHERE x IN (1,3)")
+
+
+def test_literals_differing_only_in_whitespace_keep_distinct_keys():
+    assert normalize_sql("SELECT a FROM t WHERE s = 'A  B'") != normalize_sql("SELECT a FROM t WHERE s = 'A B'")
+    assert normalize_sql("SELECT a FROM t WHERE s = 'a , b'") != normalize_sql("SELECT a FROM t WHERE s = 'a,b'")
+
+
+def test_literals_are_kept_verbatim():
+    assert normalize_sql("select a from t where s = 'Mixed  Case ( x )'") == \
+        "SELECT A FROM T WHERE S='Mixed  Case ( x )'"
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+
+from query_guard import GuardedQueryTool, QueryGuard, QueryRejected, bound_query
+
+
+def test_select_gets_a_row_limit():
+    assert bound_query("SELECT a FROM t", 100) == "SELECT TOP 101 a FROM t"
+    assert bound_query("SELECT TOP 5000 a FROM t", 100) == "SELECT TOP 101 a FROM t"
+    assert bound_query("SELECT TOP 10 a FROM t", 100) == "SELECT TOP 10 a FROM t"
+
+
+def test_main_select_of_a_with_query_gets_a_row_limit():
+    sql = "WITH c AS (SELECT a FROM t WHERE s = ')SELECT') SELECT a FROM c"
+    assert bound_query(sql, 100) == "WITH c AS (SELECT a FROM t WHERE s = ')SELECT') SELECT TOP 101 a FROM c"
+    sql = "WITH RECURSIVE c (n) AS (SELECT 1 FROM t UNION ALL SELECT n + 1 FROM c) SELECT DISTINCT n FROM c"
+    assert bound_query(sql, 100).endswith(") SELECT DISTINCT TOP 101 n FROM c")
+
+
+def test_top_percent_is_rejected():
+    with pytest.raises(QueryRejected, match="PERCENT"):
+        bound_query("SELECT TOP 10 PERCENT a FROM t ORDER BY a", 100)
+    with pytest.raises(QueryRejected, match="PERCENT"):
+        bound_query("WITH c AS (SELECT a FROM t) SELECT TOP 1 PERCENT a FROM c", 100)
+
+
+def test_set_operations_are_bounded_as_a_whole():
+    assert bound_query("SELECT a FROM t UNION ALL SELECT a FROM u", 100) == \
+        "SELECT TOP 101 * FROM (SELECT a FROM t UNION ALL SELECT a FROM u) q"
+    assert bound_query("SELECT a FROM t MINUS SELECT a FROM u ORDER BY 1;", 100) == \
+        "SELECT TOP 101 * FROM (SELECT a FROM t MINUS SELECT a FROM u) q ORDER BY 1"
+    assert bound_query("WITH c AS (SELECT a FROM t) SELECT a FROM c UNION SELECT a FROM u", 100) == \
+        "WITH c AS (SELECT a FROM t) SELECT TOP 101 * FROM (SELECT a FROM c UNION SELECT a FROM u) q"
+    # Set operations inside a derived table or a literal leave the outer SELECT alone
+    assert bound_query("SELECT a FROM (SELECT a FROM t UNION SELECT a FROM u) x", 100) == \
+        "SELECT TOP 101 a FROM (SELECT a FROM t UNION SELECT a FROM u) x"
+    assert bound_query("SELECT a FROM t WHERE s = 'x UNION y'", 100) == "SELECT TOP 101 a FROM t WHERE s = 'x UNION y'"
+
+
+class Rows:
+    tool_name = "base_readQuery"
+
+    def __init__(self, count):
+        self.rows = [{"n": i} for i in range(count)]
+
+    async def call(self, tool_use, invocation_state):
+        body = {"status": "success", "results": self.rows}
+        return {"toolUseId": tool_use["toolUseId"], "status": "success", "content": [{"text": json.dumps(body)}]}
+
+
+def run(rows):
+    tool = GuardedQueryTool(Rows(20), QueryGuard(max_rows=50, sample_rows=10))
+    tool_use = {"toolUseId": "t1", "name": "base_readQuery", "input": {"sql": "SELECT n FROM t", "rows": rows}}
+    return asyncio.run(tool.call(tool_use, {}))
+
+
+@pytest.mark.parametrize("rows, shown", [(-5, 1), (0, 10), (5, 5), ("7", 7), (500, 20)])
+def test_rows_argument_is_clamped(rows, shown):
+    result = run(rows)
+    assert len(json.loads(result["content"][0]["text"])["rows"]) == shown
+
+
+@pytest.mark.parametrize("rows", ["all", [3]])
+def test_invalid_rows_argument_is_an_error_result(rows):
+    result = run(rows)
+    assert result["status"] == "error"
+    assert "rows must be a whole number" in result["content"][0]["text"]
@@ -0,0 +1,35 @@
+import asyncio
+
+import request_limits
+from request_limits import RequestLimiter
+
+
+async def _events(seen):
+    seen.append(request_limits.remaining())
+    yield {"type": "done"}
+
+
+def test_stream_publishes_and_then_clears_the_deadline():
+    async def consume():
+        seen = []
+        limiter = RequestLimiter(max_concurrent=1, timeout=30)
+        events = [event async for event in limiter.stream(_events(seen))]
+        return events, seen, request_limits.deadline.get()
+
+    events, seen, after = asyncio.run(consume())
+    assert events == [{"type": "done"}]
+    assert 0 < seen[0] <= 30
+    assert after is None
+
+
+def test_run_publishes_and_then_clears_the_deadline():
+    async def left():
+        return request_limits.remaining()
+
+    async def run():
+        limiter = RequestLimiter(max_concurrent=1, timeout=30)
+        return await limiter.run(left), request_limits.deadline.get()
+
+    seen, after = asyncio.run(run())
+    assert 0 < seen <= 30
+    assert after is None
@@ -0,0 +1,23 @@
+import time
+
+from session_store import SessionStore
+
+TURN = [{"role": "user", "content": [{"text": "Analyze churn patterns by geography"}]}]
+
+
+def test_persona_of_the_session_is_kept():
+    store = SessionStore(enabled=True)
+    store.save("s1", TURN, persona="retention")
+    assert store.persona("s1") == "retention"
+    assert store.persona("unknown") is None
+
+
+def test_saves_purge_expired_sessions(tmp_path, monkeypatch):
+    store = SessionStore(ttl=60, path=str(tmp_path / "sessions.db"), enabled=True)
+    store.save("old", TURN)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    store.save("new", TURN)
+
+    assert list(store._sessions) == ["new"]
+    assert [row[0] for row in store._db.execute("SELECT session_id FROM sessions")] == ["new"]
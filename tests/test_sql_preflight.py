@@ -0,0 +1,62 @@
+import pytest
+
+from sql_preflight import SQLPreflight
+
+
+class Catalog:
+    def schema(self):
+        return {
+            "bank": {
+                "Churn_Modelling": [("CustomerId", "INTEGER"), ("Geography", "VARCHAR"), ("Balance", "DECIMAL"),
+                                    ("Exited", "BYTEINT"), ("CreditScore", "INTEGER"), ("OpenDate", "DATE")],
+                "Transactions": [("TxnId", "INTEGER"), ("CustomerId", "INTEGER"), ("Amount", "DECIMAL"),
+                                 ("TxnDate", "DATE")],
+            }
+        }
+
+
+@pytest.fixture
+def problems():
+    return SQLPreflight(Catalog(), enabled=True, explain=False).problems
+
+
+@pytest.mark.parametrize("sql", [
+    # Output aliases in ORDER BY and GROUP BY
+    "SELECT Geography AS country, AVG(Balance) AS avg_balance FROM bank.Churn_Modelling "
+    "GROUP BY country ORDER BY avg_balance DESC",
+    "SELECT Geography g, COUNT(*) n FROM bank.Churn_Modelling GROUP BY g ORDER BY n",
+    # EXTRACT(... FROM ...) is not a table reference
+    "SELECT EXTRACT(YEAR FROM OpenDate) AS yr, COUNT(*) FROM bank.Churn_Modelling GROUP BY 1",
+    "SELECT EXTRACT(MONTH FROM t.TxnDate) AS m, SUM(t.Amount) FROM bank.Transactions t "
+    "GROUP BY EXTRACT(MONTH FROM t.TxnDate)",
+    # Positional and ROLLUP grouping
+    "SELECT Geography, Exited, COUNT(*) FROM bank.Churn_Modelling GROUP BY 1, 2",
+    "SELECT Geography, Exited, SUM(Balance) FROM bank.Churn_Modelling GROUP BY ROLLUP (Geography, Exited)",
+    # Qualified columns by table name, database.table and alias
+    "SELECT Churn_Modelling.Geography, c.Balance FROM bank.Churn_Modelling c WHERE c.Exited = 1",
+    "SELECT bank.Churn_Modelling.Geography FROM bank.Churn_Modelling",
+    # Comma join linked in WHERE, explicit JOIN ... ON
+    "SELECT c.Geography, SUM(t.Amount) FROM bank.Churn_Modelling c, bank.Transactions t "
+    "WHERE c.CustomerId = t.CustomerId GROUP BY c.Geography",
+    "SELECT c.Geography, t.Amount FROM bank.Churn_Modelling c JOIN bank.Transactions t ON c.CustomerId = t.CustomerId",
+    # Databases the catalog does not cover
+    "SELECT DatabaseName, TableName FROM DBC.TablesV WHERE DatabaseName = 'bank'",
+    "SELECT c.Geography, r.RegionName FROM bank.Churn_Modelling c JOIN ref.Regions r ON c.Geography = r.Country",
+    # Literals and comments are not code
+    "SELECT COUNT(*) FROM bank.Churn_Modelling WHERE Geography = 'FROM nowhere' -- JOIN missing_table",
+])
+def test_valid_queries_pass(problems, sql):
+    assert problems(sql) == []
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT * FROM bank.Churn_Modeling", "unknown table bank.Churn_Modeling (did you mean Churn_Modelling?)"),
+    ("SELECT c.Balanse FROM bank.Churn_Modelling c", "unknown column Balanse in Churn_Modelling"),
+    ("SELECT Geography, COUNT(*) FROM bank.Churn_Modelling", "Geography must be in GROUP BY"),
+    ("SELECT Geography, Exited, COUNT(*) FROM bank.Churn_Modelling GROUP BY Geography", "Exited must be in GROUP BY"),
+    ("SELECT c.Geography, t.Amount FROM bank.Churn_Modelling c, bank.Transactions t WHERE t.Amount > 100",
+     "are not all joined"),
+    ("SELECT c.Geography FROM bank.Churn_Modelling c CROSS JOIN bank.Transactions t", "CROSS JOIN"),
+])
+def test_problems_are_reported(problems, sql, expected):
+    assert any(expected in problem for problem in problems(sql))
@@ -0,0 +1,28 @@
+import pytest
+from starlette.testclient import TestClient
+
+import startup
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    loader = startup.RuntimeLoader(module="missing_runtime_module")
+    loader._started = True  # Nothing imported unless a test loads it
+    monkeypatch.setattr(startup, "loader", loader)
+    return loader
+
+
+def test_ping_is_healthy_while_the_runtime_loads(loader):
+    client = TestClient(startup.create_app())
+    response = client.get("/ping")
+    assert response.status_code == 200
+    assert response.json()["status"] == "Healthy"
+
+
+def test_ping_fails_after_a_runtime_import_error(loader):
+    client = TestClient(startup.create_app())
+    loader.load()
+    response = client.get("/ping")
+    assert response.status_code == 503
+    assert response.json()["status"] == "Unhealthy"
+    assert "missing_runtime_module" in response.json()["error"]
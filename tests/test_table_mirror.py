@@ -0,0 +1,94 @@
+import pytest
+
+from table_mirror import TableMirror, run_local_query
+
+ROWS = [
+    {"id": 1, "segment": "Retail", "balance": 100.0},
+    {"id": 2, "segment": "Retail", "balance": None},
+    {"id": 3, "segment": None, "balance": 300.0},
+    {"id": 4, "segment": "Private", "balance": 400.0},
+]
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = TableMirror(pool=None, tables={"bank.customers": None}, directory=str(tmp_path))
+    mirror._query = lambda sql: ROWS
+    mirror.export("bank.customers")
+    return mirror
+
+
+def count(mirror, where):
+    return run_local_query(mirror, f"SELECT COUNT(*) AS n FROM bank.customers WHERE {where}")[0]["n"]
+
+
+@pytest.mark.parametrize("op", ["<>", "!="])
+def test_not_equal_skips_nulls(mirror, op):
+    assert count(mirror, f"balance {op} 100") == 2
+    assert count(mirror, f"segment {op} 'Retail'") == 1
+
+
+def test_null_predicates(mirror):
+    assert count(mirror, "balance IS NULL") == 1
+    assert count(mirror, "balance NOT IN (100, 300)") == 1
+
+
+def test_full_refresh_flips_to_a_new_export_and_keeps_the_previous_one(mirror, tmp_path):
+    before = mirror.view("bank.customers")
+    mirror._query = lambda sql: ROWS[:2]
+    mirror.export("bank.customers")
+    mirror._query = lambda sql: ROWS[:3]
+    mirror.export("bank.customers")
+
+    assert (tmp_path / "bank.customers").is_symlink()
+    assert len(list(tmp_path.glob("bank.customers.v*"))) == 2
+    assert mirror.view("bank.customers").rows == 3
+    assert before.rows == 4
+
+
+class KeyedSource:
+    """Rows of a keyed table served in chunks, optionally failing one chunk query"""
+
+    def __init__(self, rows, fail_at=None):
+        self.rows, self.fail_at, self.queries = rows, fail_at, []
+
+    def __call__(self, sql):
+        self.queries.append(sql)
+        if "COUNT(*)" in sql:
+            limit = float(sql.rsplit("<=", 1)[1])
+            return [{"row_count": sum(1 for row in self.rows if row["id"] <= limit)}]
+        if len(self.queries) == self.fail_at:
+            raise TimeoutError("Timed out while waiting for response")
+        after = float(sql.split("> ", 1)[1].split()[0]) if " > " in sql else float("-inf")
+        top = int(sql.split("TOP ", 1)[1].split()[0])
+        return [row for row in self.rows if row["id"] > after][:top]
+
+
+def test_refresh_failing_midway_leaves_no_duplicate_rows(tmp_path):
+    rows = [{"id": i, "amount": float(i)} for i in range(1, 15)]
+    mirror = TableMirror(pool=None, tables={"bank.tx": "id"}, directory=str(tmp_path), chunk_rows=2)
+    mirror._query = KeyedSource(rows[:10])
+    mirror.export("bank.tx")
+
+    # Count query and the first new chunk go through, the second chunk fails
+    mirror._query = KeyedSource(rows, fail_at=3)
+    with pytest.raises(TimeoutError):
+        mirror.refresh("bank.tx")
+    mirror._query = KeyedSource(rows)
+    mirror.refresh("bank.tx")
+
+    result = run_local_query(mirror, "SELECT COUNT(*) AS n, SUM(amount) AS s, MAX(amount) AS m FROM bank.tx")[0]
+    assert result == {"n": 14, "s": 105, "m": 14}
+
+
+def test_string_keys_are_quoted_as_sql_literals(tmp_path):
+    mirror = TableMirror(pool=None, tables={"bank.tx": "code"}, directory=str(tmp_path), chunk_rows=1)
+    queries = []
+
+    def source(sql):
+        queries.append(sql)
+        return [{"code": "O'Brien", "amount": 1.0}] if len(queries) == 1 else []
+
+    mirror._query = source
+    mirror.export("bank.tx")
+    assert "WHERE code > 'O''Brien' ORDER BY code" in queries[1]
@@ -0,0 +1,25 @@
+"""
+Tool Execution
+Runs the independent tool calls of one agent turn concurrently.
+
+Because every Teradata tool call leases its own pooled MCP session, three
+per-country queries issued in one turn run on three sessions at once instead
+of queueing on a single stdio channel. Results are handed back to the model in
+the order the calls were made, and a failing call only produces its own error
+result - the other calls still complete.
+"""
+
+from strands.tools.executors import ConcurrentToolExecutor
+
+
+class OrderedConcurrentToolExecutor(ConcurrentToolExecutor):
+    """ConcurrentToolExecutor that returns results in request order, not completion order"""
+
+    async def _execute(self, agent, tool_uses, tool_results, *args, **kwargs):
+        start = len(tool_results)
+        async for event in super()._execute(agent, tool_uses, tool_results, *args, **kwargs):
+            yield event
+        order = {tool_use["toolUseId"]: index for index, tool_use in enumerate(tool_uses)}
+        tool_results[start:] = sorted(
+            tool_results[start:], key=lambda result: order.get(result["toolUseId"], len(order))
+        )
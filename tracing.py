@@ -0,0 +1,231 @@
+"""
+Tracing
+OpenTelemetry spans for the agent loop and a per-request timing summary.
+
+Spans go to whatever tracer provider the process has (opentelemetry-instrument
+in the AgentCore container) and cost nothing when none is configured:
+- agent.create: building the request's agent (waits for tool discovery on first use)
+- request: one per invocation
+- model.call: stop reason and input / output / cache read / cache write tokens
+- tool.call: tool name, status, SQL hash (never the SQL text), rows and result bytes
+- mcp.acquire: waiting for a pooled MCP session
+- mcp.session_start: starting an MCP server process and initializing its session
+- mcp.call: the MCP round-trip to the Teradata server
+
+The same measurements are added up per request in a RequestTrace, whose
+summary() is returned as "timings" with every response. Tool and MCP times are
+summed over calls, so with parallel tool calls they can exceed the request time.
+
+Spans are nested explicitly rather than through the ambient OpenTelemetry
+context (the agent loop runs model and tool calls in tasks of its own): model.call
+and tool.call are children of request, and mcp.* spans of the tool.call they
+serve.
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import time
+
+from opentelemetry import trace
+from strands.hooks import (
+    AfterInvocationEvent,
+    AfterModelCallEvent,
+    AfterToolCallEvent,
+    BeforeInvocationEvent,
+    BeforeModelCallEvent,
+    BeforeToolCallEvent,
+    HookProvider,
+)
+
+from prompt_cache import USAGE_KEYS
+
+tracer = trace.get_tracer("tdmcpagentcore")
+
+# RequestTrace of the request the current task works for (set per tool call)
+current_trace = contextvars.ContextVar("current_trace", default=None)
+
+# Span that spans opened in the current task belong under (the tool call, then nested spans)
+parent_span = contextvars.ContextVar("parent_span", default=None)
+
+
+def sql_hash(sql):
+    """Short, stable identifier of a SQL text for span attributes"""
+    return hashlib.sha256(" ".join(sql.split()).encode()).hexdigest()[:16]
+
+
+def result_stats(result):
+    """(rows, bytes) of a tool result; rows is None when the result has no row count"""
+    text = "\n".join(c["text"] for c in result.get("content", []) if "text" in c)
+    rows = None
+    try:
+        body = json.loads(text)
+    except ValueError:
+        body = None
+    if isinstance(body, dict):
+        results = body.get("results")
+        if "row_count" in body:
+            rows = body["row_count"]
+        elif isinstance(results, list):
+            rows = len(results)
+        elif isinstance(results, dict) and results.get("data"):
+            rows = len(results["data"][0])
+    return rows, len(text.encode())
+
+
+@contextlib.contextmanager
+def span(name, request_trace=None, **attributes):
+    """Span that also adds its duration to `request_trace` (default: the current request's)"""
+    started = time.perf_counter()
+    parent = parent_span.get()
+    context = trace.set_span_in_context(parent) if parent is not None else None
+    with tracer.start_as_current_span(name, context=context, attributes=attributes) as current:
+        token = parent_span.set(current)
+        try:
+            yield current
+        finally:
+            parent_span.reset(token)
+            request = request_trace or current_trace.get()
+            if request is not None:
+                request.add(name, time.perf_counter() - started)
+
+
+class RequestTrace:
+    """Timings of one request, added up per span name and per tool"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.timings = {}  # span name -> [count, seconds]
+        self.tools = {}  # tool name -> {"calls", "ms", "rows", "bytes", "errors"}
+
+    def add(self, name, seconds):
+        timing = self.timings.setdefault(name, [0, 0.0])
+        timing[0] += 1
+        timing[1] += seconds
+
+    def add_tool(self, name, seconds, status, rows, size):
+        stats = self.tools.setdefault(name, {"calls": 0, "ms": 0.0, "rows": 0, "bytes": 0, "errors": 0})
+        stats["calls"] += 1
+        stats["ms"] += seconds * 1000
+        stats["rows"] += rows or 0
+        stats["bytes"] += size
+        stats["errors"] += status != "success"
+        self.add("tool.call", seconds)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def summary(self):
+        """Compact timing summary for the response metadata"""
+        end = self.finished or time.perf_counter()
+        summary = {"total_ms": round((end - self.started) * 1000, 1)}
+        for name, (count, seconds) in self.timings.items():
+            key = name.replace(".", "_")
+            summary[f"{key}_count"] = count
+            summary[f"{key}_ms"] = round(seconds * 1000, 1)
+        if self.tools:
+            summary["tools"] = {
+                name: dict(stats, ms=round(stats["ms"], 1)) for name, stats in self.tools.items()
+            }
+        return summary
+
+
+class TracingHooks(HookProvider):
+    """Strands hooks emitting request, model.call and tool.call spans into a RequestTrace"""
+
+    def __init__(self, request_trace=None):
+        self.trace = request_trace or RequestTrace()
+        self._request_span = None
+        self._model = None  # (span, started, ended, usage before the call)
+        self._tools = {}  # toolUseId -> (span, started)
+
+    def register_hooks(self, registry, **kwargs):
+        registry.add_callback(BeforeInvocationEvent, self.before_invocation)
+        registry.add_callback(AfterInvocationEvent, self.after_invocation)
+        registry.add_callback(BeforeModelCallEvent, self.before_model_call)
+        registry.add_callback(AfterModelCallEvent, self.after_model_call)
+        registry.add_callback(BeforeToolCallEvent, self.before_tool_call)
+        registry.add_callback(AfterToolCallEvent, self.after_tool_call)
+
+    def before_invocation(self, event):
+        self._request_span = tracer.start_span("request", attributes={
+            "agent.name": event.agent.name or "",
+            "gen_ai.request.model": str(event.agent.model.config.get("model_id", "")),
+        })
+
+    def _request_context(self):
+        return trace.set_span_in_context(self._request_span) if self._request_span is not None else None
+
+    def after_invocation(self, event):
+        self._finish_model_call(event.agent)
+        self.trace.finish()
+        if self._request_span is not None:
+            for key, value in self.trace.summary().items():
+                if not isinstance(value, dict):
+                    self._request_span.set_attribute(f"timings.{key}", value)
+            self._request_span.end()
+            self._request_span = None
+
+    def before_model_call(self, event):
+        self._finish_model_call(event.agent)
+        usage = dict(event.agent.event_loop_metrics.accumulated_usage)
+        self._model = (tracer.start_span("model.call", context=self._request_context()), time.perf_counter(),
+                       None, usage)
+
+    def after_model_call(self, event):
+        if self._model is None:
+            return
+        model_span, started, _, usage = self._model
+        if event.exception is not None:
+            model_span.record_exception(event.exception)
+            model_span.set_status(trace.Status(trace.StatusCode.ERROR, str(event.exception)))
+        elif event.stop_response is not None:
+            model_span.set_attribute("gen_ai.response.stop_reason", str(event.stop_response.stop_reason))
+        self._model = (model_span, started, time.perf_counter(), usage)
+
+    def _finish_model_call(self, agent):
+        # Token usage reaches the agent's metrics only after AfterModelCallEvent, so
+        # the model span is closed at the next event, back-dated to when the call ended
+        if self._model is None or self._model[2] is None:
+            return
+        model_span, started, ended, before = self._model
+        self._model = None
+        after = agent.event_loop_metrics.accumulated_usage
+        for key in USAGE_KEYS:
+            model_span.set_attribute(f"gen_ai.usage.{key}", after.get(key, 0) - before.get(key, 0))
+        model_span.end(end_time=time.time_ns() - int((time.perf_counter() - ended) * 1e9))
+        self.trace.add("model.call", ended - started)
+
+    def before_tool_call(self, event):
+        self._finish_model_call(event.agent)
+        # The tool runs in this task, so MCP spans below it are added to this request and its tool span
+        current_trace.set(self.trace)
+        tool_use = event.tool_use
+        attributes = {"gen_ai.tool.name": tool_use["name"]}
+        sql = (tool_use.get("input") or {}).get("sql")
+        if isinstance(sql, str):
+            attributes["db.statement.hash"] = sql_hash(sql)
+        tool_span = tracer.start_span("tool.call", context=self._request_context(), attributes=attributes)
+        parent_span.set(tool_span)
+        self._tools[tool_use["toolUseId"]] = (tool_span, time.perf_counter())
+
+    def after_tool_call(self, event):
+        entry = self._tools.pop(event.tool_use["toolUseId"], None)
+        if entry is None:
+            return
+        tool_span, started = entry
+        seconds = time.perf_counter() - started
+        status = event.result.get("status", "error")
+        rows, size = result_stats(event.result)
+        tool_span.set_attribute("tool.status", status)
+        tool_span.set_attribute("result.bytes", size)
+        if rows is not None:
+            tool_span.set_attribute("db.rows", rows)
+        if event.exception is not None:
+            tool_span.record_exception(event.exception)
+        if status != "success":
+            tool_span.set_status(trace.Status(trace.StatusCode.ERROR))
+        tool_span.end()
+        self.trace.add_tool(event.tool_use["name"], seconds, status, rows, size)